@@ -0,0 +1,95 @@
+"""`/predict` requests/s through the FastAPI app with an in-process httpx client.
+
+The MLflow-backed model is replaced by the benchmark forecaster (same
+`predict(inputs)` contract as a pyfunc model), so this measures request
+parsing, JSON (de)serialization, middleware and the thread-pool hop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Any, List
+
+import numpy as np
+import torch
+from loguru import logger
+
+from benchmarks.harness import BenchContext, BenchResult, throughput
+from benchmarks.synthetic import BenchForecaster, make_adjacency
+from spatiotemporal_lab.inference.onnx_export import StaticGraphForecaster
+
+API_DIR = Path(__file__).resolve().parents[1] / "deployment" / "api"
+CONCURRENCY = 8
+
+
+class _TorchPyfunc:
+    def __init__(self, module: torch.nn.Module):
+        self.module = module.eval()
+
+    def predict(self, inputs: Any) -> Any:
+        x = torch.as_tensor(np.asarray(inputs, dtype=np.float32))
+        with torch.inference_mode():
+            return self.module(x).numpy().tolist()
+
+
+def run(ctx: BenchContext) -> List[BenchResult]:
+    if importlib.util.find_spec("fastapi") is None:
+        logger.warning("API extra not installed; skipping /predict benchmark.")
+        return []
+
+    import httpx
+
+    if str(API_DIR) not in sys.path:
+        sys.path.insert(0, str(API_DIR))
+    from app.core.model import ModelService, ModelServiceConfig
+    from app.main import app
+
+    shape = ctx.shape
+    torch.manual_seed(0)
+    module = StaticGraphForecaster(
+        BenchForecaster(shape),
+        horizon=shape.horizon,
+        adjacency=torch.from_numpy(make_adjacency(shape.num_nodes)),
+    )
+    svc = ModelService(
+        ModelServiceConfig(tracking_uri="", model_name="bench", load_on_startup=False)
+    )
+    svc._model = _TorchPyfunc(module)
+    app.state.model_service = svc
+
+    window = np.random.default_rng(0).normal(
+        size=(1, shape.input_len, shape.num_nodes, shape.num_features)
+    )
+    payload = {"inputs": window.round(3).tolist()}
+
+    loop = asyncio.new_event_loop()
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    )
+
+    async def burst() -> None:
+        responses = await asyncio.gather(
+            *(client.post("/predict", json=payload) for _ in range(CONCURRENCY))
+        )
+        for r in responses:
+            r.raise_for_status()
+
+    try:
+        return [
+            throughput(
+                "api.predict",
+                lambda: loop.run_until_complete(burst()),
+                CONCURRENCY,
+                "requests/s",
+                warmup=ctx.warmup,
+                repeat=ctx.repeat,
+                concurrency=CONCURRENCY,
+                num_nodes=shape.num_nodes,
+            )
+        ]
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
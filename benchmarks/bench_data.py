@@ -0,0 +1,101 @@
+"""Data path: window `__getitem__`, batch gather (DataLoader and ring), collate, transforms."""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, default_collate
+
+from benchmarks.harness import BenchContext, BenchResult, latency, throughput
+from spatiotemporal_lab.data.datasets import (
+    WindowDataset,
+    WindowDatasetConfig,
+    open_series,
+)
+from spatiotemporal_lab.data.normalization import compute_norm_stats
+from spatiotemporal_lab.data.prefetch import RingPrefetcher
+from spatiotemporal_lab.data.samplers import WindowSampler
+from spatiotemporal_lab.data.transforms import to_float32
+
+
+def run(ctx: BenchContext) -> List[BenchResult]:
+    shape = ctx.shape
+    series = open_series(ctx.workdir / "series.npy")
+    stats = compute_norm_stats(series, series.shape[0])
+    ds = WindowDataset(
+        series,
+        WindowDatasetConfig(input_len=shape.input_len, horizon=shape.horizon),
+        stats=stats,
+    )
+    rng = np.random.default_rng(0)
+    bs = ctx.batch_size
+    common = dict(warmup=ctx.warmup, repeat=ctx.repeat, num_nodes=shape.num_nodes)
+
+    def getitem() -> None:
+        for i in rng.integers(0, len(ds), size=bs):
+            ds[int(i)]
+
+    items = [ds[int(i)] for i in rng.integers(0, len(ds), size=bs)]
+    batch_x = default_collate(items)[0]
+
+    loader = DataLoader(
+        ds,
+        batch_size=bs,
+        sampler=WindowSampler(np.arange(len(ds)), shuffle=True, seed=0),
+        num_workers=0,
+    )
+    n_batches = 8
+
+    def gather() -> None:
+        it = iter(loader)
+        for _ in range(n_batches):
+            next(it)
+
+    ring = RingPrefetcher(
+        ds,
+        WindowSampler(np.arange(len(ds)), shuffle=True, seed=0),
+        batch_size=bs,
+    )
+
+    def ring_gather() -> None:
+        it = iter(ring)
+        for _ in range(n_batches):
+            next(it)
+        it.close()
+
+    return [
+        throughput("data.getitem", getitem, bs, "windows/s", **common, batch_size=bs),
+        throughput(
+            "data.batch_gather",
+            gather,
+            bs * n_batches,
+            "windows/s",
+            **common,
+            batch_size=bs,
+        ),
+        throughput(
+            "data.batch_gather.ring",
+            ring_gather,
+            bs * n_batches,
+            "windows/s",
+            **common,
+            batch_size=bs,
+        ),
+        latency(
+            "data.collate", lambda: default_collate(items), **common, batch_size=bs
+        ),
+        latency(
+            "data.transform.normalize",
+            lambda: stats.apply(np.asarray(batch_x)),
+            **common,
+            batch_size=bs,
+        ),
+        latency(
+            "data.transform.to_float32",
+            lambda: to_float32(batch_x.to(torch.float64)),
+            **common,
+            batch_size=bs,
+        ),
+    ]
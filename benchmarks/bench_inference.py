@@ -0,0 +1,89 @@
+"""Inference latency: `Predictor` across batch sizes, and ONNX Runtime vs torch."""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import List
+
+import numpy as np
+import torch
+from loguru import logger
+
+from benchmarks.harness import BenchContext, BenchResult, latency
+from benchmarks.synthetic import BenchForecaster, make_adjacency
+from spatiotemporal_lab.inference.onnx_export import (
+    StaticGraphExportConfig,
+    StaticGraphForecaster,
+    export_static_graph_onnx,
+)
+from spatiotemporal_lab.inference.predictor import Predictor
+
+
+def _window(ctx: BenchContext, batch_size: int) -> torch.Tensor:
+    s = ctx.shape
+    return torch.randn(batch_size, s.input_len, s.num_nodes, s.num_features)
+
+
+def run(ctx: BenchContext) -> List[BenchResult]:
+    shape = ctx.shape
+    torch.manual_seed(0)
+    adjacency = make_adjacency(shape.num_nodes)
+    model = BenchForecaster(shape).eval()
+    module = StaticGraphForecaster(
+        model, horizon=shape.horizon, adjacency=torch.from_numpy(adjacency)
+    ).eval()
+    predictor = Predictor(module)
+    common = dict(warmup=ctx.warmup, repeat=ctx.repeat, num_nodes=shape.num_nodes)
+
+    results = []
+    for bs in ctx.batch_sizes:
+        x = _window(ctx, bs)
+        results.append(
+            latency(
+                f"predictor.latency.b{bs}",
+                lambda x=x: predictor.predict_proba(x),
+                **common,
+                batch_size=bs,
+            )
+        )
+
+    if importlib.util.find_spec("onnxruntime") is None:
+        logger.warning("onnxruntime not installed; skipping ONNX benchmarks.")
+        return results
+
+    import onnxruntime as ort
+
+    cfg = StaticGraphExportConfig(
+        num_nodes=shape.num_nodes,
+        input_len=shape.input_len,
+        num_features=shape.num_features,
+        horizon=shape.horizon,
+    )
+    onnx_file = ctx.workdir / "bench_forecaster.onnx"
+    export_static_graph_onnx(model, onnx_file, cfg, adjacency=adjacency)
+    session = ort.InferenceSession(
+        onnx_file.as_posix(), providers=["CPUExecutionProvider"]
+    )
+
+    for bs in ctx.batch_sizes:
+        x = _window(ctx, bs)
+        x_np = np.ascontiguousarray(x.numpy())
+
+        def run_torch(x=x) -> None:
+            with torch.inference_mode():
+                module(x)
+
+        results.append(
+            latency(f"torch.latency.b{bs}", run_torch, **common, batch_size=bs)
+        )
+        results.append(
+            latency(
+                f"onnx.latency.b{bs}",
+                lambda x_np=x_np: session.run(
+                    [cfg.output_name], {cfg.input_name: x_np}
+                ),
+                **common,
+                batch_size=bs,
+            )
+        )
+    return results
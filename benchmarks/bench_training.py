@@ -0,0 +1,42 @@
+"""Training step (forward + backward + optimizer step) on synthetic windows."""
+
+from __future__ import annotations
+
+from typing import List
+
+import torch
+
+from benchmarks.harness import BenchContext, BenchResult, throughput
+from benchmarks.synthetic import BenchForecaster, make_adjacency
+
+
+def run(ctx: BenchContext) -> List[BenchResult]:
+    shape = ctx.shape
+    torch.manual_seed(0)
+    model = BenchForecaster(shape).train()
+    adjacency = torch.from_numpy(make_adjacency(shape.num_nodes))
+    opt = torch.optim.Adam(model.parameters(), lr=1e-3)
+
+    bs = ctx.batch_size
+    x = torch.randn(bs, shape.input_len, shape.num_nodes, shape.num_features)
+    y = torch.randn(bs, shape.horizon, shape.num_nodes, shape.num_features)
+
+    def step() -> None:
+        opt.zero_grad(set_to_none=True)
+        loss = torch.nn.functional.l1_loss(model(x, adjacency), y)
+        loss.backward()
+        opt.step()
+
+    return [
+        throughput(
+            "train.step",
+            step,
+            bs,
+            "samples/s",
+            warmup=ctx.warmup,
+            repeat=ctx.repeat,
+            batch_size=bs,
+            num_nodes=shape.num_nodes,
+            threads=torch.get_num_threads(),
+        )
+    ]
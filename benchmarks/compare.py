@@ -0,0 +1,86 @@
+"""Compare two benchmark JSON files and flag regressions.
+
+Example::
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.10
+
+Exits 1 when any shared benchmark is worse than the baseline by more than
+`--threshold` (relative), taking each result's direction into account.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+def _load(path: Path) -> Dict[str, Dict[str, Any]]:
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Tuple[str, float, float, float, str]]:
+    """Rows of (name, baseline, current, relative change, status).
+
+    `relative change` is signed so that positive always means "better".
+    """
+    rows = []
+    for name in sorted(set(baseline) & set(current)):
+        base, cur = baseline[name], current[name]
+        b, c = float(base["value"]), float(cur["value"])
+        change = (c - b) / b if b else 0.0
+        if not base.get("higher_is_better", True):
+            change = -change
+        if change < -threshold:
+            status = "REGRESSION"
+        elif change > threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((name, b, c, change, status))
+    return rows
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("baseline", type=Path)
+    p.add_argument("current", type=Path)
+    p.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown tolerated before flagging (default 0.10).",
+    )
+    args = p.parse_args(argv)
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    rows = compare(baseline, current, args.threshold)
+    if not rows:
+        print("No benchmarks in common.")
+        return 0
+
+    width = max(len(r[0]) for r in rows)
+    for name, b, c, change, status in rows:
+        unit = current[name]["unit"]
+        print(
+            f"{name:<{width}}  {b:>12.2f} -> {c:>12.2f} {unit:<11} {change:+7.1%}  {status}"
+        )
+    for name in sorted(set(baseline) ^ set(current)):
+        print(
+            f"{name:<{width}}  (only in {'baseline' if name in baseline else 'current'})"
+        )
+
+    regressions = [r for r in rows if r[4] == "REGRESSION"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""Timing primitives and the result record shared by all benchmark suites."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+
+if TYPE_CHECKING:
+    from benchmarks.synthetic import SyntheticShape
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool
+    stats: Dict[str, float] = field(default_factory=dict)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def time_calls(
+    fn: Callable[[], Any], *, warmup: int = 3, repeat: int = 20
+) -> Dict[str, float]:
+    """Seconds per call of `fn` (median / mean / p90 / min / stdev over `repeat`)."""
+    for _ in range(warmup):
+        fn()
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return {
+        "median_s": statistics.median(samples),
+        "mean_s": statistics.fmean(samples),
+        "p90_s": samples[min(len(samples) - 1, int(0.9 * len(samples)))],
+        "min_s": samples[0],
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "repeat": float(repeat),
+    }
+
+
+def latency(
+    name: str, fn: Callable[[], Any], *, warmup: int = 3, repeat: int = 20, **params
+) -> BenchResult:
+    """Median latency of one call, in milliseconds (lower is better)."""
+    stats = time_calls(fn, warmup=warmup, repeat=repeat)
+    return BenchResult(name, stats["median_s"] * 1e3, "ms", False, stats, params)
+
+
+def throughput(
+    name: str,
+    fn: Callable[[], Any],
+    items_per_call: int,
+    unit: str,
+    *,
+    warmup: int = 3,
+    repeat: int = 20,
+    **params,
+) -> BenchResult:
+    """Items per second at the median call time (higher is better)."""
+    stats = time_calls(fn, warmup=warmup, repeat=repeat)
+    return BenchResult(
+        name, items_per_call / stats["median_s"], unit, True, stats, params
+    )
+
+
+@dataclass(frozen=True)
+class BenchContext:
+    """Inputs shared by every suite for one `benchmarks.run` invocation."""
+
+    workdir: Path  # holds the synthetic series and exported models
+    shape: "SyntheticShape"
+    batch_sizes: List[int]
+    batch_size: int = 32
+    repeat: int = 20
+    warmup: int = 3
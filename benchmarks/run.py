@@ -0,0 +1,132 @@
+"""Run the benchmark suites and write the results as JSON.
+
+Example::
+
+    python -m benchmarks.run --output benchmarks/results/baseline.json
+    python -m benchmarks.run --suite data,train --nodes 8600 --output big.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import torch
+
+from benchmarks.harness import BenchContext, BenchResult
+from benchmarks.synthetic import SyntheticShape, write_series
+
+SUITES = {
+    "data": "benchmarks.bench_data",
+    "train": "benchmarks.bench_training",
+    "inference": "benchmarks.bench_inference",
+    "api": "benchmarks.bench_api",
+}
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _meta(args: argparse.Namespace, shape: SyntheticShape) -> Dict[str, Any]:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "torch_threads": torch.get_num_threads(),
+        "shape": vars(shape),
+        "batch_sizes": args.batch_sizes,
+        "repeat": args.repeat,
+    }
+
+
+def _print_table(results: List[BenchResult]) -> None:
+    width = max(len(r.name) for r in results)
+    for r in results:
+        spread = r.stats.get("stdev_s", 0.0) / max(r.stats.get("median_s", 1.0), 1e-12)
+        print(f"{r.name:<{width}}  {r.value:>12.2f} {r.unit:<11}  ±{spread:5.1%}")
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--suite", default=",".join(SUITES), help="Comma-separated suites.")
+    p.add_argument("--output", type=Path, default=None, help="Write results JSON.")
+    p.add_argument("--nodes", type=int, default=716, help="Sensors (LargeST SD=716).")
+    p.add_argument("--num-steps", type=int, default=SyntheticShape.num_steps)
+    p.add_argument("--input-len", type=int, default=12)
+    p.add_argument("--horizon", type=int, default=12)
+    p.add_argument("--batch-size", type=int, default=32)
+    p.add_argument(
+        "--batch-sizes",
+        type=lambda s: [int(v) for v in s.split(",")],
+        default=[1, 8, 32],
+        help="Batch sizes for latency benchmarks.",
+    )
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--warmup", type=int, default=3)
+    p.add_argument("--threads", type=int, default=None, help="torch intra-op threads.")
+    args = p.parse_args(argv)
+
+    suites = [s.strip() for s in args.suite.split(",") if s.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        p.error(f"unknown suite(s): {sorted(unknown)}; choose from {sorted(SUITES)}")
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    shape = SyntheticShape(
+        num_nodes=args.nodes,
+        num_steps=args.num_steps,
+        input_len=args.input_len,
+        horizon=args.horizon,
+    )
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        workdir = Path(tmp)
+        write_series(workdir / "series.npy", shape)
+        ctx = BenchContext(
+            workdir=workdir,
+            shape=shape,
+            batch_sizes=args.batch_sizes,
+            batch_size=args.batch_size,
+            repeat=args.repeat,
+            warmup=args.warmup,
+        )
+        for suite in suites:
+            print(f"== {suite}", file=sys.stderr)
+            results.extend(importlib.import_module(SUITES[suite]).run(ctx))
+
+    _print_table(results)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        doc = {
+            "meta": _meta(args, shape),
+            "results": {r.name: r.to_dict() for r in results},
+        }
+        args.output.write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"Wrote {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
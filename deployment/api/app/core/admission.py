@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
+
+from .metrics import (
+    ADMISSION_INFLIGHT,
+    ADMISSION_QUEUE_DEPTH,
+    ADMISSION_REJECTED,
+    ADMISSION_WAIT,
+)
+
+PRIORITIES = ("high", "normal", "low")
+
+
+@dataclass(frozen=True)
+class AdmissionConfig:
+    enabled: bool = False
+    max_concurrency: int = 4
+    max_queue: int = 64
+    # Share of `max_queue` that `low` requests may occupy; the rest is kept
+    # for `normal` / `high` so background traffic is shed first.
+    low_queue_frac: float = 0.5
+    # Budget applied when the client sends no deadline header (0 = none).
+    default_deadline_ms: float = 0.0
+    # Seed for the service-time estimate until real requests have been timed.
+    initial_service_ms: float = 50.0
+    deadline_header: str = "x-request-deadline-ms"
+    priority_header: str = "x-priority"
+
+    @staticmethod
+    def from_env() -> "AdmissionConfig":
+        return AdmissionConfig(
+            enabled=os.getenv("ADMISSION_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            max_concurrency=int(os.getenv("ADMISSION_MAX_CONCURRENCY", "4")),
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "64")),
+            low_queue_frac=float(os.getenv("ADMISSION_LOW_QUEUE_FRAC", "0.5")),
+            default_deadline_ms=float(os.getenv("ADMISSION_DEFAULT_DEADLINE_MS", "0")),
+            initial_service_ms=float(os.getenv("ADMISSION_INITIAL_SERVICE_MS", "50")),
+        )
+
+
+class Rejected(Exception):
+    """Request shed before (or while) waiting for a slot."""
+
+    def __init__(self, status: int, reason: str, retry_after_s: float):
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """Bounded concurrency with a priority queue and deadline-aware shedding.
+
+    At most `max_concurrency` requests run at once; the rest wait in a queue
+    ordered by priority, then arrival. A request is rejected up front when
+    the queue is full for its class (429), or when the estimated wait plus one
+    service time already exceeds its deadline (503). Service time is an EWMA of
+    completed requests. A queued request whose deadline passes while waiting
+    is dropped as well, so the model never works on answers nobody will read.
+    """
+
+    def __init__(self, cfg: AdmissionConfig):
+        self.cfg = cfg
+        self._inflight = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._service_s = cfg.initial_service_ms / 1000
+        ADMISSION_INFLIGHT.set(0)
+        ADMISSION_QUEUE_DEPTH.set(0)
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for *_, f in self._waiters if not f.done())
+
+    @property
+    def service_ms(self) -> float:
+        return 1000 * self._service_s
+
+    def estimate_wait_s(self, priority: str = "normal") -> float:
+        """Expected queueing delay for a request of `priority` arriving now."""
+        if self._inflight < self.cfg.max_concurrency and not self._waiters:
+            return 0.0
+        rank = PRIORITIES.index(priority)
+        ahead = sum(1 for r, _, f in self._waiters if r <= rank and not f.done())
+        return math.ceil((ahead + 1) / self.cfg.max_concurrency) * self._service_s
+
+    def _check(self, priority: str, deadline_s: Optional[float]) -> None:
+        cap = self.cfg.max_queue
+        if priority == "low":
+            cap = int(cap * self.cfg.low_queue_frac)
+        saturated = self._inflight >= self.cfg.max_concurrency or bool(self._waiters)
+        if saturated and self.queued >= cap:
+            self._reject(429, "queue_full", priority)
+        wait = self.estimate_wait_s(priority)
+        if deadline_s is not None and wait + self._service_s > deadline_s:
+            self._reject(503, "deadline", priority, wait)
+
+    def _reject(
+        self, status: int, reason: str, priority: str, wait_s: float = 0.0
+    ) -> None:
+        ADMISSION_REJECTED.labels(reason=reason, priority=priority).inc()
+        raise Rejected(status, reason, max(wait_s, self._service_s))
+
+    def _release(self, elapsed_s: float) -> None:
+        self._service_s += 0.2 * (elapsed_s - self._service_s)
+        while self._waiters:
+            *_, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)  # the slot passes straight to the waiter
+                break
+        else:
+            self._inflight -= 1
+        ADMISSION_INFLIGHT.set(self._inflight)
+        ADMISSION_QUEUE_DEPTH.set(self.queued)
+
+    async def _acquire(self, priority: str, deadline_s: Optional[float]) -> None:
+        if self._inflight < self.cfg.max_concurrency and not self._waiters:
+            self._inflight += 1
+            ADMISSION_INFLIGHT.set(self._inflight)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            self._waiters, (PRIORITIES.index(priority), next(self._seq), fut)
+        )
+        ADMISSION_QUEUE_DEPTH.set(self.queued)
+        # Give up once there is no longer time to serve the request.
+        timeout = None if deadline_s is None else max(deadline_s - self._service_s, 0)
+        try:
+            await asyncio.wait_for(asyncio.shield(fut), timeout)
+        except BaseException as e:
+            if fut.done() and not fut.cancelled():
+                self._release(self._service_s)  # slot was handed over; pass it on
+            else:
+                fut.cancel()
+                self._waiters = [w for w in self._waiters if w[2] is not fut]
+                heapq.heapify(self._waiters)
+            ADMISSION_QUEUE_DEPTH.set(self.queued)
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject(503, "deadline_expired", priority)
+            raise
+
+    @asynccontextmanager
+    async def admit(
+        self, priority: str = "normal", deadline_ms: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """Hold one execution slot for the duration of the block."""
+        if priority not in PRIORITIES:
+            priority = "normal"
+        if deadline_ms is None and self.cfg.default_deadline_ms > 0:
+            deadline_ms = self.cfg.default_deadline_ms
+        deadline_s = None if deadline_ms is None else deadline_ms / 1000
+        self._check(priority, deadline_s)
+
+        t0 = time.perf_counter()
+        await self._acquire(priority, deadline_s)
+        started = time.perf_counter()
+        ADMISSION_WAIT.labels(priority=priority).observe(started - t0)
+        try:
+            yield
+        finally:
+            self._release(time.perf_counter() - started)
+
+    def status(self) -> dict[str, float]:
+        return {
+            "inflight": self._inflight,
+            "queued": self.queued,
+            "max_concurrency": self.cfg.max_concurrency,
+            "service_ms": self.service_ms,
+        }
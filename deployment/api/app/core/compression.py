@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional: zstd is offered only when `zstandard` is installed
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+_COMPRESSIBLE = ("application/json", "application/octet-stream", "text/")
+
+
+@dataclass(frozen=True)
+class CompressionConfig:
+    enabled: bool = True
+    min_bytes: int = 1024
+    gzip_level: int = 5
+    zstd_level: int = 3
+
+    @staticmethod
+    def from_env() -> "CompressionConfig":
+        return CompressionConfig(
+            enabled=os.getenv("COMPRESSION_ENABLED", "true").lower()
+            in ("1", "true", "yes"),
+            min_bytes=int(os.getenv("COMPRESSION_MIN_BYTES", "1024")),
+            gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "5")),
+            zstd_level=int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+        )
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """`zstd` or `gzip` when the client accepts it (q=0 excluded), else None."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(name.strip())
+    if zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str, cfg: CompressionConfig):
+        if encoding == "zstd":
+            self._obj: Any = zstandard.ZstdCompressor(
+                level=cfg.zstd_level
+            ).compressobj()
+            self._flush = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        else:
+            self._obj = zlib.compressobj(cfg.gzip_level, zlib.DEFLATED, 31)
+            self._flush = zlib.Z_SYNC_FLUSH
+
+    def chunk(self, data: bytes) -> bytes:
+        # Flushed per chunk so streamed responses can be decoded as they arrive.
+        return self._obj.compress(data) + self._obj.flush(self._flush)
+
+    def whole(self, data: bytes) -> bytes:
+        return self._obj.compress(data) + self._obj.flush()
+
+    def finish(self) -> bytes:
+        return self._obj.flush()
+
+
+class CompressionMiddleware:
+    """Negotiated zstd/gzip for JSON and binary responses above `min_bytes`.
+
+    Works on streamed bodies chunk by chunk, so large forecasts are compressed
+    without being buffered whole. Responses that already carry a
+    `Content-Encoding` are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, cfg: Optional[CompressionConfig] = None):
+        self.app = app
+        self._cfg = cfg
+
+    @property
+    def cfg(self) -> CompressionConfig:
+        if self._cfg is None:  # read lazily: `.env` is loaded in the lifespan
+            self._cfg = CompressionConfig.from_env()
+        return self._cfg
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.cfg.enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        cfg = self.cfg
+        start: Message = {}
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+        pending = b""  # streamed chunks held back until min_bytes is reached
+
+        async def _send(message: Message) -> None:
+            nonlocal start, compressor, passthrough, pending
+            if message["type"] == "http.response.start":
+                start = message  # held until the first body chunk decides
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+            if compressor is None:
+                body, pending = pending + body, b""
+                if more and len(body) < cfg.min_bytes:
+                    pending = body
+                    return
+                message = {"type": "http.response.body", "body": body}
+                if more:
+                    message["more_body"] = True
+                headers = MutableHeaders(raw=start["headers"])
+                if (
+                    "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(_COMPRESSIBLE)
+                    or (not more and len(body) < cfg.min_bytes)
+                ):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding, cfg)
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if not more:
+                    data = compressor.whole(body)
+                    headers["Content-Length"] = str(len(data))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                del headers["Content-Length"]
+                await send(start)
+
+            data = compressor.chunk(body) if body else b""
+            if not more:
+                data += compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more})
+
+        await self.app(scope, receive, _send)
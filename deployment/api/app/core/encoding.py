@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, Iterator, Mapping, Optional, Tuple
+
+import numpy as np
+import orjson
+from starlette.responses import StreamingResponse
+
+FORMATS = ("json", "f16", "delta")
+BINARY_MEDIA_TYPE = "application/octet-stream"
+_NUMPY = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+_F16_MAX = float(np.finfo(np.float16).max)
+# Proxies and ingresses commonly cap all headers at 8-16 KiB; larger metadata
+# (e.g. a full-network node list) goes at the start of the body instead.
+META_HEADER_MAX_BYTES = 4096
+
+
+class EncodingError(ValueError):
+    """Output that cannot be written in the requested format (answered with 422)."""
+
+
+def requested_format(params: Mapping[str, str]) -> Tuple[str, float]:
+    """`(format, error_bound)` from `?format=json|f16|delta&error_bound=...`."""
+    fmt = params.get("format", "json").lower()
+    if fmt not in FORMATS:
+        raise EncodingError(f"format must be one of {FORMATS}")
+    try:
+        bound = float(params.get("error_bound", "0.01"))
+    except ValueError as e:
+        raise EncodingError("error_bound must be a number") from e
+    return fmt, bound
+
+
+def _chunked(pieces: Iterator[bytes], chunk_bytes: int) -> Iterator[bytes]:
+    buf = bytearray()
+    for piece in pieces:
+        buf += piece
+        if len(buf) >= chunk_bytes:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+async def _aiter(chunks: Iterator[bytes]) -> AsyncIterator[bytes]:
+    # Chunks are cheap to produce; an async iterator avoids one thread-pool hop
+    # per chunk that StreamingResponse makes for plain iterators.
+    for chunk in chunks:
+        yield chunk
+
+
+def _json_pieces(arr: np.ndarray, chunk_bytes: int) -> Iterator[bytes]:
+    """Nested JSON of `arr`, split along leading axes until pieces are small."""
+    if arr.ndim == 0 or arr.nbytes <= chunk_bytes:
+        yield orjson.dumps(arr, option=_NUMPY)
+        return
+    yield b"["
+    for i in range(arr.shape[0]):
+        if i:
+            yield b","
+        yield from _json_pieces(arr[i], chunk_bytes)
+    yield b"]"
+
+
+def _delta_quantize(arr: np.ndarray, error_bound: float) -> Tuple[np.ndarray, float]:
+    """Round to a grid of `2 * error_bound` and delta-encode along axis 0.
+
+    Consecutive horizon steps are close, so the deltas fit a narrow integer
+    type and compress well. Decoding is `cumsum(axis=0) * step`.
+    """
+    if not (np.isfinite(error_bound) and error_bound > 0):
+        raise EncodingError("error_bound must be positive")
+    if not np.isfinite(arr).all():
+        raise EncodingError("delta encoding needs finite outputs")
+    step = 2.0 * error_bound
+    q = np.rint(arr.astype(np.float64) / step).astype(np.int64)
+    deltas = np.diff(q, axis=0, prepend=0) if q.ndim else q
+    lo, hi = (int(deltas.min()), int(deltas.max())) if deltas.size else (0, 0)
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return deltas.astype(dtype), step
+    return deltas, step  # pragma: no cover
+
+
+def encode_array(
+    arr: np.ndarray, fmt: str, error_bound: float = 0.01
+) -> Tuple[np.ndarray, Dict[str, str]]:
+    """Binary payload for `fmt` (`f16` or `delta`) and the headers describing it."""
+    arr = np.asarray(arr, dtype=np.float32)
+    if fmt == "f16":
+        if arr.size and np.nanmax(np.abs(arr)) > _F16_MAX:
+            raise EncodingError("outputs exceed the float16 range; use delta")
+        out = arr.astype(np.float16)
+        err = np.abs(out.astype(np.float32) - arr)
+        bound = float(np.nanmax(err)) if arr.size else 0.0
+        headers = {"X-Array-Encoding": "f16"}
+    elif fmt == "delta":
+        out, step = _delta_quantize(arr, error_bound)
+        bound = step / 2
+        headers = {"X-Array-Encoding": "delta", "X-Array-Scale": repr(step)}
+    else:
+        raise EncodingError(f"format must be one of {FORMATS}")
+    headers.update(
+        {
+            "X-Array-Shape": ",".join(map(str, arr.shape)),
+            "X-Array-Dtype": out.dtype.str,
+            "X-Error-Bound": repr(bound),
+        }
+    )
+    return np.ascontiguousarray(out), headers
+
+
+def _meta_length(headers: Mapping[str, str]) -> int:
+    return int(headers.get("x-meta-length", 0))
+
+
+def decode_meta(body: bytes, headers: Mapping[str, str]) -> Dict[str, Any]:
+    """Metadata of a binary response, from `X-Meta` or the start of the body."""
+    n = _meta_length(headers)
+    return orjson.loads(body[:n] if n else headers["x-meta"])
+
+
+def decode_array(body: bytes, headers: Mapping[str, str]) -> np.ndarray:
+    """Inverse of `encode_array`, for clients of the binary formats."""
+    body = body[_meta_length(headers) :]
+    shape = tuple(int(s) for s in headers["x-array-shape"].split(",") if s)
+    arr = np.frombuffer(body, dtype=np.dtype(headers["x-array-dtype"])).reshape(shape)
+    if headers["x-array-encoding"] == "delta":
+        q = np.cumsum(arr, axis=0, dtype=np.int64) if arr.ndim else arr
+        return (q * float(headers["x-array-scale"])).astype(np.float32)
+    return arr.astype(np.float32)
+
+
+def array_response(
+    outputs: Any,
+    meta: Dict[str, Any],
+    fmt: str = "json",
+    error_bound: float = 0.01,
+    chunk_bytes: int = 256 * 1024,
+    headers: Optional[Dict[str, str]] = None,
+    meta_header_max_bytes: int = META_HEADER_MAX_BYTES,
+) -> StreamingResponse:
+    """Stream `outputs` with `meta`, never materializing the whole body.
+
+    `json` writes `{...meta, "outputs": [...]}` piece by piece. The binary
+    formats send the raw array, with shape, dtype, encoding and error bound as
+    headers. `meta` (JSON) goes in `X-Meta` when it fits in
+    `meta_header_max_bytes`; otherwise it prefixes the body and `X-Meta-Length`
+    gives its size. `decode_meta`/`decode_array` handle both.
+    """
+    headers = dict(headers or {})
+    if fmt == "json":
+        arr = np.ascontiguousarray(outputs)
+        if arr.dtype.kind == "f" and arr.dtype != np.float64:
+            arr = arr.astype(np.float32, copy=False)
+        head = orjson.dumps(meta, option=_NUMPY)[:-1]
+        head += b',"outputs":' if meta else b'"outputs":'
+
+        def _pieces() -> Iterator[bytes]:
+            yield head
+            yield from _json_pieces(arr, chunk_bytes)
+            yield b"}"
+
+        return StreamingResponse(
+            _aiter(_chunked(_pieces(), chunk_bytes)),
+            media_type="application/json",
+            headers=headers,
+        )
+
+    try:
+        arr = np.asarray(outputs, dtype=np.float32)
+    except (TypeError, ValueError) as e:
+        raise EncodingError(f"{fmt} needs numeric array outputs") from e
+    payload, array_headers = encode_array(arr, fmt, error_bound)
+    headers.update(array_headers)
+    meta_json = orjson.dumps(meta, option=_NUMPY)
+    prefix = b""
+    if len(meta_json) <= meta_header_max_bytes:
+        headers["X-Meta"] = meta_json.decode()
+    else:
+        headers["X-Meta-Length"] = str(len(meta_json))
+        prefix = meta_json
+    flat = payload.reshape(-1).view(np.uint8)
+
+    def _binary() -> Iterator[bytes]:
+        if prefix:
+            yield prefix
+        for start in range(0, flat.size, chunk_bytes):
+            yield flat[start : start + chunk_bytes].tobytes()
+
+    return StreamingResponse(
+        _aiter(_binary()), media_type=BINARY_MEDIA_TYPE, headers=headers
+    )
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+from loguru import logger
+
+from .streaming import StreamState
+
+
+@dataclass(frozen=True)
+class ForecastScheduleConfig:
+    enabled: bool = False
+    interval_s: float = 300.0
+    # Delay after each interval boundary, so that interval's readings have landed.
+    offset_s: float = 5.0
+
+    @staticmethod
+    def from_env() -> "ForecastScheduleConfig":
+        return ForecastScheduleConfig(
+            enabled=os.getenv("FORECAST_SCHEDULE_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            interval_s=float(os.getenv("FORECAST_INTERVAL_S", "300")),
+            offset_s=float(os.getenv("FORECAST_OFFSET_S", "5")),
+        )
+
+
+@dataclass(frozen=True)
+class ForecastSnapshot:
+    """One published full-network forecast, `[horizon, N, C]`, read-only."""
+
+    version: int
+    array: np.ndarray
+    step: int
+    timestamp: Optional[str]
+    computed_at: float
+
+
+class ForecastStore:
+    """Latest forecast snapshot, replaced atomically.
+
+    Every publish builds a new read-only array and then swaps a single
+    reference. A reader takes one reference and slices it, so it always sees
+    one complete version, never a mix of old and new values.
+    """
+
+    def __init__(self) -> None:
+        self._current: Optional[ForecastSnapshot] = None
+
+    @property
+    def current(self) -> Optional[ForecastSnapshot]:
+        return self._current
+
+    def publish(
+        self, outputs: Any, step: int, timestamp: Optional[str] = None
+    ) -> ForecastSnapshot:
+        array = np.array(outputs, dtype=np.float32)  # private copy
+        if array.ndim == 4 and array.shape[0] == 1:
+            array = array[0]
+        if array.ndim == 2:
+            array = array[..., None]
+        if array.ndim != 3:
+            raise ValueError(f"Expected a [horizon, N, C] forecast, got {array.shape}")
+        array.flags.writeable = False
+        prev = self._current
+        snap = ForecastSnapshot(
+            version=(prev.version + 1) if prev else 1,
+            array=array,
+            step=step,
+            timestamp=timestamp,
+            computed_at=time.time(),
+        )
+        self._current = snap
+        return snap
+
+
+class ForecastScheduler:
+    """Computes the full-network forecast once per interval from the stream state.
+
+    Wakes `offset_s` after each `interval_s` wall-clock boundary. It runs the
+    model only when new readings arrived since the last publish, then
+    publishes into `store`.
+    """
+
+    def __init__(
+        self, cfg: ForecastScheduleConfig, stream: StreamState, store: ForecastStore
+    ):
+        self.cfg = cfg
+        self.stream = stream
+        self.store = store
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="forecast-scheduler")
+        logger.info(
+            "Forecast scheduler: every {}s (+{}s offset)",
+            self.cfg.interval_s,
+            self.cfg.offset_s,
+        )
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def _sleep_s(self) -> float:
+        interval = self.cfg.interval_s
+        now = time.time()
+        boundary = (now - self.cfg.offset_s) // interval * interval
+        return boundary + interval + self.cfg.offset_s - now
+
+    async def run_once(self) -> Optional[ForecastSnapshot]:
+        """Publish a forecast for the latest stream state if it is new."""
+        current = self.store.current
+        if not self.stream.window.ready or (
+            current is not None and current.step == self.stream.window.steps
+        ):
+            return None
+        t0 = time.perf_counter()
+        outputs, step, timestamp = await self.stream.forecast()
+        snap = self.store.publish(outputs, step, timestamp)
+        logger.info(
+            "Published forecast v{} (step {}, {:.0f} ms)",
+            snap.version,
+            step,
+            1000 * (time.perf_counter() - t0),
+        )
+        return snap
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._sleep_s())
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Scheduled forecast failed; keeping previous one.")
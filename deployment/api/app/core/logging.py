@@ -1,24 +1,58 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import os
+import queue
+import random
 import sys
+import threading
+import time
+import traceback
 from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Optional
 
+import orjson
 from loguru import logger
 
 request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
 
 
 class InterceptHandler(logging.Handler):
-    """Redirect stdlib logging (uvicorn, fastapi, etc.) into loguru."""
+    """Redirect stdlib logging (uvicorn, fastapi, etc.) into loguru.
+
+    With `walk_frames=False` the caller is taken from the stdlib record
+    instead of by walking the stack, which is what the JSON sink reports.
+    `access_sample` keeps that fraction of `uvicorn.access` records; 5xx
+    responses are always kept.
+    """
+
+    def __init__(self, walk_frames: bool = True, access_sample: float = 1.0):
+        super().__init__()
+        self.walk_frames = walk_frames
+        self.access_sample = access_sample
 
     def emit(self, record: logging.LogRecord) -> None:
+        if record.name == "uvicorn.access" and self.access_sample < 1.0:
+            status = record.args[-1] if isinstance(record.args, tuple) else 0
+            if not (isinstance(status, int) and status >= 500) and (
+                random.random() >= self.access_sample
+            ):
+                return
+
         try:
             level = logger.level(record.levelname).name
         except Exception:
             level = record.levelno
 
+        if not self.walk_frames:
+            logger.bind(
+                request_id=request_id_var.get(),
+                origin=(record.name, record.lineno),
+            ).opt(exception=record.exc_info).log(level, record.getMessage())
+            return
+
         frame, depth = logging.currentframe(), 2
         while frame and frame.f_code.co_filename == logging.__file__:
             frame = frame.f_back
@@ -30,26 +64,241 @@ class InterceptHandler(logging.Handler):
         ).log(level, record.getMessage())
 
 
+class LevelRateLimiter:
+    """Token bucket per level name (records/second, burst of one second).
+
+    Used as a loguru `filter`; dropped records are counted per level and
+    reported by the JSON sink or, in text mode, by `DropReporter`. Records
+    bound with `drop_notice=True` (those reports) are never limited.
+    """
+
+    def __init__(self, limits: Dict[str, float]):
+        self.limits = {k.upper(): v for k, v in limits.items() if v > 0}
+        self._tokens = dict(self.limits)
+        self._stamp = {k: time.monotonic() for k in self.limits}
+        self.dropped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: Dict[str, Any]) -> bool:
+        name = record["level"].name
+        rate = self.limits.get(name)
+        if rate is None or record["extra"].get("drop_notice"):
+            return True
+        now = time.monotonic()
+        tokens = min(rate, self._tokens[name] + (now - self._stamp[name]) * rate)
+        self._stamp[name] = now
+        if tokens < 1.0:
+            self._tokens[name] = tokens
+            with self._lock:
+                self.dropped[name] = self.dropped.get(name, 0) + 1
+            return False
+        self._tokens[name] = tokens - 1.0
+        return True
+
+    def take_dropped(self) -> Dict[str, int]:
+        """Drop counts since the last call, per level."""
+        with self._lock:
+            counts, self.dropped = self.dropped, {}
+        return counts
+
+    @staticmethod
+    def parse(spec: str) -> Dict[str, float]:
+        """`"DEBUG=50,INFO=500"` -> `{"DEBUG": 50.0, "INFO": 500.0}`."""
+        limits = {}
+        for part in filter(None, (p.strip() for p in spec.split(","))):
+            name, _, rate = part.partition("=")
+            limits[name.strip().upper()] = float(rate)
+        return limits
+
+
+class DropReporter:
+    """Logs what a `LevelRateLimiter` dropped every `interval_s` (text mode).
+
+    The JSON sink reports drops itself; this gives text mode the same
+    `log records dropped` warning.
+    """
+
+    def __init__(self, limiter: LevelRateLimiter, interval_s: float = 10.0):
+        self._limiter = limiter
+        self._interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="log-drop-reporter", daemon=True
+        )
+        self._thread.start()
+
+    def report(self) -> None:
+        counts = self._limiter.take_dropped()
+        if counts:
+            logger.bind(drop_notice=True, dropped=counts).warning(
+                "log records dropped: {}",
+                ", ".join(f"{level}={n}" for level, n in sorted(counts.items())),
+            )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval_s):
+            self.report()
+
+    def close(self) -> None:
+        """Stop the thread and report whatever is still counted."""
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self.report()
+
+
+class AsyncJsonSink:
+    """Loguru sink that hands records to a writer thread.
+
+    The calling thread only copies a few fields into a bounded queue. The
+    writer serializes them with orjson and writes whole batches to stdout. When
+    the queue is full the record is dropped and counted rather than blocking
+    the request.
+    """
+
+    def __init__(
+        self,
+        stream=None,
+        max_queue: int = 10_000,
+        batch: int = 256,
+        limiter: Optional[LevelRateLimiter] = None,
+    ):
+        self._out = stream or sys.stdout.buffer
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._batch = batch
+        self._limiter = limiter
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message) -> None:
+        r = message.record
+        extra = r["extra"]
+        origin = extra.get("origin")
+        rid = extra.get("request_id", "-")
+        item = (
+            r["time"],
+            r["level"].name,
+            r["message"],
+            request_id_var.get() if rid == "-" else rid,
+            origin[0] if origin else r["name"],
+            origin[1] if origin else r["line"],
+            r["exception"],
+        )
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    @staticmethod
+    def _encode(item) -> bytes:
+        ts, level, msg, rid, module, line, exc = item
+        doc = {
+            "time": ts.isoformat(timespec="milliseconds"),
+            "level": level,
+            "message": msg,
+            "request_id": rid,
+            "module": module,
+            "line": line,
+        }
+        if exc is not None:
+            doc["exception"] = "".join(
+                traceback.format_exception(exc.type, exc.value, exc.traceback)
+            )
+        return orjson.dumps(doc, option=orjson.OPT_APPEND_NEWLINE)
+
+    def _notices(self) -> list[bytes]:
+        counts = self._limiter.take_dropped() if self._limiter else {}
+        if self.dropped:
+            counts["queue_full"], self.dropped = self.dropped, 0
+        if not counts:
+            return []
+        return [
+            orjson.dumps(
+                {
+                    "time": datetime.now()
+                    .astimezone()
+                    .isoformat(timespec="milliseconds"),
+                    "level": "WARNING",
+                    "message": "log records dropped",
+                    "dropped": counts,
+                },
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+        ]
+
+    def _run(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self._batch:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = items[-1] is None
+            lines = [self._encode(i) for i in items if i is not None]
+            lines += self._notices()
+            try:
+                self._out.write(b"".join(lines))
+                self._out.flush()
+            except Exception:
+                pass
+            for _ in items:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def close(self) -> None:
+        """Flush queued records and stop the writer."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+
+
+_sink: Optional[AsyncJsonSink] = None
+_reporter: Optional[DropReporter] = None
+
+
 def configure_logging() -> None:
     """
     Container-friendly logging:
     - stdout sink
-    - optional JSON format via LOG_FORMAT=json
+    - optional JSON format via LOG_FORMAT=json, written by a background thread
+    - LOG_ACCESS_SAMPLE: fraction of uvicorn access logs kept (5xx always kept)
+    - LOG_RATE_LIMITS: per-level records/second, e.g. "DEBUG=50,INFO=500";
+      drops are reported as a "log records dropped" warning in both formats
+      (text: every LOG_DROP_REPORT_S seconds, default 10)
     - unify uvicorn/stdlib logs into loguru
     """
+    global _sink, _reporter
     log_level = os.getenv("LOG_LEVEL", "INFO").upper()
     log_format = os.getenv("LOG_FORMAT", "text").lower()  # "text" or "json"
+    access_sample = float(os.getenv("LOG_ACCESS_SAMPLE", "1.0"))
+    limits = LevelRateLimiter.parse(os.getenv("LOG_RATE_LIMITS", ""))
+    limiter = LevelRateLimiter(limits) if limits else None
 
+    if _reporter is not None:
+        _reporter.close()
+        _reporter = None
     logger.remove()
+    if _sink is not None:
+        _sink.close()
+        _sink = None
 
     if log_format == "json":
-        fmt = (
-            '{{"time":"{time:YYYY-MM-DDTHH:mm:ss.SSSZ}",'
-            '"level":"{level}",'
-            '"message":{message!r},'
-            '"request_id":"{extra[request_id]}",'
-            '"module":"{name}",'
-            '"line":{line}}}'
+        _sink = AsyncJsonSink(limiter=limiter)
+        atexit.register(_sink.close)
+        logger.add(
+            _sink,
+            level=log_level,
+            # A callable format stops loguru from rendering the traceback on the
+            # calling thread; the writer formats it instead.
+            format=lambda _: "",
+            filter=limiter,
+            backtrace=False,
+            diagnose=False,
+            catch=False,
         )
     else:
         fmt = (
@@ -59,10 +308,23 @@ def configure_logging() -> None:
             "<cyan>{name}</cyan>:<cyan>{line}</cyan> - "
             "<level>{message}</level>"
         )
+        logger.add(
+            sys.stdout,
+            level=log_level,
+            format=fmt,
+            filter=limiter,
+            backtrace=False,
+            diagnose=False,
+        )
+        if limiter is not None:
+            _reporter = DropReporter(
+                limiter, float(os.getenv("LOG_DROP_REPORT_S", "10"))
+            )
+            atexit.register(_reporter.close)
 
-    logger.add(sys.stdout, level=log_level, format=fmt, backtrace=False, diagnose=False)
-
-    intercept = InterceptHandler()
+    intercept = InterceptHandler(
+        walk_frames=log_format != "json", access_sample=access_sample
+    )
     logging.root.handlers = [intercept]
     logging.root.setLevel(log_level)
 
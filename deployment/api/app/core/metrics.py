@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 from fastapi import FastAPI
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
 from starlette.responses import Response
 
 REQUEST_COUNT = Counter(
@@ -16,6 +22,68 @@ REQUEST_LATENCY = Histogram(
     ["method", "path"],
 )
 
+MODEL_LATENCY = Histogram(
+    "model_inference_seconds",
+    "Per-model predict() latency in seconds",
+    ["model"],
+)
+
+MODEL_MEMORY = Gauge(
+    "model_memory_bytes",
+    "Resident memory added by loading each model",
+    ["model"],
+)
+
+SHADOW_ABS_DIFF = Histogram(
+    "model_shadow_abs_diff",
+    "Mean absolute difference between a shadow model and the primary",
+    ["model"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2, 5, 10, 50, float("inf")),
+)
+
+SHADOW_DROPPED = Counter(
+    "model_shadow_dropped_total",
+    "Shadow runs skipped because MODEL_SHADOW_MAX_INFLIGHT runs were in flight",
+)
+
+ADMISSION_INFLIGHT = Gauge(
+    "admission_inflight_requests",
+    "Predict requests currently holding an execution slot",
+)
+
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth",
+    "Predict requests waiting for an execution slot",
+)
+
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Predict requests shed by admission control",
+    ["reason", "priority"],
+)
+
+ADMISSION_WAIT = Histogram(
+    "admission_wait_seconds",
+    "Time admitted requests spent queued",
+    ["priority"],
+)
+
+# Autoscaling signals (see core.scaling); values are computed on scrape.
+INFERENCE_INFLIGHT = Gauge(
+    "inference_inflight_requests",
+    "Predict requests in the handler on this replica, queued or running",
+)
+
+INFERENCE_UTILIZATION = Gauge(
+    "inference_capacity_utilization",
+    "In-flight predict requests per execution slot (above 1 means queueing)",
+)
+
+QUEUE_WAIT_P95 = Gauge(
+    "inference_queue_wait_p95_seconds",
+    "p95 admission queue wait over the last 15 seconds",
+)
+
 
 def install_metrics(app: FastAPI) -> None:
     """Adds /metrics endpoint and minimal request metrics middleware."""
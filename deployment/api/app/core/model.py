@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import os
-from dataclasses import dataclass
-from typing import Any, Optional
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
 
 import anyio
-import mlflow
+import numpy as np
 from loguru import logger
 from tenacity import (
     retry,
@@ -14,6 +16,11 @@ from tenacity import (
     wait_exponential,
 )
 
+from .metrics import MODEL_LATENCY, MODEL_MEMORY, SHADOW_ABS_DIFF, SHADOW_DROPPED
+from .payload import signature_spec
+
+_MODES = ("single", "ensemble", "shadow")
+
 
 @dataclass(frozen=True)
 class ModelServiceConfig:
@@ -21,6 +28,13 @@ class ModelServiceConfig:
     model_name: str
     model_alias: str = "prod"
     load_on_startup: bool = True
+    # Additional aliases (or version numbers) of `model_name` hosted alongside
+    # the primary; used as an ensemble or as shadows depending on `mode`.
+    extra_aliases: Tuple[str, ...] = ()
+    mode: str = "single"
+    # Shadow runs share the primary's thread pool; past this many in flight,
+    # new ones are dropped rather than queued behind live traffic.
+    shadow_max_inflight: int = 2
 
     @staticmethod
     def from_env() -> "ModelServiceConfig":
@@ -32,30 +46,102 @@ class ModelServiceConfig:
             "true",
             "yes",
         )
+        extra = os.getenv("MLFLOW_EXTRA_MODEL_ALIASES", "")
+        mode = os.getenv("MODEL_SERVING_MODE", "single").lower()
+        if mode not in _MODES:
+            raise ValueError(f"MODEL_SERVING_MODE must be one of {_MODES}")
         return ModelServiceConfig(
             tracking_uri=tracking_uri,
             model_name=model_name,
             model_alias=model_alias,
             load_on_startup=load_on_startup,
+            extra_aliases=tuple(a.strip() for a in extra.split(",") if a.strip()),
+            mode=mode,
+            shadow_max_inflight=int(os.getenv("MODEL_SHADOW_MAX_INFLIGHT", "2")),
         )
 
 
+@dataclass
+class ModelRun:
+    label: str
+    outputs: Any = None
+    latency_ms: float = 0.0
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class HostedModel:
+    label: str
+    uri: str
+    model: Any = None
+    memory_mb: Optional[float] = None
+    last_latency_ms: Optional[float] = field(default=None)
+
+
+def _rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def _decode(inputs: Any) -> Any:
+    """Numeric JSON payloads become one read-only float32 array shared by all
+    models; anything else is passed through unchanged."""
+    if isinstance(inputs, np.ndarray):
+        return inputs
+    if not isinstance(inputs, list):
+        return inputs
+    try:
+        arr = np.asarray(inputs, dtype=np.float32)
+    except (TypeError, ValueError):
+        return inputs
+    arr.flags.writeable = False
+    return arr
+
+
 class ModelService:
-    """Loads and serves a model artifact from MLflow Model Registry by alias."""
+    """Loads and serves models from the MLflow Model Registry by alias.
+
+    The primary alias answers requests. With `extra_aliases` more versions
+    live in the same process and run concurrently on the same decoded input:
+    `mode="ensemble"` averages all outputs; `mode="shadow"` answers with the
+    primary and logs the extras' latency and divergence off the request path.
+    """
 
     def __init__(self, cfg: ModelServiceConfig):
         self.cfg = cfg
         self._model: Optional[Any] = None
+        self.extras: Dict[str, HostedModel] = {
+            alias: HostedModel(alias, self._uri(alias)) for alias in cfg.extra_aliases
+        }
+        self.primary_memory_mb: Optional[float] = None
+        self.primary_latency_ms: Optional[float] = None
+        # Primary model's tensor signature, used to validate request payloads.
+        self.input_shape: Optional[Tuple[int, ...]] = None
+        self.input_dtype: Optional[np.dtype] = None
+        self._shadow_tasks: set[asyncio.Task] = set()
+        self._shadow_slots = asyncio.Semaphore(max(cfg.shadow_max_inflight, 1))
 
     @property
     def ready(self) -> bool:
         return self._model is not None
 
+    def _uri(self, alias: str) -> str:
+        if alias.isdigit():
+            return f"models:/{self.cfg.model_name}/{alias}"
+        return f"models:/{self.cfg.model_name}@{alias}"
+
     @property
     def model_uri(self) -> str:
-        return f"models:/{self.cfg.model_name}@{self.cfg.model_alias}"
+        return self._uri(self.cfg.model_alias)
 
     def _configure_mlflow(self) -> None:
+        # Imported here: mlflow pulls in pandas/sqlalchemy/etc., which would
+        # otherwise delay app import (and the socket bind) by seconds.
+        import mlflow
+
         mlflow.set_tracking_uri(self.cfg.tracking_uri)
 
     @retry(
@@ -64,25 +150,170 @@ class ModelService:
         wait=wait_exponential(multiplier=0.5, min=0.5, max=10),
         retry=retry_if_exception_type(Exception),
     )
-    def _load_sync(self) -> Any:
+    def _load_sync(self, uri: Optional[str] = None) -> Any:
+        import mlflow
+
         self._configure_mlflow()
-        uri = self.model_uri
+        uri = uri or self.model_uri
         logger.info("Loading model from MLflow registry: {}", uri)
         return mlflow.pyfunc.load_model(uri)
 
+    async def _load_measured(self, label: str, uri: str) -> Tuple[Any, Optional[float]]:
+        # Loaded one at a time so the RSS delta is attributable to this model.
+        before = _rss_mb()
+        model = await anyio.to_thread.run_sync(self._load_sync, uri)
+        after = _rss_mb()
+        memory = None if before is None or after is None else max(0.0, after - before)
+        if memory is not None:
+            MODEL_MEMORY.labels(model=label).set(memory * 2**20)
+            logger.info("Model {} loaded (+{:.0f} MiB RSS)", label, memory)
+        return model, memory
+
     async def load(self) -> None:
-        if self._model is not None:
-            return
-        self._model = await anyio.to_thread.run_sync(self._load_sync)
+        if self._model is None:
+            self._model, self.primary_memory_mb = await self._load_measured(
+                self.cfg.model_alias, self.model_uri
+            )
+            self.input_shape, self.input_dtype = signature_spec(self._model)
+        for hosted in self.extras.values():
+            if hosted.model is None:
+                # An extra that fails to load is skipped, not fatal: the primary
+                # still serves, and `/models` shows the extra as not loaded.
+                try:
+                    hosted.model, hosted.memory_mb = await self._load_measured(
+                        hosted.label, hosted.uri
+                    )
+                except Exception:
+                    logger.exception("Failed to load extra model {}", hosted.label)
+
+    def _loaded_extras(self) -> Dict[str, Any]:
+        return {h.label: h.model for h in self.extras.values() if h.model is not None}
 
     async def close(self) -> None:
-        return
+        for task in list(self._shadow_tasks):
+            task.cancel()
+
+    async def _run(self, label: str, model: Any, inputs: Any) -> ModelRun:
+        def _predict_sync() -> ModelRun:
+            t0 = time.perf_counter()
+            try:
+                out = model.predict(inputs)
+            except Exception as e:  # reported per model, not raised here
+                return ModelRun(label, error=e)
+            return ModelRun(label, out, 1000 * (time.perf_counter() - t0))
+
+        run = await anyio.to_thread.run_sync(_predict_sync)
+        if run.error is None:
+            MODEL_LATENCY.labels(model=label).observe(run.latency_ms / 1000)
+        return run
+
+    async def _run_all(self, inputs: Any, models: Dict[str, Any]) -> list[ModelRun]:
+        runs: list[ModelRun] = []
 
-    async def predict(self, inputs: Any) -> Any:
+        async def _one(label: str, model: Any) -> None:
+            runs.append(await self._run(label, model, inputs))
+
+        async with anyio.create_task_group() as tg:
+            for label, model in models.items():
+                tg.start_soon(_one, label, model)
+        return runs
+
+    async def _shadow(self, inputs: Any, primary: Any, extras: Dict[str, Any]) -> None:
+        try:
+            runs = await self._run_all(inputs, extras)
+        finally:
+            self._shadow_slots.release()
+        for run in runs:
+            if run.error is not None:
+                logger.warning("Shadow model {} failed: {}", run.label, run.error)
+                continue
+            self.extras[run.label].last_latency_ms = run.latency_ms
+            try:
+                diff = float(
+                    np.mean(np.abs(np.asarray(run.outputs) - np.asarray(primary)))
+                )
+            except (TypeError, ValueError):
+                diff = float("nan")
+            SHADOW_ABS_DIFF.labels(model=run.label).observe(diff)
+            logger.info(
+                "Shadow {}: {:.1f} ms, mean |diff| vs primary {:.4g}",
+                run.label,
+                run.latency_ms,
+                diff,
+            )
+
+    async def predict(self, inputs: Any) -> ModelRun:
+        """Outputs for `inputs` with this call's own model latency.
+
+        The latency travels with the result: `primary_latency_ms` is shared
+        across concurrent requests and only feeds `/models`.
+        """
         if self._model is None:
             await self.load()
+        extras = self._loaded_extras()
+        if not extras or self.cfg.mode == "single":
+            run = await self._run(self.cfg.model_alias, self._model, inputs)
+            if run.error is not None:
+                raise run.error
+            self.primary_latency_ms = run.latency_ms
+            return run
+
+        inputs = _decode(inputs)
+        if self.cfg.mode == "shadow":
+            run = await self._run(self.cfg.model_alias, self._model, inputs)
+            if run.error is not None:
+                raise run.error
+            self.primary_latency_ms = run.latency_ms
+            if self._shadow_slots.locked():
+                SHADOW_DROPPED.inc()
+                return run
+            await self._shadow_slots.acquire()  # free slot: returns immediately
+            task = asyncio.create_task(self._shadow(inputs, run.outputs, extras))
+            self._shadow_tasks.add(task)
+            task.add_done_callback(self._shadow_tasks.discard)
+            return run
 
-        def _predict_sync():
-            return self._model.predict(inputs)
+        models = {self.cfg.model_alias: self._model, **extras}
+        runs = await self._run_all(inputs, models)
+        ok = [r for r in runs if r.error is None]
+        for r in runs:
+            if r.label == self.cfg.model_alias:
+                self.primary_latency_ms = r.latency_ms
+            elif r.label in self.extras:
+                self.extras[r.label].last_latency_ms = r.latency_ms
+            if r.error is not None:
+                logger.warning("Ensemble member {} failed: {}", r.label, r.error)
+        if not ok:
+            raise runs[0].error  # type: ignore[misc]
+        # Members run concurrently, so the request waited for the slowest one.
+        return ModelRun(
+            self.cfg.model_alias,
+            np.mean([np.asarray(r.outputs, dtype=np.float32) for r in ok], axis=0),
+            max(r.latency_ms for r in ok),
+        )
 
-        return await anyio.to_thread.run_sync(_predict_sync)
+    def describe(self) -> list[Dict[str, Any]]:
+        """Hosted models with their memory and last latency, for `/models`."""
+        rows = [
+            {
+                "label": self.cfg.model_alias,
+                "uri": self.model_uri,
+                "role": "primary",
+                "loaded": self._model is not None,
+                "memory_mb": self.primary_memory_mb,
+                "last_latency_ms": self.primary_latency_ms,
+            }
+        ]
+        role = "shadow" if self.cfg.mode == "shadow" else "ensemble"
+        for h in self.extras.values():
+            rows.append(
+                {
+                    "label": h.label,
+                    "uri": h.uri,
+                    "role": role if self.cfg.mode != "single" else "idle",
+                    "loaded": h.model is not None,
+                    "memory_mb": h.memory_mb,
+                    "last_latency_ms": h.last_latency_ms,
+                }
+            )
+        return rows
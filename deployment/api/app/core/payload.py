@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+import orjson
+from starlette.responses import JSONResponse
+
+_SHAPE_DTYPE = Tuple[Optional[Tuple[int, ...]], Optional[np.dtype]]
+_NUMERIC = "fiub"
+
+
+class PayloadError(ValueError):
+    """Request body that fails shape/dtype validation (answered with 422)."""
+
+
+class ArrayJSONResponse(JSONResponse):
+    """JSON response serialized by orjson, with NumPy arrays written natively."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+
+def signature_spec(model: Any) -> _SHAPE_DTYPE:
+    """`(shape, dtype)` of a single-tensor MLflow signature; `-1` is any size."""
+    try:
+        schema = model.metadata.get_input_schema()
+    except AttributeError:
+        return None, None
+    if schema is None or not schema.is_tensor_spec() or len(schema.inputs) != 1:
+        return None, None
+    spec = schema.inputs[0]
+    return tuple(spec.shape), np.dtype(spec.type)
+
+
+def check_shape(shape: Sequence[int], expected: Optional[Sequence[int]]) -> None:
+    if expected is None:
+        return
+    if len(shape) != len(expected) or any(
+        e not in (-1, s) for s, e in zip(shape, expected)
+    ):
+        raise PayloadError(f"inputs must have shape {tuple(expected)}, got {shape}")
+
+
+def decode_inputs(
+    body: bytes,
+    shape: Optional[Sequence[int]] = None,
+    dtype: Optional[np.dtype] = None,
+) -> Any:
+    """Parse a `{"inputs": ...}` body without per-element validation.
+
+    orjson decodes the body and NumPy converts the lists in C. Only the
+    resulting shape (against `shape`, e.g. the model signature) and dtype are
+    checked. `{"inputs": [flat values], "shape": [...]}` is the fastest form: it
+    avoids one small list object per innermost row. Values are cast to the
+    signature's numeric `dtype`; without one NumPy infers it (ints stay ints,
+    floats are float64). Non-numeric inputs are returned as decoded unless a
+    signature demands a tensor.
+    """
+    try:
+        doc = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise PayloadError(f"invalid JSON: {e}") from e
+    if not isinstance(doc, dict) or "inputs" not in doc:
+        raise PayloadError('body must be an object with an "inputs" field')
+    inputs = doc["inputs"]
+    if "shape" in doc:
+        return _flat(inputs, doc["shape"], shape, dtype)
+    if not isinstance(inputs, list):
+        if shape is not None:
+            raise PayloadError("inputs must be a numeric array")
+        return inputs
+
+    try:
+        arr = np.asarray(inputs, dtype=_target(dtype))
+    except (TypeError, ValueError) as e:
+        if shape is not None:
+            raise PayloadError(f"inputs must be a rectangular numeric array: {e}")
+        return inputs
+    if arr.dtype.kind not in _NUMERIC:
+        if shape is not None:
+            raise PayloadError("inputs must be a rectangular numeric array")
+        return inputs
+    check_shape(arr.shape, shape)
+    arr.flags.writeable = False  # shared by every hosted model
+    return arr
+
+
+def _target(dtype: Optional[np.dtype]) -> Optional[np.dtype]:
+    return dtype if dtype is not None and dtype.kind in _NUMERIC else None
+
+
+def _flat(
+    values: Any,
+    dims: Any,
+    shape: Optional[Sequence[int]],
+    dtype: Optional[np.dtype],
+) -> np.ndarray:
+    if not isinstance(values, list) or not (
+        isinstance(dims, list) and all(isinstance(d, int) and d >= 0 for d in dims)
+    ):
+        raise PayloadError('"shape" needs a flat "inputs" list of numbers')
+    if len(values) != int(np.prod(dims)):
+        raise PayloadError(f"{len(values)} values do not fill shape {tuple(dims)}")
+    target = _target(dtype)
+    try:
+        if target is not None:
+            arr = np.fromiter(values, dtype=target, count=len(values))
+        else:
+            arr = np.asarray(values)
+    except (TypeError, ValueError) as e:
+        raise PayloadError(f"inputs must be numeric: {e}") from e
+    if arr.ndim != 1 or arr.dtype.kind not in _NUMERIC:
+        raise PayloadError("inputs must be numeric")
+    arr = arr.reshape(dims)
+    check_shape(arr.shape, shape)
+    arr.flags.writeable = False
+    return arr
+
+
+def encode_outputs(outputs: Any) -> Any:
+    """Model output in a form orjson writes without a `.tolist()` pass."""
+    if hasattr(outputs, "to_numpy"):  # pandas, from pyfunc models
+        outputs = outputs.to_numpy()
+    if isinstance(outputs, np.ndarray):
+        if outputs.dtype.kind == "f" and outputs.dtype != np.float64:
+            outputs = outputs.astype(np.float32, copy=False)
+        return np.ascontiguousarray(outputs)
+    return outputs
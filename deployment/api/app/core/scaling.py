@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from .metrics import INFERENCE_INFLIGHT, INFERENCE_UTILIZATION, QUEUE_WAIT_P95
+
+
+class ScalingSignals:
+    """Per-replica autoscaling signals, exported as plain gauges.
+
+    Each value is computed when Prometheus scrapes, so a metrics adapter can
+    average it across pods without `rate()` or `histogram_quantile()` rules:
+
+    - `inference_inflight_requests`: `/predict` requests inside the handler.
+    - `inference_capacity_utilization`: in-flight / `capacity` execution slots.
+      This is the fill ratio of a server that does not micro-batch. Above 1,
+      work is queueing.
+    - `inference_queue_wait_p95_seconds`: p95 of the admission queue wait over
+      the last `window_s` seconds (0 when idle). The default is one HPA sync
+      period; smoothing belongs to the HPA `behavior`, not the gauge.
+    """
+
+    def __init__(self, capacity: int, window_s: float = 15.0, quantile: float = 0.95):
+        self.capacity = max(int(capacity), 1)
+        self.window_s = window_s
+        self.quantile = quantile
+        self.inflight = 0
+        self._waits: deque[tuple[float, float]] = deque(maxlen=4096)
+        INFERENCE_INFLIGHT.set_function(lambda: self.inflight)
+        INFERENCE_UTILIZATION.set_function(self.utilization)
+        QUEUE_WAIT_P95.set_function(self.wait_quantile)
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+
+    def observe_wait(self, seconds: float) -> None:
+        self._waits.append((time.monotonic(), seconds))
+
+    def utilization(self) -> float:
+        return self.inflight / self.capacity
+
+    def wait_quantile(self) -> float:
+        cutoff = time.monotonic() - self.window_s
+        while self._waits and self._waits[0][0] < cutoff:
+            self._waits.popleft()
+        if not self._waits:
+            return 0.0
+        return float(np.quantile([w for _, w in self._waits], self.quantile))
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import csv
+import math
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+_KM_PER_DEG_LAT = 111.32
+_EARTH_RADIUS_KM = 6371.0
+
+
+class SensorIndex:
+    """Node lookup by region: a uniform grid over coordinates plus inverted
+    indexes over categorical attributes (district, county, freeway, ...).
+
+    Row `i` of the metadata is node `i` of the forecast arrays (LargeST order).
+    Every query returns sorted node indices.
+    """
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lng: np.ndarray,
+        attributes: Optional[Mapping[str, Sequence[str]]] = None,
+        sensor_ids: Optional[Sequence[str]] = None,
+        cell_km: float = 5.0,
+    ):
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.num_nodes = len(self.lat)
+        self.sensor_ids = None if sensor_ids is None else np.asarray(sensor_ids)
+
+        located = np.flatnonzero(np.isfinite(self.lat) & np.isfinite(self.lng))
+        ref_lat = float(self.lat[located].mean()) if located.size else 0.0
+        self._dlat = cell_km / _KM_PER_DEG_LAT
+        self._dlng = cell_km / (
+            _KM_PER_DEG_LAT * max(math.cos(math.radians(ref_lat)), 1e-6)
+        )
+        ci, cj = self._cell(self.lat[located], self.lng[located])
+        self._cells = self._group(zip(ci.tolist(), cj.tolist()), located)
+        self._located, self._node_cells = located, (ci, cj)
+
+        self._inverted: Dict[str, Dict[str, np.ndarray]] = {}
+        for name, values in (attributes or {}).items():
+            keys = [str(v).strip() for v in values]
+            self._inverted[name.lower()] = self._group(keys, np.arange(self.num_nodes))
+
+    @staticmethod
+    def _group(keys: Iterable, nodes: np.ndarray) -> Dict:
+        groups: Dict = {}
+        for key, node in zip(keys, nodes.tolist()):
+            groups.setdefault(key, []).append(node)
+        return {k: np.asarray(v, dtype=np.int64) for k, v in groups.items()}
+
+    def _cell(self, lat: np.ndarray, lng: np.ndarray):
+        return (
+            np.floor(np.asarray(lat) / self._dlat).astype(np.int64),
+            np.floor(np.asarray(lng) / self._dlng).astype(np.int64),
+        )
+
+    def _candidates(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float
+    ) -> np.ndarray:
+        (i0, j0), (i1, j1) = (
+            self._cell(min_lat, min_lng),
+            self._cell(max_lat, max_lng),
+        )
+        if (int(i1) - int(i0) + 1) * (int(j1) - int(j0) + 1) > len(self._cells):
+            # A box wider than the network: filter the located nodes' cells
+            # directly instead of walking every (mostly empty) cell in the box.
+            ci, cj = self._node_cells
+            hit = (ci >= i0) & (ci <= i1) & (cj >= j0) & (cj <= j1)
+            return self._located[hit]
+        found = [
+            self._cells[(i, j)]
+            for i in range(int(i0), int(i1) + 1)
+            for j in range(int(j0), int(j1) + 1)
+            if (i, j) in self._cells
+        ]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    @property
+    def attributes(self) -> list[str]:
+        return list(self._inverted)
+
+    def where(self, name: str, value: str) -> np.ndarray:
+        """Nodes whose attribute `name` equals `value`."""
+        groups = self._inverted.get(name.lower())
+        if groups is None:
+            raise KeyError(f"Unknown sensor attribute {name!r}")
+        return groups.get(str(value).strip(), np.empty(0, dtype=np.int64))
+
+    def within(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """Nodes within `radius_km` (great-circle) of `(lat, lng)`."""
+        r_lat = radius_km / _KM_PER_DEG_LAT
+        r_lng = radius_km / (_KM_PER_DEG_LAT * max(math.cos(math.radians(lat)), 1e-6))
+        cand = self._candidates(lat - r_lat, lng - r_lng, lat + r_lat, lng + r_lng)
+        phi1, phi2 = math.radians(lat), np.radians(self.lat[cand])
+        d_phi = phi2 - phi1
+        d_lmb = np.radians(self.lng[cand] - lng)
+        a = (
+            np.sin(d_phi / 2) ** 2
+            + math.cos(phi1) * np.cos(phi2) * np.sin(d_lmb / 2) ** 2
+        )
+        dist = 2 * _EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        return np.sort(cand[dist <= radius_km])
+
+    def bbox(
+        self, min_lat: float, min_lng: float, max_lat: float, max_lng: float
+    ) -> np.ndarray:
+        """Nodes inside the latitude/longitude box (inclusive)."""
+        cand = self._candidates(min_lat, min_lng, max_lat, max_lng)
+        lat, lng = self.lat[cand], self.lng[cand]
+        inside = (
+            (lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)
+        )
+        return np.sort(cand[inside])
+
+    @staticmethod
+    def from_csv(
+        path: Path,
+        lat_col: str = "Lat",
+        lng_col: str = "Lng",
+        id_col: Optional[str] = "ID",
+        attribute_cols: Sequence[str] = ("District", "County", "Fwy", "Direction"),
+        cell_km: float = 5.0,
+    ) -> "SensorIndex":
+        """Build from a LargeST-style metadata CSV (`ca_meta.csv` layout)."""
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        if not rows:
+            raise ValueError(f"No sensors in {path}")
+        cols = rows[0].keys()
+
+        def _float(v: str) -> float:
+            try:
+                return float(v)
+            except (TypeError, ValueError):
+                return math.nan
+
+        return SensorIndex(
+            lat=np.array([_float(r[lat_col]) for r in rows]),
+            lng=np.array([_float(r[lng_col]) for r in rows]),
+            attributes={c: [r[c] for r in rows] for c in attribute_cols if c in cols},
+            sensor_ids=[r[id_col] for r in rows] if id_col in cols else None,
+            cell_km=cell_km,
+        )
+
+    @staticmethod
+    def from_env() -> Optional["SensorIndex"]:
+        path = os.getenv("SENSOR_METADATA_PATH")
+        if not path:
+            return None
+        index = SensorIndex.from_csv(
+            Path(path), cell_km=float(os.getenv("SENSOR_GRID_KM", "5"))
+        )
+        logger.info(
+            "Sensor index: {} nodes, {} grid cells, attributes {}",
+            index.num_nodes,
+            len(index._cells),
+            index.attributes,
+        )
+        return index
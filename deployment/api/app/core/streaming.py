@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from .model import ModelService
+
+
+@dataclass(frozen=True)
+class StreamConfig:
+    enabled: bool = False
+    num_nodes: int = 0
+    window: int = 12
+    channels: int = 1
+    queue_size: int = 64
+
+    @staticmethod
+    def from_env() -> "StreamConfig":
+        return StreamConfig(
+            enabled=os.getenv("STREAM_ENABLED", "false").lower()
+            in ("1", "true", "yes"),
+            num_nodes=int(os.getenv("STREAM_NUM_NODES", "0")),
+            window=int(os.getenv("STREAM_WINDOW", "12")),
+            channels=int(os.getenv("STREAM_CHANNELS", "1")),
+            queue_size=int(os.getenv("STREAM_QUEUE_SIZE", "64")),
+        )
+
+
+class RollingWindow:
+    """Last `window` steps of `[N, C]` readings in a preallocated buffer.
+
+    The buffer holds `2 * window` steps and every step is written twice, at
+    `p` and `p + window`, so the latest `window` steps are always the
+    contiguous slice `buf[p + 1 : p + 1 + window]`. `view()` hands that slice
+    to the model as-is: no per-request copy or reordering.
+    """
+
+    def __init__(self, window: int, num_nodes: int, channels: int = 1):
+        if window < 1 or num_nodes < 1:
+            raise ValueError("window and num_nodes must be positive")
+        self.window = window
+        self.num_nodes = num_nodes
+        self.channels = channels
+        self._buf = np.zeros((2 * window, num_nodes, channels), dtype=np.float32)
+        self._pos = window - 1
+        self.steps = 0
+
+    @property
+    def ready(self) -> bool:
+        return self.steps >= self.window
+
+    def append(self, values: np.ndarray, nodes: Optional[np.ndarray] = None) -> None:
+        """Add one interval. With `nodes`, `values` covers only those nodes and
+        the rest carry their previous reading forward."""
+        values = np.asarray(values, dtype=np.float32).reshape(-1, self.channels)
+        expected = self.num_nodes if nodes is None else len(nodes)
+        if values.shape[0] != expected:
+            raise ValueError(
+                f"expected {expected} node readings, got {values.shape[0]}"
+            )
+
+        w = self.window
+        prev, pos = self._pos, (self._pos + 1) % w
+        row = self._buf[pos]
+        if nodes is None:
+            row[...] = values
+        else:
+            row[...] = self._buf[prev]
+            row[nodes] = values
+        self._buf[pos + w] = row
+        self._pos = pos
+        self.steps += 1
+
+    def view(self) -> np.ndarray:
+        """Read-only `[window, N, C]` view, oldest step first."""
+        start = self._pos + 1
+        out = self._buf[start : start + self.window]
+        out.flags.writeable = False
+        return out
+
+
+@dataclass(frozen=True)
+class Reading:
+    values: np.ndarray
+    nodes: Optional[np.ndarray] = None
+    timestamp: Optional[str] = None
+
+
+class StreamState:
+    """Rolling input state fed by per-interval readings.
+
+    Readings go through a bounded queue (the HTTP `/ingest` route or any local
+    producer calling `submit`) and are applied by one consumer task. Forecasts
+    run the model directly on `RollingWindow.view()`; a lock keeps appends out
+    while the model reads the buffer, and the result is reused until the next
+    reading arrives.
+    """
+
+    def __init__(self, cfg: StreamConfig, service: ModelService):
+        self.cfg = cfg
+        self.service = service
+        self.window = RollingWindow(cfg.window, cfg.num_nodes, cfg.channels)
+        self.queue: asyncio.Queue[Reading] = asyncio.Queue(maxsize=cfg.queue_size)
+        self.last_timestamp: Optional[str] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._forecast: Optional[tuple[int, Any]] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._consume(), name="stream-ingest")
+        logger.info(
+            "Streaming enabled: window={} nodes={} channels={}",
+            self.cfg.window,
+            self.cfg.num_nodes,
+            self.cfg.channels,
+        )
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def submit(self, reading: Reading) -> None:
+        """Queue a reading; raises `asyncio.QueueFull` when the consumer lags."""
+        self.queue.put_nowait(reading)
+
+    async def _consume(self) -> None:
+        while True:
+            reading = await self.queue.get()
+            try:
+                async with self._lock:
+                    self.window.append(reading.values, reading.nodes)
+                    self.last_timestamp = reading.timestamp
+            except Exception:
+                logger.exception("Dropping malformed stream reading.")
+            finally:
+                self.queue.task_done()
+
+    async def forecast(self) -> tuple[Any, int, Optional[str]]:
+        """Model output for the latest `window` steps, with its step and timestamp."""
+        async with self._lock:
+            step = self.window.steps
+            if self._forecast is None or self._forecast[0] != step:
+                run = await self.service.predict(self.window.view()[None])
+                self._forecast = (step, run.outputs)
+            return self._forecast[1], step, self.last_timestamp
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "enabled": self.cfg.enabled,
+            "ready": self.window.ready,
+            "steps": self.window.steps,
+            "window": self.cfg.window,
+            "num_nodes": self.cfg.num_nodes,
+            "channels": self.cfg.channels,
+            "queued": self.queue.qsize(),
+            "last_timestamp": self.last_timestamp,
+        }
+
+
+def parse_reading(
+    cfg: StreamConfig,
+    values: Sequence[Any],
+    nodes: Optional[Sequence[int]] = None,
+    timestamp: Optional[str] = None,
+) -> Reading:
+    """Validate an ingest payload into a `Reading` (raises ValueError)."""
+    arr = np.asarray(values, dtype=np.float32)
+    idx = None if nodes is None else np.asarray(nodes, dtype=np.int64)
+    expected = cfg.num_nodes if idx is None else len(idx)
+    if arr.size != expected * cfg.channels:
+        raise ValueError(
+            f"expected {expected} x {cfg.channels} values, got shape {arr.shape}"
+        )
+    if idx is not None and (
+        idx.min(initial=0) < 0 or idx.max(initial=0) >= cfg.num_nodes
+    ):
+        raise ValueError(f"node ids must be in [0, {cfg.num_nodes})")
+    return Reading(arr.reshape(expected, cfg.channels), idx, timestamp)
@@ -9,10 +9,20 @@ from fastapi import FastAPI, Request
 from fastapi.responses import ORJSONResponse
 from loguru import logger
 
+from .core.admission import AdmissionConfig, AdmissionController
+from .core.compression import CompressionMiddleware
+from .core.forecast_cache import (
+    ForecastScheduleConfig,
+    ForecastScheduler,
+    ForecastStore,
+)
 from .core.logging import configure_logging, request_id_var
 from .core.metrics import install_metrics
 from .core.model import ModelService, ModelServiceConfig
-from .routers import health, predict
+from .core.scaling import ScalingSignals
+from .core.spatial import SensorIndex
+from .core.streaming import StreamConfig, StreamState
+from .routers import forecast, health, predict, stream
 
 
 def _load_env() -> None:
@@ -32,7 +42,6 @@ def _load_env() -> None:
 async def lifespan(app: FastAPI):
     _load_env()
     configure_logging()
-    install_metrics(app)
 
     cfg = ModelServiceConfig.from_env()
     app.state.model_service = ModelService(cfg)
@@ -47,9 +56,42 @@ async def lifespan(app: FastAPI):
                 "Failed to load model on startup; readiness will be false."
             )
 
+    admission_cfg = AdmissionConfig.from_env()
+    app.state.admission = (
+        AdmissionController(admission_cfg) if admission_cfg.enabled else None
+    )
+    app.state.scaling = ScalingSignals(capacity=admission_cfg.max_concurrency)
+
+    stream_cfg = StreamConfig.from_env()
+    app.state.stream = None
+    if stream_cfg.enabled:
+        app.state.stream = StreamState(stream_cfg, app.state.model_service)
+        await app.state.stream.start()
+
+    try:
+        app.state.sensor_index = SensorIndex.from_env()
+    except Exception:
+        app.state.sensor_index = None
+        logger.exception("Failed to load sensor metadata; region queries disabled.")
+
+    schedule_cfg = ForecastScheduleConfig.from_env()
+    app.state.forecast_store = ForecastStore()
+    scheduler = None
+    if schedule_cfg.enabled and app.state.stream is None:
+        logger.warning("FORECAST_SCHEDULE_ENABLED needs STREAM_ENABLED; not started.")
+    elif schedule_cfg.enabled:
+        scheduler = ForecastScheduler(
+            schedule_cfg, app.state.stream, app.state.forecast_store
+        )
+        await scheduler.start()
+
     yield
 
     try:
+        if scheduler is not None:
+            await scheduler.close()
+        if app.state.stream is not None:
+            await app.state.stream.close()
         await app.state.model_service.close()
     except Exception:
         logger.exception("Error during shutdown.")
@@ -80,8 +122,15 @@ async def request_context_middleware(request: Request, call_next):
         request_id_var.reset(token)
 
 
+install_metrics(app)
+
+# Outermost, so it compresses every response body (streamed ones chunk by chunk).
+app.add_middleware(CompressionMiddleware)
+
 app.include_router(health.router)
 app.include_router(predict.router)
+app.include_router(stream.router)
+app.include_router(forecast.router)
 
 
 @app.get("/", tags=["meta"])
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from ..core.encoding import EncodingError, array_response, requested_format
+from ..core.forecast_cache import ForecastSnapshot
+from ..core.spatial import SensorIndex
+from ..schemas.stream import SensorsResponse, SnapshotResponse
+
+router = APIRouter(tags=["streaming"])
+
+# Query parameters handled explicitly; any other parameter is matched against
+# the sensor index's attributes (district, county, fwy, ...).
+_RESERVED = {"nodes", "near", "radius_km", "bbox", "format", "error_bound"}
+_MAX_RADIUS_KM = 1000.0
+
+
+def _floats(value: str, n: int, name: str) -> List[float]:
+    try:
+        out = [float(v) for v in value.split(",")]
+    except ValueError:
+        out = []
+    if len(out) != n:
+        raise HTTPException(status_code=422, detail=f"{name} needs {n} numbers")
+    return out
+
+
+def _check_coords(lat: float, lng: float, name: str) -> None:
+    # Also rejects NaN/inf, which would otherwise reach the grid lookup.
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise HTTPException(
+            status_code=422,
+            detail=f"{name}: lat must be in [-90, 90], lng in [-180, 180]",
+        )
+
+
+def _select(request: Request, num_nodes: int) -> Optional[np.ndarray]:
+    """Sorted node ids matching every filter in the query; None means all nodes."""
+    params = request.query_params
+    selections: List[np.ndarray] = []
+
+    if params.get("nodes"):
+        try:
+            idx = np.unique(np.array(params["nodes"].split(","), dtype=np.int64))
+        except ValueError as e:
+            raise HTTPException(status_code=422, detail="nodes must be integers") from e
+        if idx[0] < 0 or idx[-1] >= num_nodes:
+            raise HTTPException(
+                status_code=422, detail=f"node ids must be in [0, {num_nodes})"
+            )
+        selections.append(idx)
+
+    attr_filters = {k: v for k, v in params.items() if k not in _RESERVED}
+    spatial = params.get("near") or params.get("bbox")
+    if attr_filters or spatial:
+        index: Optional[SensorIndex] = getattr(request.app.state, "sensor_index", None)
+        if index is None:
+            raise HTTPException(
+                status_code=400, detail="Region queries need SENSOR_METADATA_PATH"
+            )
+        for name, value in attr_filters.items():
+            try:
+                selections.append(index.where(name, value))
+            except KeyError as e:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Unknown filter {name!r}; use {sorted(_RESERVED)} "
+                    f"or {index.attributes}",
+                ) from e
+        if params.get("near"):
+            lat, lng = _floats(params["near"], 2, "near")
+            _check_coords(lat, lng, "near")
+            radius = _floats(params.get("radius_km", "5"), 1, "radius_km")[0]
+            if not 0 < radius <= _MAX_RADIUS_KM:
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"radius_km must be in (0, {_MAX_RADIUS_KM:g}]",
+                )
+            selections.append(index.within(lat, lng, radius))
+        if params.get("bbox"):
+            min_lat, min_lng, max_lat, max_lng = _floats(params["bbox"], 4, "bbox")
+            _check_coords(min_lat, min_lng, "bbox")
+            _check_coords(max_lat, max_lng, "bbox")
+            if min_lat > max_lat or min_lng > max_lng:
+                raise HTTPException(
+                    status_code=422,
+                    detail="bbox needs min_lat,min_lng <= max_lat,max_lng",
+                )
+            selections.append(index.bbox(min_lat, min_lng, max_lat, max_lng))
+
+    if not selections:
+        return None
+    out = selections[0]
+    for other in selections[1:]:
+        out = np.intersect1d(out, other, assume_unique=True)
+    return out
+
+
+@router.get("/forecast", response_model=SnapshotResponse)
+async def forecast(
+    request: Request,
+    nodes: Optional[str] = Query(None, description="Comma-separated node ids."),
+    near: Optional[str] = Query(
+        None, description="`lat,lng` centre of a radius query."
+    ),
+    radius_km: float = Query(5.0, description="Radius for `near`."),
+    bbox: Optional[str] = Query(None, description="`min_lat,min_lng,max_lat,max_lng`."),
+    format: str = Query("json", description="`json`, `f16` or `delta`."),
+    error_bound: float = Query(0.01, description="Max abs error for `delta`."),
+):
+    """Slice of the latest scheduled full-network forecast (`[horizon, k, C]`).
+
+    Filters combine with AND. Besides the ones above, any sensor metadata
+    attribute works as a filter, e.g. `?district=7` or `?county=Los Angeles`.
+    With no filter every node is returned. `?format=f16|delta` returns a
+    binary array (see `core.encoding`).
+    """
+    store = getattr(request.app.state, "forecast_store", None)
+    snap: Optional[ForecastSnapshot] = store.current if store is not None else None
+    if snap is None:
+        raise HTTPException(status_code=503, detail="No forecast published yet")
+
+    etag = f'"{snap.version}-{request.url.query or "all"}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    try:
+        fmt, error_bound = requested_format(request.query_params)
+    except EncodingError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    idx = _select(request, snap.array.shape[1])
+    outputs = snap.array if idx is None else snap.array[:, idx]
+    meta = {
+        "version": snap.version,
+        "step": snap.step,
+        "timestamp": snap.timestamp,
+        "computed_at": snap.computed_at,
+        "nodes": idx,
+    }
+    try:
+        return array_response(outputs, meta, fmt, error_bound, headers={"ETag": etag})
+    except EncodingError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@router.get("/sensors", response_model=SensorsResponse)
+async def sensors(request: Request) -> SensorsResponse:
+    """Node ids (and sensor ids) matching the same filters as `/forecast`."""
+    index: Optional[SensorIndex] = getattr(request.app.state, "sensor_index", None)
+    if index is None:
+        raise HTTPException(status_code=503, detail="No sensor metadata configured")
+    idx = _select(request, index.num_nodes)
+    if idx is None:
+        idx = np.arange(index.num_nodes)
+    return SensorsResponse(
+        nodes=idx.tolist(),
+        sensor_ids=None if index.sensor_ids is None else index.sensor_ids[idx].tolist(),
+    )
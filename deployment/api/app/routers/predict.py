@@ -1,23 +1,108 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, Request
+import math
+import time
+from contextlib import nullcontext
+from typing import Optional, Tuple
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Request, Response
 from loguru import logger
 
+from ..core.admission import AdmissionConfig, Rejected
+from ..core.encoding import EncodingError, array_response, requested_format
 from ..core.logging import request_id_var
-from ..schemas.predict import PredictRequest, PredictResponse
+from ..core.payload import (
+    ArrayJSONResponse,
+    PayloadError,
+    decode_inputs,
+    encode_outputs,
+)
+from ..core.scaling import ScalingSignals
+from ..schemas.predict import ModelsResponse, PredictRequest, PredictResponse
 
 router = APIRouter(tags=["inference"])
 
 
-@router.post("/predict", response_model=PredictResponse)
-async def predict(payload: PredictRequest, request: Request) -> PredictResponse:
+def _admission_headers(
+    request: Request, cfg: AdmissionConfig
+) -> Tuple[str, Optional[float]]:
+    priority = request.headers.get(cfg.priority_header, "normal").lower()
+    raw = request.headers.get(cfg.deadline_header)
+    try:
+        deadline_ms = float(raw) if raw else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=422, detail=f"{cfg.deadline_header} must be a number"
+        ) from e
+    return priority, deadline_ms
+
+
+@router.post(
+    "/predict",
+    response_model=PredictResponse,
+    response_class=ArrayJSONResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": PredictRequest.model_json_schema()}
+            },
+        }
+    },
+)
+async def predict(request: Request) -> Response:
+    """Run the model. `?format=f16|delta` returns a binary array instead of JSON
+    (see `core.encoding`); `error_bound` sets the delta quantization error."""
     svc = request.app.state.model_service
     try:
-        outputs = await svc.predict(payload.inputs)
+        fmt, error_bound = requested_format(request.query_params)
+    except EncodingError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    # Parsed without pydantic: only shape and dtype are checked, not each float.
+    try:
+        inputs = decode_inputs(await request.body(), svc.input_shape, svc.input_dtype)
+    except PayloadError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    admission = getattr(request.app.state, "admission", None)
+    if admission is not None:
+        priority, deadline_ms = _admission_headers(request, admission.cfg)
+    scaling: Optional[ScalingSignals] = getattr(request.app.state, "scaling", None)
+    try:
+        with scaling.track() if scaling is not None else nullcontext():
+            if admission is None:
+                run = await svc.predict(inputs)
+            else:
+                t0 = time.perf_counter()
+                async with admission.admit(priority, deadline_ms):
+                    if scaling is not None:
+                        scaling.observe_wait(time.perf_counter() - t0)
+                    run = await svc.predict(inputs)
+    except Rejected as e:
+        raise HTTPException(
+            status_code=e.status,
+            detail=f"Request shed: {e.reason}",
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after_s)))},
+        ) from e
     except Exception as e:
         logger.exception("Prediction failed.")
         raise HTTPException(status_code=500, detail="Prediction failed") from e
 
-    return PredictResponse(
-        outputs=outputs, model_uri=svc.model_uri, request_id=request_id_var.get()
-    )
+    meta = {
+        "model_uri": svc.model_uri,
+        "request_id": request_id_var.get(),
+        "model_latency_ms": run.latency_ms,
+    }
+    outputs = encode_outputs(run.outputs)
+    if fmt == "json" and not isinstance(outputs, np.ndarray):
+        return ArrayJSONResponse({"outputs": outputs, **meta})
+    try:
+        return array_response(outputs, meta, fmt, error_bound)
+    except EncodingError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@router.get("/models", response_model=ModelsResponse)
+async def models(request: Request) -> ModelsResponse:
+    svc = request.app.state.model_service
+    return ModelsResponse(mode=svc.cfg.mode, models=svc.describe())
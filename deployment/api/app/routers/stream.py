@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from loguru import logger
+
+from ..core.encoding import EncodingError, array_response, requested_format
+from ..core.logging import request_id_var
+from ..core.payload import ArrayJSONResponse, encode_outputs
+from ..core.streaming import StreamState, parse_reading
+from ..schemas.stream import ForecastResponse, IngestRequest, IngestResponse
+
+router = APIRouter(tags=["streaming"])
+
+
+def _stream(request: Request) -> StreamState:
+    stream = getattr(request.app.state, "stream", None)
+    if stream is None:
+        raise HTTPException(status_code=503, detail="Streaming mode is disabled")
+    return stream
+
+
+@router.post("/ingest", response_model=IngestResponse, status_code=202)
+async def ingest(payload: IngestRequest, request: Request) -> IngestResponse:
+    stream = _stream(request)
+    try:
+        reading = parse_reading(
+            stream.cfg, payload.values, payload.nodes, payload.timestamp
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    try:
+        stream.submit(reading)
+    except asyncio.QueueFull as e:
+        raise HTTPException(status_code=429, detail="Ingest queue is full") from e
+    return IngestResponse(queued=stream.queue.qsize())
+
+
+@router.get("/stream/state")
+async def stream_state(request: Request):
+    return _stream(request).status()
+
+
+@router.get("/forecast/latest", response_model=ForecastResponse)
+async def forecast_latest(
+    request: Request,
+    format: str = Query("json", description="`json`, `f16` or `delta`."),
+    error_bound: float = Query(0.01, description="Max abs error for `delta`."),
+) -> Response:
+    stream = _stream(request)
+    try:
+        fmt, bound = requested_format(request.query_params)
+    except EncodingError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    if not stream.window.ready:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Need {stream.cfg.window} steps, have {stream.window.steps}",
+        )
+    try:
+        outputs, step, timestamp = await stream.forecast()
+    except Exception as e:
+        logger.exception("Streaming forecast failed.")
+        raise HTTPException(status_code=500, detail="Prediction failed") from e
+
+    meta = {
+        "step": step,
+        "timestamp": timestamp,
+        "model_uri": stream.service.model_uri,
+        "request_id": request_id_var.get(),
+    }
+    outputs = encode_outputs(outputs)
+    if fmt == "json" and not isinstance(outputs, np.ndarray):
+        return ArrayJSONResponse({"outputs": outputs, **meta})
+    try:
+        return array_response(outputs, meta, fmt, bound)
+    except EncodingError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
@@ -1,15 +1,36 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 from pydantic import BaseModel, Field
 
 
 class PredictRequest(BaseModel):
+    """Wire format of `/predict`. The route decodes bodies itself with orjson and
+    NumPy (see `core.payload`); this model only documents the schema."""
+
     inputs: Any = Field(..., description="Model input payload (project-specific).")
+    shape: Optional[List[int]] = Field(
+        None, description="With a flat numeric `inputs`, the array shape."
+    )
 
 
 class PredictResponse(BaseModel):
     outputs: Any
     model_uri: str
     request_id: Optional[str] = None
+    model_latency_ms: Optional[float] = None
+
+
+class HostedModelInfo(BaseModel):
+    label: str
+    uri: str
+    role: str
+    loaded: bool
+    memory_mb: Optional[float] = None
+    last_latency_ms: Optional[float] = None
+
+
+class ModelsResponse(BaseModel):
+    mode: str
+    models: List[HostedModelInfo]
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional, Union
+
+from pydantic import BaseModel, Field
+
+
+class IngestRequest(BaseModel):
+    values: Union[List[float], List[List[float]]] = Field(
+        ..., description="One interval: `[N]` or `[N, C]` readings (or only `nodes`)."
+    )
+    nodes: Optional[List[int]] = Field(
+        None, description="Node ids of a partial reading; others carry forward."
+    )
+    timestamp: Optional[str] = None
+
+
+class IngestResponse(BaseModel):
+    queued: int
+
+
+class ForecastResponse(BaseModel):
+    outputs: Any
+    step: int
+    timestamp: Optional[str] = None
+    model_uri: str
+    request_id: Optional[str] = None
+
+
+class SnapshotResponse(BaseModel):
+    version: int
+    step: int
+    timestamp: Optional[str] = None
+    computed_at: float
+    nodes: Optional[List[int]] = None
+    outputs: Any = Field(..., description="`[horizon, k, C]` forecast for `nodes`.")
+
+
+class SensorsResponse(BaseModel):
+    nodes: List[int]
+    sensor_ids: Optional[List[str]] = None
@@ -0,0 +1,67 @@
+"""Fixtures for the API tests: the real app, a stub model, no MLflow.
+
+Run from the repo root with the `api` extra installed::
+
+    uv sync --group dev --extra api
+    uv run pytest deployment/api/tests
+"""
+
+from __future__ import annotations
+
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import pytest
+
+API_DIR = Path(__file__).resolve().parents[1]
+if str(API_DIR) not in sys.path:
+    sys.path.insert(0, str(API_DIR))
+
+try:
+    import fastapi  # noqa: F401
+except ImportError:  # the `api` extra is not installed
+    collect_ignore_glob = ["test_*.py"]
+
+from stubs import StubModel  # noqa: E402
+
+# Every component off unless a test turns it on; `.env` never wins over these.
+BASE_ENV = {
+    "MLFLOW_TRACKING_URI": "stub",
+    "MLFLOW_MODEL_NAME": "test",
+    "MLFLOW_EXTRA_MODEL_ALIASES": "",
+    "MODEL_SERVING_MODE": "single",
+    "LOAD_MODEL_ON_STARTUP": "false",
+    "LOG_LEVEL": "WARNING",
+    "LOG_FORMAT": "text",
+    "ADMISSION_ENABLED": "false",
+    "STREAM_ENABLED": "false",
+    "FORECAST_SCHEDULE_ENABLED": "false",
+    "SENSOR_METADATA_PATH": "",
+}
+
+
+@pytest.fixture
+def model() -> StubModel:
+    return StubModel()
+
+
+@pytest.fixture
+def make_client(
+    monkeypatch: pytest.MonkeyPatch, model: StubModel
+) -> Iterator[Callable[..., Any]]:
+    """`make_client(**env)` -> a started `TestClient` serving `model`."""
+    from app.main import app
+    from fastapi.testclient import TestClient
+
+    with ExitStack() as stack:
+
+        def _make(**env: Any) -> TestClient:
+            for name, value in {**BASE_ENV, **env}.items():
+                monkeypatch.setenv(name, str(value))
+            client = stack.enter_context(TestClient(app))
+            app.state.model_service._model = model
+            return client
+
+        yield _make
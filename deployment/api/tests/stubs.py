@@ -0,0 +1,32 @@
+"""Stub model and helpers shared by the API tests."""
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+
+class StubModel:
+    """Pyfunc-shaped model: repeats the last input step over `horizon`."""
+
+    def __init__(self, horizon: int = 3, delay_s: float = 0.0):
+        self.horizon = horizon
+        self.delay_s = delay_s
+        self.calls = 0
+
+    def predict(self, inputs: Any) -> np.ndarray:
+        self.calls += 1
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        x = np.asarray(inputs, dtype=np.float32)
+        return np.repeat(x[:, -1:], self.horizon, axis=1)
+
+
+def wait_for(predicate: Callable[[], bool], timeout_s: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
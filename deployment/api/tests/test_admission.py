@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from app.core.admission import AdmissionConfig, AdmissionController, Rejected
+
+INPUTS = {"inputs": [[[[1.0], [2.0]]]]}
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event, **kw):
+    async with controller.admit(**kw):
+        await release.wait()
+
+
+def test_queue_full_and_low_priority_share() -> None:
+    cfg = AdmissionConfig(enabled=True, max_concurrency=1, max_queue=2)
+
+    async def scenario():
+        controller = AdmissionController(cfg)
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        queued = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        assert controller.status()["inflight"] == 1 and controller.queued == 1
+        # `low` may fill only half of the queue, which is already taken.
+        with pytest.raises(Rejected) as low:
+            async with controller.admit("low"):
+                pass
+        extra = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as full:
+            async with controller.admit("high"):
+                pass
+        release.set()
+        await asyncio.gather(running, queued, extra)
+        return low.value, full.value, controller.status()
+
+    low, full, status = asyncio.run(scenario())
+    assert (low.status, low.reason) == (429, "queue_full")
+    assert (full.status, full.reason) == (429, "queue_full")
+    assert status["inflight"] == 0 and status["queued"] == 0
+
+
+def test_high_priority_is_served_first() -> None:
+    async def scenario():
+        controller = AdmissionController(AdmissionConfig(max_concurrency=1))
+        release, order = asyncio.Event(), []
+
+        async def request(name: str, priority: str) -> None:
+            async with controller.admit(priority):
+                order.append(name)
+
+        running = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(request(name, prio))
+            for name, prio in [("low", "low"), ("normal", "normal"), ("high", "high")]
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(running, *tasks)
+        return order
+
+    assert asyncio.run(scenario()) == ["high", "normal", "low"]
+
+
+def test_queued_request_is_dropped_when_its_deadline_passes() -> None:
+    cfg = AdmissionConfig(max_concurrency=1, initial_service_ms=10)
+
+    async def scenario():
+        controller = AdmissionController(cfg)
+        release = asyncio.Event()
+        running = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        with pytest.raises(Rejected) as rejected:
+            # Admitted up front (10 ms wait + 10 ms service < 80 ms), then the
+            # slot never frees up in time.
+            async with controller.admit(deadline_ms=80):
+                pass
+        release.set()
+        await running
+        return rejected.value, controller.status()
+
+    rejected, status = asyncio.run(scenario())
+    assert (rejected.status, rejected.reason) == (503, "deadline_expired")
+    assert status["queued"] == 0 and status["inflight"] == 0
+
+
+def test_predict_sheds_requests_that_cannot_meet_their_deadline(make_client) -> None:
+    client = make_client(ADMISSION_ENABLED="true", ADMISSION_INITIAL_SERVICE_MS=1500)
+    r = client.post("/predict", json=INPUTS, headers={"x-request-deadline-ms": "100"})
+    assert r.status_code == 503 and r.headers["retry-after"] == "2"
+    assert "deadline" in r.json()["detail"]
+
+    r = client.post("/predict", json=INPUTS, headers={"x-request-deadline-ms": "soon"})
+    assert r.status_code == 422
+    assert client.post("/predict", json=INPUTS).status_code == 200
+
+
+def test_predict_answers_429_when_the_queue_is_full(make_client, model) -> None:
+    model.delay_s = 0.3
+    client = make_client(
+        ADMISSION_ENABLED="true", ADMISSION_MAX_CONCURRENCY=1, ADMISSION_MAX_QUEUE=1
+    )
+
+    def post(delay_s: float) -> tuple:
+        time.sleep(delay_s)
+        r = client.post("/predict", json=INPUTS)
+        return r.status_code, r.headers.get("retry-after")
+
+    with ThreadPoolExecutor(3) as pool:
+        results = list(pool.map(post, [0.0, 0.1, 0.2]))
+    assert [s for s, _ in results] == [200, 200, 429]
+    assert int(results[2][1]) >= 1
+    assert model.calls == 2
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import zlib
+
+import numpy as np
+import orjson
+import pytest
+import zstandard
+from app.core.compression import CompressionConfig, CompressionMiddleware, negotiate
+from app.core.encoding import (
+    EncodingError,
+    array_response,
+    decode_array,
+    decode_meta,
+    encode_array,
+    requested_format,
+)
+
+
+def _forecast(shape=(12, 50, 2), seed=0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return (
+        rng.normal(60, 15, size=shape[1:]) + rng.normal(0, 1, size=shape).cumsum(0)
+    ).astype(np.float32)
+
+
+@pytest.mark.parametrize("bound", [0.5, 0.01, 1e-4])
+def test_delta_round_trip_within_error_bound(bound: float) -> None:
+    arr = _forecast()
+    payload, headers = encode_array(arr, "delta", bound)
+    assert payload.dtype.kind == "i"
+    out = decode_array(payload.tobytes(), {k.lower(): v for k, v in headers.items()})
+    assert out.shape == arr.shape
+    assert np.abs(out - arr).max() <= bound * (1 + 1e-6) + 1e-4
+    assert float(headers["X-Error-Bound"]) == pytest.approx(bound)
+
+
+def test_delta_picks_the_narrowest_integer_type() -> None:
+    smooth = np.linspace(0, 1, 12, dtype=np.float32)[:, None]
+    assert encode_array(smooth, "delta", 0.05)[0].dtype == np.int8
+    assert encode_array(smooth * 1000, "delta", 0.05)[0].dtype == np.int16
+
+
+def test_f16_round_trip_reports_measured_error() -> None:
+    arr = _forecast()
+    payload, headers = encode_array(arr, "f16")
+    out = decode_array(payload.tobytes(), {k.lower(): v for k, v in headers.items()})
+    err = np.abs(out - arr).max()
+    assert err == pytest.approx(float(headers["X-Error-Bound"]))
+    assert err <= np.abs(arr).max() * 2**-11
+
+
+@pytest.mark.parametrize(
+    ("arr", "fmt", "bound", "match"),
+    [
+        (np.array([1e6], np.float32), "f16", 0.01, "float16 range"),
+        (np.array([np.nan], np.float32), "delta", 0.01, "finite"),
+        (np.ones(3, np.float32), "delta", 0.0, "positive"),
+        (np.ones(3, np.float32), "delta", float("nan"), "positive"),
+        (np.ones(3, np.float32), "bz2", 0.01, "format"),
+    ],
+)
+def test_encode_array_rejects_what_it_cannot_represent(arr, fmt, bound, match) -> None:
+    with pytest.raises(EncodingError, match=match):
+        encode_array(arr, fmt, bound)
+
+
+def test_requested_format_parses_query() -> None:
+    assert requested_format({}) == ("json", 0.01)
+    assert requested_format({"format": "DELTA", "error_bound": "0.5"}) == ("delta", 0.5)
+    with pytest.raises(EncodingError):
+        requested_format({"format": "xml"})
+    with pytest.raises(EncodingError):
+        requested_format({"error_bound": "tight"})
+
+
+async def _collect(app, accept_encoding: str = "") -> list[dict]:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    sent: list[dict] = []
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent
+
+
+def _json_app(arr: np.ndarray, chunk_bytes: int):
+    async def app(scope, receive, send):
+        response = array_response(arr, {"step": 3}, chunk_bytes=chunk_bytes)
+        await response(scope, receive, send)
+
+    return app
+
+
+def test_array_response_streams_valid_json_in_chunks() -> None:
+    arr = _forecast((4, 300, 1))
+    sent = asyncio.run(_collect(_json_app(arr, chunk_bytes=1024)))
+    bodies = [m["body"] for m in sent if m["type"] == "http.response.body"]
+    assert len(bodies) > 3
+    doc = orjson.loads(b"".join(bodies))
+    assert doc["step"] == 3
+    np.testing.assert_array_equal(np.asarray(doc["outputs"], np.float32), arr)
+
+
+def _headers(start: dict) -> dict:
+    return {k.decode(): v.decode() for k, v in start["headers"]}
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_streamed_body_is_compressed_chunk_by_chunk(encoding: str) -> None:
+    arr = _forecast((4, 300, 1))
+    app = CompressionMiddleware(
+        _json_app(arr, chunk_bytes=2048), CompressionConfig(min_bytes=512)
+    )
+    sent = asyncio.run(_collect(app, f"{encoding}, br"))
+    start, *bodies = sent
+    headers = _headers(start)
+    assert headers["content-encoding"] == encoding
+    assert "content-length" not in headers and "Accept-Encoding" in headers["vary"]
+    assert len(bodies) > 2 and not bodies[-1].get("more_body")
+
+    # Each chunk is flushed, so the prefix received so far already decodes.
+    if encoding == "gzip":
+        d = zlib.decompressobj(31)
+        first = d.decompress(bodies[0]["body"])
+        rest = b"".join(d.decompress(b["body"]) for b in bodies[1:])
+    else:
+        d = zstandard.ZstdDecompressor().decompressobj()
+        first = d.decompress(bodies[0]["body"])
+        rest = b"".join(d.decompress(b["body"]) for b in bodies[1:] if b["body"])
+    assert first.startswith(b'{"step":3,"outputs":[')
+    doc = orjson.loads(first + rest)
+    np.testing.assert_array_equal(np.asarray(doc["outputs"], np.float32), arr)
+
+
+def _plain_app(body: bytes, chunks: int = 1, **headers: str):
+    async def app(scope, receive, send):
+        raw = [(b"content-type", b"application/json")]
+        raw += [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]
+        if chunks == 1:
+            raw.append((b"content-length", str(len(body)).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": raw})
+        step = max(1, len(body) // chunks)
+        for i in range(chunks):
+            piece = body[i * step : None if i == chunks - 1 else (i + 1) * step]
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": piece,
+                    "more_body": i < chunks - 1,
+                }
+            )
+
+    return app
+
+
+def test_short_bodies_pass_through_uncompressed() -> None:
+    cfg = CompressionConfig(min_bytes=1024)
+    short = b'{"ok":' + b" " * 300 + b"true}"
+    for chunks in (1, 3):  # whole, and streamed but short in total
+        app = CompressionMiddleware(_plain_app(short, chunks), cfg)
+        start, *bodies = asyncio.run(_collect(app, "gzip"))
+        assert "content-encoding" not in _headers(start)
+        assert b"".join(b["body"] for b in bodies) == short
+
+
+def test_whole_body_gets_content_length_and_encoded_bodies_are_untouched() -> None:
+    cfg = CompressionConfig(min_bytes=64)
+    body = b'{"values":' + b"1," * 500 + b"1}"
+    start, msg = asyncio.run(
+        _collect(CompressionMiddleware(_plain_app(body), cfg), "gzip")
+    )
+    headers = _headers(start)
+    assert headers["content-encoding"] == "gzip"
+    assert int(headers["content-length"]) == len(msg["body"]) < len(body)
+    assert gzip.decompress(msg["body"]) == body
+
+    already = gzip.compress(body)
+    app = CompressionMiddleware(_plain_app(already, content_encoding="gzip"), cfg)
+    _, msg = asyncio.run(_collect(app, "gzip"))
+    assert msg["body"] == already
+
+    start, msg = asyncio.run(_collect(CompressionMiddleware(_plain_app(body), cfg)))
+    assert "content-encoding" not in _headers(start) and msg["body"] == body
+
+
+def test_negotiate_honours_q_zero() -> None:
+    assert negotiate("gzip, zstd") == "zstd"
+    assert negotiate("zstd;q=0, gzip") == "gzip"
+    assert negotiate("gzip;q=0.0") is None
+    assert negotiate("br, identity") is None
+
+
+@pytest.mark.parametrize("fmt", ["f16", "delta"])
+def test_predict_binary_formats_round_trip(make_client, fmt: str) -> None:
+    client = make_client()
+    x = _forecast((1, 4, 30, 1))
+    r = client.post(
+        f"/predict?format={fmt}&error_bound=0.001",
+        json={"inputs": x.reshape(-1).tolist(), "shape": list(x.shape)},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/octet-stream"
+    out = decode_array(r.content, r.headers)
+    np.testing.assert_allclose(
+        out, np.repeat(x[:, -1:], 3, axis=1), atol=float(r.headers["x-error-bound"])
+    )
+    assert orjson.loads(r.headers["x-meta"])["model_uri"] == "models:/test@prod"
+    assert decode_meta(r.content, r.headers)["model_uri"] == "models:/test@prod"
+
+    assert client.post("/predict?format=xml", json={"inputs": [1]}).status_code == 422
+
+
+def test_large_meta_moves_from_the_header_to_the_body() -> None:
+    arr = _forecast((3, 2000, 1))
+    meta = {"step": 3, "nodes": list(range(2000))}
+
+    async def _body(response) -> bytes:
+        return b"".join([c async for c in response.body_iterator])
+
+    small = array_response(arr, {"step": 3}, "f16")
+    assert "x-meta-length" not in small.headers
+    assert decode_meta(asyncio.run(_body(small)), small.headers) == {"step": 3}
+
+    large = array_response(arr, meta, "f16")
+    assert "x-meta" not in large.headers
+    body = asyncio.run(_body(large))
+    assert decode_meta(body, large.headers) == meta
+    np.testing.assert_allclose(
+        decode_array(body, large.headers),
+        arr,
+        atol=float(large.headers["x-error-bound"]),
+    )
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+from app.core.forecast_cache import (
+    ForecastScheduleConfig,
+    ForecastScheduler,
+    ForecastStore,
+)
+from app.core.model import ModelService, ModelServiceConfig
+from app.core.streaming import StreamConfig, StreamState
+from stubs import StubModel
+
+
+def test_store_publishes_private_read_only_versions() -> None:
+    store = ForecastStore()
+    assert store.current is None
+    outputs = np.arange(24, dtype=np.float32).reshape(1, 2, 4, 3)
+    first = store.publish(outputs, step=5, timestamp="t5")
+    outputs[:] = -1  # the caller's buffer may be reused
+    assert first.version == 1 and first.array.shape == (2, 4, 3)
+    assert first.array[0, 0, 0] == 0 and not first.array.flags.writeable
+
+    second = store.publish(np.ones((2, 4)), step=6)
+    assert store.current is second and second.version == 2
+    assert second.array.shape == (2, 4, 1)
+    assert first.array[1, 3, 2] == 23  # older snapshots are never touched
+    with pytest.raises(ValueError, match="horizon, N, C"):
+        store.publish(np.ones(4), step=7)
+
+
+def test_scheduler_runs_only_on_new_readings() -> None:
+    async def scenario() -> list:
+        service = ModelService(ModelServiceConfig("stub", "test"))
+        service._model = model = StubModel(horizon=2)
+        stream = StreamState(StreamConfig(enabled=True, num_nodes=3, window=2), service)
+        store = ForecastStore()
+        scheduler = ForecastScheduler(ForecastScheduleConfig(), stream, store)
+
+        results = [await scheduler.run_once()]  # window not filled yet
+        for t in range(2):
+            stream.window.append(np.full(3, t))
+        results += [await scheduler.run_once(), await scheduler.run_once()]
+        stream.window.append(np.full(3, 7))
+        results.append(await scheduler.run_once())
+        return results + [model.calls]
+
+    none, first, repeat, second, calls = asyncio.run(scenario())
+    assert none is None and repeat is None and calls == 2
+    assert (first.version, first.step) == (1, 2)
+    assert (second.version, second.step) == (2, 3)
+    np.testing.assert_array_equal(second.array[..., 0], np.full((2, 3), 7))
+
+
+def test_scheduler_sleeps_to_offset_after_boundary(monkeypatch) -> None:
+    cfg = ForecastScheduleConfig(enabled=True, interval_s=300, offset_s=5)
+    scheduler = ForecastScheduler(cfg, None, ForecastStore())
+    monkeypatch.setattr("app.core.forecast_cache.time.time", lambda: 3000.0 + 2)
+    assert scheduler._sleep_s() == pytest.approx(3)
+    monkeypatch.setattr("app.core.forecast_cache.time.time", lambda: 3000.0 + 6)
+    assert scheduler._sleep_s() == pytest.approx(299)
+
+
+def test_forecast_serves_node_slices_with_etag(make_client) -> None:
+    client = make_client()
+    assert client.get("/forecast").status_code == 503
+
+    store = client.app.state.forecast_store
+    store.publish(np.arange(12, dtype=np.float32).reshape(2, 6), step=4)
+    r = client.get("/forecast?nodes=5,1,1")
+    assert r.status_code == 200
+    body = r.json()
+    assert body["version"] == 1 and body["step"] == 4 and body["nodes"] == [1, 5]
+    assert body["outputs"] == [[[1.0], [5.0]], [[7.0], [11.0]]]
+    assert len(client.get("/forecast").json()["outputs"][0]) == 6
+
+    etag = r.headers["etag"]
+    again = client.get("/forecast?nodes=5,1,1", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    store.publish(np.zeros((2, 6)), step=5)
+    fresh = client.get("/forecast?nodes=5,1,1", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200 and fresh.json()["version"] == 2
+
+
+@pytest.mark.parametrize("nodes", ["6", "-1", "a,b"])
+def test_forecast_rejects_bad_node_ids(make_client, nodes: str) -> None:
+    client = make_client()
+    client.app.state.forecast_store.publish(np.zeros((2, 6)), step=1)
+    assert client.get("/forecast", params={"nodes": nodes}).status_code == 422
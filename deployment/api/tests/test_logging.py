@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import io
+import logging
+import threading
+
+import orjson
+import pytest
+from app.core.logging import (
+    AsyncJsonSink,
+    DropReporter,
+    InterceptHandler,
+    LevelRateLimiter,
+    request_id_var,
+)
+from loguru import logger
+
+
+class BlockingStream(io.BytesIO):
+    """Holds the writer thread in `write` until `release` is set."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, data: bytes) -> int:
+        self.entered.set()
+        self.release.wait(5)
+        return super().write(data)
+
+
+def _lines(stream: io.BytesIO) -> list[dict]:
+    return [orjson.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture
+def sink_of():
+    handlers = []
+
+    def _add(sink: AsyncJsonSink, limiter=None) -> AsyncJsonSink:
+        handlers.append(
+            logger.add(sink, format=lambda _: "", filter=limiter, catch=False)
+        )
+        return sink
+
+    yield _add
+    for handler in handlers:
+        logger.remove(handler)
+
+
+def test_json_sink_writes_records_from_a_thread(sink_of) -> None:
+    stream = io.BytesIO()
+    sink = sink_of(AsyncJsonSink(stream=stream))
+    token = request_id_var.set("req-1")
+    try:
+        logger.info("hello {}", "world")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("boom")
+    finally:
+        request_id_var.reset(token)
+    logger.bind(request_id="req-2").warning("bound")
+    sink.close()
+
+    hello, boom, bound = _lines(stream)
+    assert hello["message"] == "hello world" and hello["request_id"] == "req-1"
+    assert hello["level"] == "INFO" and hello["module"] == __name__
+    assert "ZeroDivisionError" in boom["exception"]
+    assert bound["request_id"] == "req-2" and bound["level"] == "WARNING"
+
+
+def test_json_sink_drops_and_reports_when_the_queue_is_full(sink_of) -> None:
+    stream = BlockingStream()
+    sink = sink_of(AsyncJsonSink(stream=stream, max_queue=1, batch=1))
+    logger.info("first")  # taken by the writer, which blocks in write()
+    assert stream.entered.wait(5)
+    for i in range(4):
+        logger.info("queued {}", i)  # one fits, three are dropped
+    stream.release.set()
+    sink.close()
+
+    lines = _lines(stream)
+    assert [r["message"] for r in lines if "dropped" not in r] == [
+        "first",
+        "queued 0",
+    ]
+    notice = next(r for r in lines if r["message"] == "log records dropped")
+    assert notice["dropped"] == {"queue_full": 3}
+
+
+def test_rate_limiter_refills_per_level(monkeypatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr("app.core.logging.time.monotonic", lambda: now[0])
+    limiter = LevelRateLimiter(LevelRateLimiter.parse("debug=2, INFO=0"))
+    assert limiter.limits == {"DEBUG": 2.0}
+
+    def record(level: str) -> dict:
+        return {"level": logger.level(level), "extra": {}}
+
+    assert [limiter(record("DEBUG")) for _ in range(3)] == [True, True, False]
+    assert all(limiter(record("INFO")) for _ in range(10))  # 0 = unlimited
+    now[0] += 0.5  # one token back
+    assert [limiter(record("DEBUG")) for _ in range(2)] == [True, False]
+    assert limiter.dropped == {"DEBUG": 2}
+
+
+def test_rate_limited_records_are_reported_by_the_sink(sink_of) -> None:
+    stream = io.BytesIO()
+    limiter = LevelRateLimiter({"DEBUG": 1})
+    sink = sink_of(AsyncJsonSink(stream=stream, limiter=limiter), limiter)
+    for i in range(5):
+        logger.debug("tick {}", i)
+    sink.close()
+    lines = _lines(stream)
+    assert [r["message"] for r in lines if "dropped" not in r] == ["tick 0"]
+    dropped = {}
+    for r in lines:
+        for level, n in r.get("dropped", {}).items():
+            dropped[level] = dropped.get(level, 0) + n
+    assert dropped == {"DEBUG": 4}
+
+
+def test_rate_limited_records_are_reported_in_text_mode() -> None:
+    stream = io.StringIO()
+    limiter = LevelRateLimiter({"DEBUG": 1, "WARNING": 1})
+    handler = logger.add(stream, format="{level} {message}", filter=limiter)
+    reporter = DropReporter(limiter, interval_s=60)
+    try:
+        for i in range(5):
+            logger.debug("tick {}", i)
+        logger.warning("spent the WARNING token")
+        reporter.close()
+    finally:
+        logger.remove(handler)
+    assert stream.getvalue().splitlines() == [
+        "DEBUG tick 0",
+        "WARNING spent the WARNING token",
+        "WARNING log records dropped: DEBUG=4",
+    ]
+
+
+def test_access_log_sampling_keeps_server_errors(sink_of) -> None:
+    stream = io.BytesIO()
+    sink = sink_of(AsyncJsonSink(stream=stream))
+    handler = InterceptHandler(walk_frames=False, access_sample=0.0)
+    access = logging.getLogger("uvicorn.access")
+    for status in (200, 404, 503):
+        handler.handle(
+            access.makeRecord(
+                access.name,
+                logging.INFO,
+                __file__,
+                1,
+                '%s - "%s %s HTTP/%s" %d',
+                ("127.0.0.1", "GET", "/predict", "1.1", status),
+                None,
+            )
+        )
+    sink.close()
+    (line,) = _lines(stream)
+    assert line["message"].endswith("503") and line["module"] == "uvicorn.access"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+from app.core.metrics import SHADOW_DROPPED
+from app.core.model import ModelService, ModelServiceConfig
+from stubs import StubModel
+
+
+class Scaled(StubModel):
+    def __init__(self, factor: float, delay_s: float = 0.0):
+        super().__init__(horizon=1, delay_s=delay_s)
+        self.factor = factor
+
+    def predict(self, inputs):
+        return super().predict(inputs) * self.factor
+
+
+def _service(mode: str, extras: dict, **kwargs) -> ModelService:
+    cfg = ModelServiceConfig(
+        "stub", "test", extra_aliases=tuple(extras), mode=mode, **kwargs
+    )
+    svc = ModelService(cfg)
+    svc._model = Scaled(1.0)
+    for alias, model in extras.items():
+        svc.extras[alias].model = model
+    return svc
+
+
+INPUTS = np.ones((1, 2, 3, 1), dtype=np.float32)
+
+
+def test_ensemble_averages_and_reports_slowest_member() -> None:
+    svc = _service("ensemble", {"a": Scaled(3.0, delay_s=0.05)})
+    run = asyncio.run(svc.predict(INPUTS))
+    np.testing.assert_allclose(run.outputs, np.full((1, 1, 3, 1), 2.0))
+    assert run.latency_ms >= 50 and run.latency_ms >= svc.primary_latency_ms
+
+
+def test_concurrent_requests_get_their_own_latency() -> None:
+    svc = _service("single", {})
+
+    async def scenario():
+        slow, fast = Scaled(1.0, delay_s=0.1), Scaled(1.0)
+        svc._model = slow
+        task = asyncio.create_task(svc.predict(INPUTS))
+        await asyncio.sleep(0.02)
+        svc._model = fast
+        return await task, await svc.predict(INPUTS)
+
+    slow_run, fast_run = asyncio.run(scenario())
+    assert slow_run.latency_ms >= 100 > fast_run.latency_ms
+
+
+def test_shadow_runs_are_bounded_and_dropped() -> None:
+    shadow = Scaled(2.0, delay_s=0.1)
+    svc = _service("shadow", {"cand": shadow}, shadow_max_inflight=2)
+
+    async def scenario():
+        runs = [await svc.predict(INPUTS) for _ in range(5)]
+        await asyncio.gather(*svc._shadow_tasks)
+        return runs
+
+    before = SHADOW_DROPPED._value.get()
+    runs = asyncio.run(scenario())
+    np.testing.assert_allclose(runs[-1].outputs, INPUTS[:, -1:])  # primary answers
+    assert shadow.calls == 2
+    assert SHADOW_DROPPED._value.get() - before == 3
+    assert svc.extras["cand"].last_latency_ms >= 100
+
+
+def test_extra_that_fails_to_load_is_skipped(monkeypatch) -> None:
+    svc = ModelService(
+        ModelServiceConfig(
+            "stub", "test", extra_aliases=("good", "bad"), mode="ensemble"
+        )
+    )
+
+    async def fake_load(label, uri):
+        if label == "bad":
+            raise RuntimeError("registry down")
+        return Scaled(3.0 if label == "good" else 1.0), None
+
+    monkeypatch.setattr(svc, "_load_measured", fake_load)
+    asyncio.run(svc.load())
+    loaded = {row["label"]: row["loaded"] for row in svc.describe()}
+    assert loaded == {"prod": True, "good": True, "bad": False}
+    run = asyncio.run(svc.predict(INPUTS))
+    np.testing.assert_allclose(run.outputs, np.full((1, 1, 3, 1), 2.0))
+
+
+def test_predict_route_reports_latency_and_models(make_client) -> None:
+    client = make_client()
+    body = client.post("/predict", json={"inputs": INPUTS.tolist()}).json()
+    assert body["model_uri"] == "models:/test@prod"
+    assert body["model_latency_ms"] >= 0 and np.shape(body["outputs"]) == (1, 3, 3, 1)
+    models = client.get("/models").json()
+    assert models["mode"] == "single"
+    assert models["models"][0]["last_latency_ms"] == pytest.approx(
+        body["model_latency_ms"]
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import numpy as np
+import orjson
+import pytest
+from app.core.payload import PayloadError, decode_inputs, encode_outputs
+
+
+def _body(doc) -> bytes:
+    return orjson.dumps(doc)
+
+
+def test_nested_and_flat_forms_decode_to_the_same_array() -> None:
+    nested = decode_inputs(_body({"inputs": [[[1, 2], [3, 4]]]}))
+    flat = decode_inputs(_body({"inputs": [1, 2, 3, 4], "shape": [1, 2, 2]}))
+    for arr in (nested, flat):
+        assert arr.dtype == np.int64 and arr.shape == (1, 2, 2)
+        assert not arr.flags.writeable
+    np.testing.assert_array_equal(nested, flat)
+
+
+def test_without_a_signature_numpy_infers_the_dtype() -> None:
+    readings = [[60.123456789012, 1], [61.5, 2]]
+    arr = decode_inputs(_body({"inputs": readings}))
+    assert arr.dtype == np.float64
+    np.testing.assert_array_equal(arr, readings)
+
+    ids = [2**53 + 1, 2**62 + 3]
+    for body in ({"inputs": ids}, {"inputs": ids, "shape": [2]}):
+        arr = decode_inputs(_body(body))
+        assert arr.dtype == np.int64 and arr.tolist() == ids
+
+    typed = decode_inputs(_body({"inputs": ids}), dtype=np.dtype(np.float32))
+    assert typed.dtype == np.float32
+
+
+def test_signature_shape_and_dtype_are_enforced() -> None:
+    shape, dtype = (-1, 2, 2), np.dtype(np.float64)
+    arr = decode_inputs(_body({"inputs": [[[1, 2], [3, 4]]] * 3}), shape, dtype)
+    assert arr.shape == (3, 2, 2) and arr.dtype == np.float64
+    with pytest.raises(PayloadError, match=r"shape \(-1, 2, 2\)"):
+        decode_inputs(_body({"inputs": [1, 2, 3], "shape": [1, 3, 1]}), shape)
+    with pytest.raises(PayloadError, match="shape"):
+        decode_inputs(_body({"inputs": [[1, 2], [3, 4]]}), shape)
+
+
+@pytest.mark.parametrize(
+    ("body", "match"),
+    [
+        (b"{not json", "invalid JSON"),
+        (b"[1, 2]", '"inputs" field'),
+        (_body({"values": [1]}), '"inputs" field'),
+        (_body({"inputs": [1, 2, 3], "shape": [2, 2]}), "do not fill"),
+        (_body({"inputs": [1, 2], "shape": [2, -1]}), '"shape" needs'),
+        (_body({"inputs": [[1, 2], [3, 4]], "shape": [2]}), "numeric"),
+        (_body({"inputs": ["a", "b"], "shape": [2]}), "numeric"),
+        (_body({"inputs": [[1, 2], [3]]}), "rectangular"),
+        (_body({"inputs": "text"}), "numeric array"),
+    ],
+)
+def test_malformed_payloads_raise(body: bytes, match: str) -> None:
+    with pytest.raises(PayloadError, match=match):
+        decode_inputs(body, shape=(-1, -1))
+
+
+def test_non_numeric_inputs_pass_through_without_a_signature() -> None:
+    assert decode_inputs(_body({"inputs": {"a": 1}})) == {"a": 1}
+    assert decode_inputs(_body({"inputs": [["x", 1]]})) == [["x", 1]]
+
+
+def test_encode_outputs_keeps_arrays_for_orjson() -> None:
+    half = encode_outputs(np.ones((2, 3), dtype=np.float16).T)
+    assert half.dtype == np.float32 and half.flags.c_contiguous
+    assert encode_outputs(np.ones(2)).dtype == np.float64
+
+    class Frame:
+        def to_numpy(self):
+            return np.arange(3, dtype=np.float32)
+
+    np.testing.assert_array_equal(encode_outputs(Frame()), [0, 1, 2])
+    assert encode_outputs({"label": "x"}) == {"label": "x"}
+
+
+def test_predict_without_a_signature_keeps_input_precision(make_client) -> None:
+    client = make_client()
+    seen = []
+
+    class Recorder:
+        def predict(self, inputs):
+            seen.append(inputs)
+            return inputs
+
+    client.app.state.model_service._model = Recorder()
+    assert client.app.state.model_service.input_dtype is None
+    value = 60.123456789012
+    r = client.post("/predict", json={"inputs": [[[[value]]]]})
+    assert r.status_code == 200
+    assert seen[0].dtype == np.float64 and seen[0].item() == value
+    assert r.json()["outputs"] == [[[[value]]]]
+
+
+def test_predict_checks_payload_against_the_signature(make_client) -> None:
+    client = make_client()
+    svc = client.app.state.model_service
+    svc.input_shape, svc.input_dtype = (-1, 2, 3, 1), np.dtype(np.float32)
+
+    ok = client.post(
+        "/predict",
+        content=_body({"inputs": list(range(6)), "shape": [1, 2, 3, 1]}),
+        headers={"content-type": "application/json"},
+    )
+    assert ok.status_code == 200
+    np.testing.assert_array_equal(
+        np.asarray(ok.json()["outputs"])[0, :, :, 0], [[3, 4, 5]] * 3
+    )
+    bad = client.post("/predict", json={"inputs": [[[[1.0]]]]})
+    assert bad.status_code == 422 and "shape" in bad.json()["detail"]
+    assert client.post("/predict", content=b"{").status_code == 422
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+from app.core.scaling import ScalingSignals
+
+
+def test_inflight_and_utilization_follow_tracked_requests() -> None:
+    signals = ScalingSignals(capacity=4)
+    with signals.track(), signals.track():
+        assert signals.inflight == 2 and signals.utilization() == 0.5
+        with pytest.raises(RuntimeError), signals.track():
+            raise RuntimeError("handler failed")
+    assert signals.inflight == 0 and signals.utilization() == 0.0
+    assert ScalingSignals(capacity=0).capacity == 1
+
+
+def test_wait_quantile_covers_only_the_recent_window(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("app.core.scaling.time.monotonic", lambda: now[0])
+    signals = ScalingSignals(capacity=1, window_s=15.0, quantile=0.95)
+    assert signals.wait_quantile() == 0.0
+
+    for wait in range(1, 101):
+        signals.observe_wait(wait / 1000)
+    assert signals.wait_quantile() == pytest.approx(0.09505)
+    now[0] += 10
+    signals.observe_wait(0.5)
+    assert signals.wait_quantile() > 0.09
+    now[0] += 10  # the burst has left the window; only the 0.5 s wait remains
+    assert signals.wait_quantile() == pytest.approx(0.5)
+    now[0] += 20
+    assert signals.wait_quantile() == 0.0
+
+
+def test_metrics_export_scaling_gauges(make_client) -> None:
+    client = make_client(ADMISSION_ENABLED="true", ADMISSION_MAX_CONCURRENCY=2)
+    assert client.post("/predict", json={"inputs": [[[[1.0]]]]}).status_code == 200
+    text = client.get("/metrics").text
+    values = {
+        line.split()[0]: float(line.split()[1])
+        for line in text.splitlines()
+        if line.startswith("inference_")
+    }
+    assert values["inference_inflight_requests"] == 0
+    assert values["inference_capacity_utilization"] == 0
+    assert values["inference_queue_wait_p95_seconds"] >= 0
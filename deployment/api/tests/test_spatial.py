@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+from app.core.spatial import SensorIndex
+
+
+def _haversine_km(lat1, lng1, lat2, lng2):
+    p1, p2 = np.radians(lat1), np.radians(lat2)
+    a = (
+        np.sin((p2 - p1) / 2) ** 2
+        + np.cos(p1) * np.cos(p2) * np.sin(np.radians(lng2 - lng1) / 2) ** 2
+    )
+    return 2 * 6371.0 * np.arcsin(np.sqrt(a))
+
+
+@pytest.fixture
+def points():
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(33.5, 34.5, size=400)
+    lng = rng.uniform(-118.8, -117.6, size=400)
+    lat[[3, 77]] = np.nan  # sensors without coordinates
+    return lat, lng
+
+
+def test_within_matches_brute_force(points) -> None:
+    lat, lng = points
+    index = SensorIndex(lat, lng, cell_km=3.0)
+    for center, radius in [((34.0, -118.2), 5.0), ((33.6, -117.7), 12.0)]:
+        dist = _haversine_km(*center, lat, lng)
+        want = np.flatnonzero(dist <= radius)  # NaN distances compare False
+        np.testing.assert_array_equal(index.within(*center, radius), want)
+
+
+@pytest.mark.parametrize(
+    "box",
+    [
+        (33.9, -118.3, 34.1, -118.0),  # a few cells: walks the grid
+        (-90.0, -180.0, 90.0, 180.0),  # wider than the network: filters nodes
+    ],
+)
+def test_bbox_matches_brute_force(points, box) -> None:
+    lat, lng = points
+    index = SensorIndex(lat, lng)
+    min_lat, min_lng, max_lat, max_lng = box
+    inside = (lat >= min_lat) & (lat <= max_lat) & (lng >= min_lng) & (lng <= max_lng)
+    np.testing.assert_array_equal(index.bbox(*box), np.flatnonzero(inside))
+
+
+def test_where_uses_inverted_index() -> None:
+    index = SensorIndex(
+        [34.0, 34.1, 34.2],
+        [-118.0, -118.1, -118.2],
+        attributes={"District": ["7", " 7", "8"]},
+    )
+    assert index.attributes == ["district"]
+    assert index.where("DISTRICT", "7").tolist() == [0, 1]
+    assert index.where("district", "12").size == 0
+    with pytest.raises(KeyError):
+        index.where("county", "x")
+
+
+META = """ID,Lat,Lng,District,County,Fwy
+100,34.05,-118.25,7,Los Angeles,I5-N
+101,34.06,-118.24,7,Los Angeles,I10-E
+102,34.50,-118.00,7,Los Angeles,I5-N
+103,32.70,-117.15,11,San Diego,I5-S
+104,,,11,San Diego,I8-E
+"""
+
+
+@pytest.fixture
+def meta_csv(tmp_path: Path) -> Path:
+    path = tmp_path / "meta.csv"
+    path.write_text(META)
+    return path
+
+
+def test_from_csv_reads_largest_layout(meta_csv: Path) -> None:
+    index = SensorIndex.from_csv(meta_csv)
+    assert index.num_nodes == 5 and math.isnan(index.lat[4])
+    assert index.sensor_ids.tolist() == ["100", "101", "102", "103", "104"]
+    assert index.where("fwy", "I5-N").tolist() == [0, 2]
+
+
+def test_sensors_combines_filters(make_client, meta_csv: Path) -> None:
+    client = make_client(SENSOR_METADATA_PATH=meta_csv)
+    assert client.get("/sensors").json()["nodes"] == [0, 1, 2, 3, 4]
+    r = client.get("/sensors?district=7&near=34.05,-118.25&radius_km=3")
+    assert r.json() == {"nodes": [0, 1], "sensor_ids": ["100", "101"]}
+    r = client.get("/sensors?fwy=I5-N&bbox=34,-118.3,35,-117.9")
+    assert r.json()["nodes"] == [0, 2]
+    assert client.get("/sensors?county=San Diego&nodes=3,4").json()["nodes"] == [3, 4]
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "near=34.05,-118.25&radius_km=0",
+        "near=34.05,-118.25&radius_km=5000",
+        "near=34.05,-118.25&radius_km=nan",
+        "near=95,-118.25",
+        "near=nan,0",
+        "near=34.05",
+        "bbox=35,-118,34,-117",
+        "bbox=34,-200,35,-117",
+        "color=red",
+    ],
+)
+def test_sensors_rejects_bad_region_queries(make_client, meta_csv, query) -> None:
+    client = make_client(SENSOR_METADATA_PATH=meta_csv)
+    assert client.get(f"/sensors?{query}").status_code == 422
+
+
+def test_region_queries_need_metadata(make_client) -> None:
+    client = make_client()
+    assert client.get("/sensors").status_code == 503
+    client.app.state.forecast_store.publish(np.zeros((2, 5)), step=1)
+    assert client.get("/forecast?district=7").status_code == 400
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from app.core.streaming import RollingWindow, StreamConfig, parse_reading
+from stubs import wait_for
+
+
+def test_rolling_window_keeps_latest_steps_in_order() -> None:
+    w = RollingWindow(window=3, num_nodes=2)
+    for t in range(7):  # wraps the buffer twice
+        w.append(np.full(2, t))
+        assert w.ready == (t >= 2)
+    view = w.view()
+    assert view.shape == (3, 2, 1) and not view.flags.writeable
+    np.testing.assert_array_equal(view[:, 0, 0], [4, 5, 6])
+    assert w.steps == 7
+
+
+def test_rolling_window_partial_append_carries_other_nodes() -> None:
+    w = RollingWindow(window=2, num_nodes=3)
+    w.append([1.0, 2.0, 3.0])
+    w.append([9.0], nodes=np.array([1]))
+    w.append([7.0, 8.0], nodes=np.array([2, 0]))
+    np.testing.assert_array_equal(w.view()[..., 0], [[1, 9, 3], [8, 9, 7]])
+    with pytest.raises(ValueError, match="expected 2 node readings"):
+        w.append([1.0], nodes=np.array([0, 1]))
+
+
+def test_parse_reading_validates_size_and_node_ids() -> None:
+    cfg = StreamConfig(enabled=True, num_nodes=4, channels=2)
+    reading = parse_reading(cfg, [[1, 2], [3, 4]], nodes=[0, 3])
+    assert reading.values.shape == (2, 2) and reading.nodes.tolist() == [0, 3]
+    with pytest.raises(ValueError, match="expected 4 x 2 values"):
+        parse_reading(cfg, [1, 2, 3, 4])
+    with pytest.raises(ValueError, match="node ids"):
+        parse_reading(cfg, [1, 2], nodes=[4])
+
+
+STREAM_ENV = {"STREAM_ENABLED": "true", "STREAM_NUM_NODES": 3, "STREAM_WINDOW": 2}
+
+
+def test_ingest_then_forecast_latest(make_client, model) -> None:
+    client = make_client(**STREAM_ENV)
+    assert client.get("/forecast/latest").status_code == 409
+
+    for t in range(3):
+        r = client.post("/ingest", json={"values": [t, t, t], "timestamp": f"t{t}"})
+        assert r.status_code == 202
+    r = client.post("/ingest", json={"values": [9], "nodes": [1]})
+    assert r.status_code == 202
+    wait_for(lambda: client.get("/stream/state").json()["steps"] == 4)
+
+    body = client.get("/forecast/latest").json()
+    assert body["step"] == 4 and body["timestamp"] is None
+    np.testing.assert_array_equal(
+        np.asarray(body["outputs"])[0, :, :, 0], [[2, 9, 2]] * 3
+    )
+    client.get("/forecast/latest")
+    assert model.calls == 1  # reused until the next reading
+
+
+def test_ingest_rejects_bad_readings(make_client) -> None:
+    client = make_client(**STREAM_ENV)
+    assert client.post("/ingest", json={"values": [1, 2]}).status_code == 422
+    r = client.post("/ingest", json={"values": [1], "nodes": [5]})
+    assert r.status_code == 422
+
+
+def test_stream_routes_need_streaming_enabled(make_client) -> None:
+    client = make_client()
+    assert client.post("/ingest", json={"values": [1]}).status_code == 503
+    assert client.get("/forecast/latest").status_code == 503
@@ -0,0 +1 @@
+"""Open-loop load tests for the API with LargeST-shaped request mixes."""
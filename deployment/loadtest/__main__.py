@@ -0,0 +1,3 @@
+from deployment.loadtest.run import main
+
+raise SystemExit(main())
@@ -0,0 +1,214 @@
+"""Open-loop request driver and the latency / throughput / error report."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from deployment.loadtest.mixes import RequestMix
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass(frozen=True)
+class Step:
+    rps: float
+    seconds: float
+
+
+def parse_schedule(spec: str) -> List[Step]:
+    """`"50:30,200:60"` -> 50 req/s for 30 s, then 200 req/s for 60 s."""
+    steps = []
+    for part in spec.split(","):
+        rps, _, seconds = part.partition(":")
+        step = Step(float(rps), float(seconds))
+        if step.rps <= 0 or step.seconds <= 0:
+            raise ValueError(
+                f"Schedule steps need positive rate and duration: {part!r}"
+            )
+        steps.append(step)
+    return steps
+
+
+@dataclass
+class _Sample:
+    step: int
+    kind: str
+    scheduled_s: float
+    latency_s: float
+    lag_s: float
+    outcome: str
+    request_bytes: int
+    response_bytes: int
+
+
+def _summary(samples: List[_Sample], window_s: float) -> Dict[str, Any]:
+    ok = [s for s in samples if s.outcome == "200"]
+    errors: Dict[str, int] = {}
+    for s in samples:
+        if s.outcome != "200":
+            errors[s.outcome] = errors.get(s.outcome, 0) + 1
+    latency: Dict[str, float] = {}
+    if ok:
+        lat = np.array([s.latency_s for s in ok]) * 1e3
+        latency = {
+            f"p{p}": float(v)
+            for p, v in zip(PERCENTILES, np.percentile(lat, PERCENTILES))
+        }
+        latency.update(mean=float(lat.mean()), max=float(lat.max()))
+    return {
+        "sent": len(samples),
+        "ok": len(ok),
+        "errors": dict(sorted(errors.items())),
+        "error_rate": (len(samples) - len(ok)) / len(samples) if samples else 0.0,
+        "offered_rps": len(samples) / window_s if window_s > 0 else 0.0,
+        "throughput_rps": len(ok) / window_s if window_s > 0 else 0.0,
+        "latency_ms": latency,
+        "client_lag_p99_ms": float(np.percentile([s.lag_s for s in samples], 99) * 1e3)
+        if samples
+        else 0.0,
+        "mean_request_kb": float(np.mean([s.request_bytes for s in samples]) / 1024)
+        if samples
+        else 0.0,
+        "mean_response_kb": float(np.mean([s.response_bytes for s in ok]) / 1024)
+        if ok
+        else 0.0,
+    }
+
+
+class Driver:
+    """Sends `mix` requests on an open-loop schedule and records every outcome.
+
+    Arrival times are fixed up front (Poisson or evenly spaced) and never wait
+    on responses. Latency is measured from the *scheduled* arrival, so a
+    saturated client or server shows up as latency instead of silently lowering
+    the offered rate. `client_lag_p99_ms` reports how late requests actually
+    left; if it grows, the client machine is the bottleneck. Requests over
+    `max_inflight` are not sent and count as `client_overflow` errors.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: RequestMix,
+        path: str = "/predict",
+        headers: Optional[Mapping[str, str]] = None,
+        arrivals: str = "poisson",
+        max_inflight: int = 1024,
+        timeout_s: float = 10.0,
+        warmup_s: float = 0.0,
+        seed: int = 0,
+    ):
+        if arrivals not in ("poisson", "uniform"):
+            raise ValueError("arrivals must be 'poisson' or 'uniform'")
+        self.client = client
+        self.mix = mix
+        self.path = path
+        self.headers = {"content-type": "application/json", **(headers or {})}
+        self.arrivals = arrivals
+        self.max_inflight = max_inflight
+        self.timeout_s = timeout_s
+        self.warmup_s = warmup_s
+        self.rng = np.random.default_rng(seed)
+        self.samples: List[_Sample] = []
+        self._inflight = 0
+
+    def _gaps(self, step: Step) -> np.ndarray:
+        n = int(np.ceil(step.rps * step.seconds * 1.5)) + 16
+        if self.arrivals == "uniform":
+            return np.full(n, 1.0 / step.rps)
+        return self.rng.exponential(1.0 / step.rps, size=n)
+
+    async def _send(self, step: int, t0: float, scheduled: float) -> None:
+        spec = self.mix.sample()
+        start = time.perf_counter()
+        outcome, size = "200", 0
+        try:
+            r = await self.client.post(
+                self.path,
+                content=spec.body,
+                headers=self.headers,
+                timeout=self.timeout_s,
+            )
+            outcome, size = str(r.status_code), len(r.content)
+        except httpx.TimeoutException:
+            outcome = "timeout"
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        finally:
+            self._inflight -= 1
+        done = time.perf_counter()
+        self._record(
+            _Sample(
+                step,
+                spec.kind,
+                scheduled - t0,
+                done - scheduled,
+                start - scheduled,
+                outcome,
+                len(spec.body),
+                size,
+            )
+        )
+
+    def _record(self, sample: _Sample) -> None:
+        if sample.scheduled_s >= self.warmup_s:
+            self.samples.append(sample)
+
+    async def run(self, schedule: List[Step]) -> None:
+        tasks = set()
+        t0 = time.perf_counter()
+        step_start = t0
+        for i, step in enumerate(schedule):
+            step_end = step_start + step.seconds
+            scheduled = step_start
+            for gap in self._gaps(step):
+                scheduled += gap
+                if scheduled >= step_end:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self._inflight >= self.max_inflight:
+                    self._record(
+                        _Sample(
+                            i, "-", scheduled - t0, 0.0, 0.0, "client_overflow", 0, 0
+                        )
+                    )
+                    continue
+                self._inflight += 1
+                task = asyncio.create_task(self._send(i, t0, scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            step_start = step_end
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def report(self, schedule: List[Step]) -> Dict[str, Any]:
+        bounds: List[Tuple[float, float]] = []
+        start = 0.0
+        for step in schedule:
+            bounds.append((max(start, self.warmup_s), start + step.seconds))
+            start += step.seconds
+        window = max(start - self.warmup_s, 0.0)
+
+        steps = []
+        for i, (step, (lo, hi)) in enumerate(zip(schedule, bounds)):
+            summary = _summary(
+                [s for s in self.samples if s.step == i], max(hi - lo, 0.0)
+            )
+            steps.append({"target_rps": step.rps, "seconds": step.seconds, **summary})
+        kinds = sorted({s.kind for s in self.samples} - {"-"})
+        return {
+            "overall": _summary(self.samples, window),
+            "by_kind": {
+                k: _summary([s for s in self.samples if s.kind == k], window)
+                for k in kinds
+            },
+            "steps": steps,
+        }
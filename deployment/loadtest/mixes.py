@@ -0,0 +1,168 @@
+"""Request mixes built from LargeST windows.
+
+Three kinds of `/predict` traffic, drawn by weight:
+
+- ``full``: a window over the whole sensor network (dashboards, batch jobs).
+- ``region``: the same window restricted to one region's sensors. With sensor
+  metadata that is every sensor within a radius of a random sensor; without
+  it, a contiguous node range (LargeST orders sensors by district).
+- ``hot``: one of a few popular windows, resent with Zipf-like popularity (many
+  clients polling the latest readings for the same corridors).
+
+Bodies use the flat ``{"inputs": [...], "shape": [...]}`` form and are encoded
+once up front, so the client spends its time sending, not serializing.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import orjson
+
+KINDS = ("full", "region", "hot")
+
+
+@dataclass(frozen=True)
+class MixConfig:
+    weights: Dict[str, float] = field(
+        default_factory=lambda: {"full": 0.2, "region": 0.6, "hot": 0.2}
+    )
+    input_len: int = 12
+    pool_size: int = 32
+    region_frac: Tuple[float, float] = (0.02, 0.2)
+    region_radius_km: Tuple[float, float] = (3.0, 15.0)
+    hot_windows: int = 8
+    hot_skew: float = 1.2
+
+    @staticmethod
+    def parse_weights(spec: str) -> Dict[str, float]:
+        """`"full=0.2,region=0.6,hot=0.2"` -> weights (need not sum to 1)."""
+        weights = {}
+        for part in spec.split(","):
+            kind, _, value = part.partition("=")
+            kind = kind.strip()
+            if kind not in KINDS:
+                raise ValueError(f"Unknown request kind {kind!r}; expected {KINDS}")
+            weights[kind] = float(value)
+        if sum(weights.values()) <= 0:
+            raise ValueError("Mix weights must sum to a positive number")
+        return weights
+
+
+@dataclass(frozen=True)
+class RequestSpec:
+    kind: str
+    body: bytes
+    num_nodes: int
+
+
+def load_series(
+    path: Optional[Path],
+    key: Optional[str] = None,
+    num_nodes: int = 716,
+    num_steps: int = 7 * 288,
+    seed: int = 0,
+) -> np.ndarray:
+    """A `[T, N, C]` series: a LargeST file if given, else synthetic SD-sized data."""
+    if path is not None:
+        from spatiotemporal_lab.data.datasets import open_series
+
+        return open_series(path, key=key)
+    from benchmarks.synthetic import SyntheticShape, make_series
+
+    return make_series(SyntheticShape(num_nodes=num_nodes, num_steps=num_steps), seed)
+
+
+def _encode(window: np.ndarray) -> bytes:
+    x = np.ascontiguousarray(window[None], dtype=np.float32)
+    return orjson.dumps(
+        {"inputs": x.reshape(-1), "shape": x.shape},
+        option=orjson.OPT_SERIALIZE_NUMPY,
+    )
+
+
+class RequestMix:
+    """Pre-encoded request pools per kind, sampled by weight."""
+
+    def __init__(
+        self,
+        series: np.ndarray,
+        cfg: MixConfig = MixConfig(),
+        sensor_index=None,
+        seed: int = 0,
+    ):
+        self.cfg = cfg
+        self.rng = np.random.default_rng(seed)
+        num_steps, self.num_nodes = series.shape[0], series.shape[1]
+        if num_steps < cfg.input_len:
+            raise ValueError(f"Series has {num_steps} steps, need {cfg.input_len}")
+        self._index = sensor_index
+        self.kinds = [k for k in KINDS if cfg.weights.get(k, 0.0) > 0]
+        w = np.array([cfg.weights[k] for k in self.kinds], dtype=np.float64)
+        self._p = w / w.sum()
+
+        def window() -> np.ndarray:
+            start = int(self.rng.integers(0, num_steps - cfg.input_len + 1))
+            return np.asarray(series[start : start + cfg.input_len])
+
+        self.pools: Dict[str, List[RequestSpec]] = {}
+        if "full" in self.kinds:
+            self.pools["full"] = [
+                RequestSpec("full", _encode(window()), self.num_nodes)
+                for _ in range(cfg.pool_size)
+            ]
+        if "region" in self.kinds:
+            specs = []
+            for _ in range(cfg.pool_size):
+                nodes = self._region()
+                specs.append(
+                    RequestSpec("region", _encode(window()[:, nodes]), nodes.size)
+                )
+            self.pools["region"] = specs
+        if "hot" in self.kinds:
+            nodes = [self._region() for _ in range(cfg.hot_windows)]
+            self.pools["hot"] = [
+                RequestSpec("hot", _encode(window()[:, n]), n.size) for n in nodes
+            ]
+            ranks = np.arange(1, cfg.hot_windows + 1, dtype=np.float64)
+            self._hot_p = ranks**-cfg.hot_skew / (ranks**-cfg.hot_skew).sum()
+
+    def _region(self) -> np.ndarray:
+        lo, hi = self.cfg.region_frac
+        if self._index is not None:
+            located = np.flatnonzero(np.isfinite(self._index.lat))
+            for _ in range(16):
+                center = int(self.rng.choice(located))
+                nodes = self._index.within(
+                    float(self._index.lat[center]),
+                    float(self._index.lng[center]),
+                    float(self.rng.uniform(*self.cfg.region_radius_km)),
+                )
+                if nodes.size >= 2:
+                    return nodes
+        size = max(1, int(self.num_nodes * self.rng.uniform(lo, hi)))
+        start = int(self.rng.integers(0, self.num_nodes - size + 1))
+        return np.arange(start, start + size)
+
+    def sample(self) -> RequestSpec:
+        kind = self.kinds[int(self.rng.choice(len(self.kinds), p=self._p))]
+        pool = self.pools[kind]
+        if kind == "hot":
+            return pool[int(self.rng.choice(len(pool), p=self._hot_p))]
+        return pool[int(self.rng.integers(len(pool)))]
+
+    def describe(self) -> Dict[str, Dict[str, float]]:
+        return {
+            kind: {
+                "weight": float(p),
+                "distinct_bodies": len(self.pools[kind]),
+                "mean_nodes": float(np.mean([s.num_nodes for s in self.pools[kind]])),
+                "mean_body_kb": float(
+                    np.mean([len(s.body) for s in self.pools[kind]]) / 1024
+                ),
+            }
+            for kind, p in zip(self.kinds, self._p)
+        }
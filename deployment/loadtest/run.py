@@ -0,0 +1,228 @@
+"""Load-test `/predict` with a LargeST request mix and write a JSON report.
+
+By default the API runs in-process with a stub model (no MLflow, no network),
+so the same command works on a laptop and in CI. `--url` targets a live
+deployment instead.
+
+Example::
+
+    python -m deployment.loadtest --schedule 20:10,50:20,100:20 --output load.json
+    python -m deployment.loadtest --url http://ml-api.staging --schedule 200:120 \\
+        --series data/largest/ca_his_2019.h5 --meta data/largest/ca_meta.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+from deployment.loadtest.driver import Driver, parse_schedule
+from deployment.loadtest.mixes import MixConfig, RequestMix, load_series
+from deployment.loadtest.stub import API_DIR, StubModel, stub_app
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _headers(values: List[str]) -> Dict[str, str]:
+    headers = {}
+    for value in values:
+        name, sep, v = value.partition(":")
+        if not sep:
+            raise SystemExit(f"--header expects NAME:VALUE, got {value!r}")
+        headers[name.strip()] = v.strip()
+    return headers
+
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    rows = [("overall", report["overall"])] + list(report["by_kind"].items())
+    rows += [(f"step {s['target_rps']:g} rps", s) for s in report["steps"]]
+    width = max(len(name) for name, _ in rows)
+    print(
+        f"{'':<{width}}  {'sent':>7} {'ok/s':>8} {'err':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for name, s in rows:
+        lat = s["latency_ms"]
+        print(
+            f"{name:<{width}}  {s['sent']:>7} {s['throughput_rps']:>8.1f} "
+            f"{s['error_rate']:>6.1%} {lat.get('p50', float('nan')):>8.1f} "
+            f"{lat.get('p95', float('nan')):>8.1f} {lat.get('p99', float('nan')):>8.1f}"
+        )
+
+
+async def _drive(args: argparse.Namespace, mix: RequestMix) -> Dict[str, Any]:
+    schedule = parse_schedule(args.schedule)
+    limits = httpx.Limits(
+        max_connections=args.connections, max_keepalive_connections=args.connections
+    )
+
+    async def _run(client: httpx.AsyncClient) -> Dict[str, Any]:
+        driver = Driver(
+            client,
+            mix,
+            path=args.path,
+            headers=_headers(args.header),
+            arrivals=args.arrivals,
+            max_inflight=args.max_inflight,
+            timeout_s=args.timeout,
+            warmup_s=args.warmup,
+            seed=args.seed,
+        )
+        await driver.run(schedule)
+        return driver.report(schedule)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits) as client:
+            return await _run(client)
+
+    model = StubModel(args.stub_base_ms, args.stub_per_node_us, args.horizon)
+    async with stub_app(model) as app:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://loadtest", limits=limits
+        ) as client:
+            return await _run(client)
+
+
+def main(argv: List[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument(
+        "--url", default=None, help="Live API base URL (default: in-process stub)."
+    )
+    p.add_argument("--path", default="/predict")
+    p.add_argument(
+        "--schedule", default="20:10,50:20", help="rps:seconds steps, comma-separated."
+    )
+    p.add_argument("--arrivals", choices=("poisson", "uniform"), default="poisson")
+    p.add_argument(
+        "--warmup", type=float, default=2.0, help="Seconds excluded from the report."
+    )
+    p.add_argument("--mix", default="full=0.2,region=0.6,hot=0.2")
+    p.add_argument(
+        "--series",
+        type=Path,
+        default=None,
+        help="LargeST series (.npy/.h5); synthetic if omitted.",
+    )
+    p.add_argument(
+        "--series-key", default=None, help="Array key inside --series containers."
+    )
+    p.add_argument(
+        "--meta",
+        type=Path,
+        default=None,
+        help="LargeST metadata CSV for geographic regions.",
+    )
+    p.add_argument(
+        "--nodes", type=int, default=716, help="Synthetic sensor count (716 = SD)."
+    )
+    p.add_argument("--input-len", type=int, default=12)
+    p.add_argument("--horizon", type=int, default=12)
+    p.add_argument(
+        "--pool-size", type=int, default=32, help="Distinct bodies per kind."
+    )
+    p.add_argument("--hot-windows", type=int, default=8)
+    p.add_argument(
+        "--header", action="append", default=[], help="Extra NAME:VALUE header."
+    )
+    p.add_argument("--connections", type=int, default=256, help="httpx pool size.")
+    p.add_argument("--max-inflight", type=int, default=1024)
+    p.add_argument("--timeout", type=float, default=10.0)
+    p.add_argument("--stub-base-ms", type=float, default=20.0)
+    p.add_argument("--stub-per-node-us", type=float, default=5.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--output", type=Path, default=None)
+    p.add_argument(
+        "--max-p95-ms",
+        type=float,
+        default=None,
+        help="Fail if overall p95 exceeds this.",
+    )
+    p.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=None,
+        help="Fail if the error rate exceeds this.",
+    )
+    args = p.parse_args(argv)
+
+    sensor_index = None
+    if args.meta is not None:
+        if str(API_DIR) not in sys.path:
+            sys.path.insert(0, str(API_DIR))
+        from app.core.spatial import SensorIndex
+
+        sensor_index = SensorIndex.from_csv(args.meta)
+
+    cfg = MixConfig(
+        weights=MixConfig.parse_weights(args.mix),
+        input_len=args.input_len,
+        pool_size=args.pool_size,
+        hot_windows=args.hot_windows,
+    )
+    series = load_series(
+        args.series, args.series_key, num_nodes=args.nodes, seed=args.seed
+    )
+    mix = RequestMix(series, cfg, sensor_index=sensor_index, seed=args.seed)
+
+    report = asyncio.run(_drive(args, mix))
+    report["meta"] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "target": args.url or "in-process stub",
+        "schedule": args.schedule,
+        "arrivals": args.arrivals,
+        "warmup_s": args.warmup,
+        "num_nodes": mix.num_nodes,
+        "mix": mix.describe(),
+        "stub": None
+        if args.url
+        else {"base_ms": args.stub_base_ms, "per_node_us": args.stub_per_node_us},
+    }
+
+    _print_summary(report)
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Wrote {args.output}")
+
+    overall = report["overall"]
+    failed = []
+    p95 = overall["latency_ms"].get("p95")
+    if args.max_p95_ms is not None and p95 is None:
+        failed.append("no successful requests")
+    elif args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        failed.append(f"p95 {p95:.1f} ms > {args.max_p95_ms} ms")
+    if args.max_error_rate is not None and overall["error_rate"] > args.max_error_rate:
+        failed.append(
+            f"error rate {overall['error_rate']:.2%} > {args.max_error_rate:.2%}"
+        )
+    for reason in failed:
+        print(f"FAIL: {reason}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,57 @@
+"""The API app with a stub model, for load tests without MLflow or a network."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import numpy as np
+
+API_DIR = Path(__file__).resolve().parents[1] / "api"
+
+
+class StubModel:
+    """Pyfunc-shaped model that costs `base_ms + per_node_us * nodes` per call.
+
+    The time is spent in `time.sleep` on the service's worker thread, like an
+    accelerator call that releases the GIL. The forecast repeats the last input
+    step over `horizon`, so response sizes match a real model's.
+    """
+
+    def __init__(
+        self, base_ms: float = 20.0, per_node_us: float = 5.0, horizon: int = 12
+    ):
+        self.base_ms = base_ms
+        self.per_node_us = per_node_us
+        self.horizon = horizon
+
+    def predict(self, inputs: Any) -> np.ndarray:
+        x = np.asarray(inputs, dtype=np.float32)
+        nodes = x.shape[2] if x.ndim >= 3 else 1
+        time.sleep((self.base_ms + self.per_node_us * nodes / 1000) / 1000)
+        return np.repeat(x[:, -1:], self.horizon, axis=1)
+
+
+@asynccontextmanager
+async def stub_app(model: StubModel) -> AsyncIterator[Any]:
+    """Run the app's lifespan with `model` in place of the registry model.
+
+    Everything else (admission control, metrics, compression, logging) is
+    configured from the environment exactly as in a deployment.
+    """
+    if str(API_DIR) not in sys.path:
+        sys.path.insert(0, str(API_DIR))
+    os.environ.setdefault("MLFLOW_TRACKING_URI", "stub")
+    os.environ.setdefault("MLFLOW_MODEL_NAME", "loadtest")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ["LOAD_MODEL_ON_STARTUP"] = "false"
+    os.environ["MLFLOW_EXTRA_MODEL_ALIASES"] = ""
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        app.state.model_service._model = model
+        yield app
@@ -0,0 +1,17 @@
+"""Loadtest smoke tests run from the repo root: `uv run pytest deployment/loadtest`."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[3]
+for path in (REPO_ROOT, REPO_ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+try:
+    import fastapi  # noqa: F401
+    import httpx  # noqa: F401
+except ImportError:  # the `api` extra is not installed
+    collect_ignore_glob = ["test_*.py"]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from deployment.loadtest.driver import parse_schedule
+from deployment.loadtest.mixes import MixConfig, RequestMix
+from deployment.loadtest.run import main
+
+
+@pytest.fixture(autouse=True)
+def _stub_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Restored after the test; `stub_app` writes some of these itself.
+    for name, value in {
+        "MLFLOW_TRACKING_URI": "stub",
+        "MLFLOW_MODEL_NAME": "loadtest",
+        "MLFLOW_EXTRA_MODEL_ALIASES": "",
+        "LOAD_MODEL_ON_STARTUP": "false",
+        "LOG_LEVEL": "WARNING",
+        "ADMISSION_ENABLED": "false",
+        "STREAM_ENABLED": "false",
+    }.items():
+        monkeypatch.setenv(name, value)
+
+
+def test_stub_run_meets_its_gate(tmp_path: Path) -> None:
+    out = tmp_path / "load.json"
+    code = main(
+        [
+            "--schedule", "20:1",
+            "--warmup", "0.2",
+            "--nodes", "32",
+            "--pool-size", "4",
+            "--hot-windows", "2",
+            "--stub-base-ms", "1",
+            "--arrivals", "uniform",
+            "--max-error-rate", "0",
+            "--max-p95-ms", "2000",
+            "--output", str(out),
+        ]
+    )  # fmt: skip
+    assert code == 0
+    report = json.loads(out.read_text())
+    overall = report["overall"]
+    assert overall["ok"] == overall["sent"] > 5 and overall["errors"] == {}
+    assert set(report["by_kind"]) <= {"full", "region", "hot"}
+    assert report["meta"]["target"] == "in-process stub"
+
+
+def test_gate_fails_when_latency_is_over_budget(tmp_path: Path) -> None:
+    code = main(
+        [
+            "--schedule", "10:0.5",
+            "--warmup", "0",
+            "--nodes", "8",
+            "--pool-size", "2",
+            "--mix", "full=1",
+            "--stub-base-ms", "30",
+            "--max-p95-ms", "1",
+        ]
+    )  # fmt: skip
+    assert code == 1
+
+
+def test_mix_and_schedule_parsing() -> None:
+    assert [s.rps for s in parse_schedule("5:1,10:2")] == [5.0, 10.0]
+    with pytest.raises(ValueError):
+        parse_schedule("5:0")
+    with pytest.raises(ValueError):
+        MixConfig.parse_weights("full=1,bulk=1")
+
+    series = np.zeros((30, 40, 1), dtype=np.float32)
+    mix = RequestMix(series, MixConfig(weights={"region": 1.0}, pool_size=3))
+    assert {s.kind for s in (mix.sample() for _ in range(10))} == {"region"}
+    assert all(1 <= s.num_nodes <= 8 for s in mix.pools["region"])
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Local autoscaling harness: replays the HPA control loop against stub replicas.
+
+Each replica is the real API app (admission control on) in its own uvicorn
+process. Its model is a stub that sleeps `--service-ms` per call. An open-loop
+Poisson load follows `--profile`, round-robined over ready replicas like a
+Service. Every `--sync-s` the harness scrapes each replica's scaling gauges
+and applies the HPA rule, `desired = ceil(replicas * average / target)` per
+metric (10% tolerance, max over metrics, scale-down stabilization). It then
+starts or stops replicas and prints one line per period.
+
+    python deployment/scripts/hpa_harness.py run --profile 20:20,200:40,20:40
+
+Run from the repository root with the `api` extra installed.
+"""
+
+import asyncio
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import orjson
+import typer
+from loguru import logger
+
+API_DIR = Path(__file__).resolve().parents[1] / "api"
+SIGNALS = ("inference_inflight_requests", "inference_queue_wait_p95_seconds")
+
+app = typer.Typer(add_completion=False)
+
+
+def _serve(port: int, service_ms: float, concurrency: int) -> None:
+    """Replica entrypoint: the API app with `ModelService` loading a stub."""
+    sys.path.insert(0, str(API_DIR))
+    os.environ.update(
+        MLFLOW_TRACKING_URI="stub",
+        MLFLOW_MODEL_NAME="stub",
+        ADMISSION_ENABLED="true",
+        ADMISSION_MAX_CONCURRENCY=str(concurrency),
+        ADMISSION_INITIAL_SERVICE_MS=str(service_ms),
+        LOG_LEVEL="WARNING",
+    )
+    import uvicorn
+    from app.core.model import ModelService
+    from app.main import app as api
+
+    class StubModel:
+        def predict(self, x):
+            time.sleep(service_ms / 1000)  # an accelerator call: no GIL held
+            return np.repeat(np.asarray(x)[:, -1:], 12, axis=1)
+
+    ModelService._load_sync = lambda self, uri=None: StubModel()
+    uvicorn.run(api, host="127.0.0.1", port=port, log_level="warning")
+
+
+@dataclass
+class Replica:
+    port: int
+    proc: subprocess.Popen
+    ready: bool = False
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+@dataclass
+class Window:
+    sent: int = 0
+    ok: int = 0
+    errors: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+
+def _parse_gauges(text: str) -> Dict[str, float]:
+    out = {}
+    for line in text.splitlines():
+        name, _, value = line.partition(" ")
+        if name in SIGNALS:
+            out[name] = float(value)
+    return out
+
+
+def _profile(spec: str) -> List[Tuple[float, float]]:
+    """`"20:30,200:60"` -> [(rps, seconds), ...]."""
+    steps = []
+    for part in spec.split(","):
+        rps, _, secs = part.partition(":")
+        steps.append((float(rps), float(secs)))
+    return steps
+
+
+class Harness:
+    def __init__(
+        self,
+        service_ms: float,
+        concurrency: int,
+        min_replicas: int,
+        max_replicas: int,
+        targets: Dict[str, float],
+        sync_s: float,
+        stabilization_s: float,
+        base_port: int,
+        nodes: int,
+    ):
+        self.service_ms = service_ms
+        self.concurrency = concurrency
+        self.min_replicas = min_replicas
+        self.max_replicas = max_replicas
+        self.targets = targets
+        self.sync_s = sync_s
+        self.stabilization_s = stabilization_s
+        self.replicas: List[Replica] = []
+        self._ports = iter(range(base_port, base_port + 1000))
+        self._rr = 0
+        self._recommendations: Deque[Tuple[float, int]] = deque()
+        self.window = Window()
+        self.timeline: List[dict] = []
+        x = np.random.default_rng(0).normal(size=(1, 12, nodes, 1)).round(3)
+        self.body = orjson.dumps(
+            {"inputs": x.reshape(-1), "shape": x.shape},
+            option=orjson.OPT_SERIALIZE_NUMPY,
+        )
+
+    def start_replica(self) -> None:
+        port = next(self._ports)
+        proc = subprocess.Popen(
+            [
+                sys.executable,
+                __file__,
+                "serve",
+                str(port),
+                str(self.service_ms),
+                str(self.concurrency),
+            ],
+        )
+        self.replicas.append(Replica(port, proc))
+
+    def stop_replica(self) -> None:
+        rep = self.replicas.pop()  # newest first, like a ReplicaSet scale-down
+        rep.ready = False
+        rep.proc.terminate()
+
+    async def _poll_ready(self, client: httpx.AsyncClient) -> None:
+        while True:
+            for rep in self.replicas:
+                if not rep.ready:
+                    try:
+                        r = await client.get(f"{rep.url}/ready", timeout=0.5)
+                        rep.ready = r.status_code == 200 and r.json().get("ready")
+                    except httpx.HTTPError:
+                        pass
+            await asyncio.sleep(0.2)
+
+    async def _scrape(self, client: httpx.AsyncClient) -> None:
+        while True:
+            for rep in [r for r in self.replicas if r.ready]:
+                try:
+                    r = await client.get(f"{rep.url}/metrics", timeout=1.0)
+                except httpx.HTTPError:
+                    continue
+                for name, value in _parse_gauges(r.text).items():
+                    rep.samples.setdefault(name, []).append(value)
+            await asyncio.sleep(1.0)
+
+    async def _request(self, client: httpx.AsyncClient) -> None:
+        ready = [r for r in self.replicas if r.ready]
+        self.window.sent += 1
+        if not ready:
+            self.window.errors += 1
+            return
+        self._rr = (self._rr + 1) % len(ready)
+        t0 = time.perf_counter()
+        try:
+            r = await client.post(
+                f"{ready[self._rr].url}/predict",
+                content=self.body,
+                headers={
+                    "content-type": "application/json",
+                    "x-request-deadline-ms": "2000",
+                },
+                timeout=10.0,
+            )
+            ok = r.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            self.window.ok += 1
+            self.window.latencies.append(time.perf_counter() - t0)
+        else:
+            self.window.errors += 1
+
+    async def _load(
+        self, client: httpx.AsyncClient, profile: List[Tuple[float, float]]
+    ) -> None:
+        # Open loop: arrivals follow a Poisson schedule in absolute time and
+        # never wait on replies, so a lagging client shows up as latency.
+        tasks = set()
+        next_t = time.perf_counter()
+        for rps, secs in profile:
+            self.current_rps = rps
+            end = next_t + secs
+            while next_t < end:
+                next_t += random.expovariate(rps)
+                await asyncio.sleep(max(0.0, next_t - time.perf_counter()))
+                task = asyncio.create_task(self._request(client))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+    def _hpa_step(self, t: float, rps: float) -> None:
+        ready = [r for r in self.replicas if r.ready]
+        averages = {}
+        for name in SIGNALS:
+            values = [np.mean(r.samples[name]) for r in ready if r.samples.get(name)]
+            averages[name] = float(np.mean(values)) if values else 0.0
+        for r in ready:
+            r.samples.clear()
+
+        # Per-metric proposal with the HPA's 10% tolerance; the largest wins.
+        current = len(self.replicas)
+        proposals = []
+        for name, target in self.targets.items():
+            ratio = averages[name] / target
+            proposals.append(
+                current if abs(ratio - 1) <= 0.1 else math.ceil(current * ratio)
+            )
+        desired = min(max(max(proposals), self.min_replicas), self.max_replicas)
+        # Scale-down stabilization: follow the highest recommendation in the window.
+        self._recommendations.append((t, desired))
+        while self._recommendations[0][0] < t - self.stabilization_s:
+            self._recommendations.popleft()
+        if desired < current:
+            desired = max(d for _, d in self._recommendations)
+
+        w, self.window = self.window, Window()
+        lat = np.percentile(w.latencies, [50, 95]) * 1000 if w.latencies else (0.0, 0.0)
+        row = {
+            "t_s": round(t),
+            "offered_rps": rps,
+            "served_rps": round(w.ok / self.sync_s, 1),
+            "error_pct": round(100 * w.errors / max(w.sent, 1), 1),
+            "p50_ms": round(float(lat[0]), 1),
+            "p95_ms": round(float(lat[1]), 1),
+            "inflight_per_pod": round(averages[SIGNALS[0]], 2),
+            "wait_p95_ms": round(1000 * averages[SIGNALS[1]], 1),
+            "replicas": current,
+            "ready": len(ready),
+            "desired": desired,
+        }
+        self.timeline.append(row)
+        logger.info(
+            "t={t_s:>4}s offered={offered_rps:>6.0f} served={served_rps:>6.1f} "
+            "err={error_pct:>5.1f}% p95={p95_ms:>7.1f}ms inflight/pod={inflight_per_pod:>5.2f} "
+            "wait_p95={wait_p95_ms:>6.1f}ms replicas={replicas}->{desired}",
+            **row,
+        )
+        while len(self.replicas) < desired:
+            self.start_replica()
+        while len(self.replicas) > desired:
+            self.stop_replica()
+
+    async def run(self, profile: List[Tuple[float, float]]) -> None:
+        for _ in range(self.min_replicas):
+            self.start_replica()
+        limits = httpx.Limits(max_connections=2000, max_keepalive_connections=500)
+        async with httpx.AsyncClient(limits=limits) as client:
+            background = [
+                asyncio.create_task(self._poll_ready(client)),
+                asyncio.create_task(self._scrape(client)),
+            ]
+            deadline = time.perf_counter() + 60
+            while not any(r.ready for r in self.replicas):
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("No replica became ready within 60 s")
+                await asyncio.sleep(0.2)
+            self.current_rps = profile[0][0]
+            load = asyncio.create_task(self._load(client, profile))
+            t0 = time.perf_counter()
+            while not load.done():
+                await asyncio.sleep(self.sync_s)
+                self._hpa_step(time.perf_counter() - t0, self.current_rps)
+            for task in background:
+                task.cancel()
+        while self.replicas:
+            self.stop_replica()
+
+
+@app.command()
+def serve(port: int, service_ms: float, concurrency: int) -> None:
+    """Run one stub replica (used internally by `run`)."""
+    _serve(port, service_ms, concurrency)
+
+
+@app.command()
+def run(
+    profile: str = typer.Option(
+        "20:20,200:40,20:40", help="rps:seconds steps, comma-separated."
+    ),
+    service_ms: float = typer.Option(50.0, help="Stub model latency per call."),
+    concurrency: int = typer.Option(4, help="ADMISSION_MAX_CONCURRENCY per replica."),
+    min_replicas: int = typer.Option(1),
+    max_replicas: int = typer.Option(8),
+    target_inflight: float = typer.Option(
+        3.0, help="inference_inflight_requests per pod."
+    ),
+    target_wait_ms: float = typer.Option(
+        200.0, help="inference_queue_wait_p95_seconds per pod."
+    ),
+    sync_s: float = typer.Option(5.0, help="HPA sync period (15 s in Kubernetes)."),
+    stabilization_s: float = typer.Option(
+        30.0, help="Scale-down stabilization window."
+    ),
+    nodes: int = typer.Option(64, help="Nodes per request window."),
+    base_port: int = typer.Option(18000),
+    out: Optional[Path] = typer.Option(None, help="Write the timeline as JSON."),
+) -> None:
+    """Drive a load profile and show how the custom-metric HPA would scale."""
+    harness = Harness(
+        service_ms=service_ms,
+        concurrency=concurrency,
+        min_replicas=min_replicas,
+        max_replicas=max_replicas,
+        targets={SIGNALS[0]: target_inflight, SIGNALS[1]: target_wait_ms / 1000},
+        sync_s=sync_s,
+        stabilization_s=stabilization_s,
+        base_port=base_port,
+        nodes=nodes,
+    )
+    try:
+        asyncio.run(harness.run(_profile(profile)))
+    finally:
+        while harness.replicas:
+            harness.stop_replica()
+    if out is not None:
+        out.write_bytes(orjson.dumps(harness.timeline, option=orjson.OPT_INDENT_2))
+        logger.info("Timeline written to {}", out)
+
+
+if __name__ == "__main__":
+    app()
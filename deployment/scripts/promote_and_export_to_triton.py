@@ -17,6 +17,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import mlflow
+import numpy as np
 
 # Optional export deps (declared in pyproject extras)
 import torch
@@ -27,6 +28,13 @@ from mlflow.tracking import MlflowClient
 from skl2onnx import convert_sklearn
 from skl2onnx.common.data_types import FloatTensorType
 
+from spatiotemporal_lab.inference.onnx_export import (
+    StaticGraphExportConfig,
+    export_static_graph_onnx,
+    load_adjacency,
+    verify_onnx_against_torch,
+)
+
 app = typer.Typer(add_completion=False)
 
 # Minimal dtype mapping for config.pbtxt (extend per-need)
@@ -247,6 +255,68 @@ def _export_torch_to_onnx(
     )
 
 
+def _export_torch_static_graph_to_onnx(
+    model_uri: str,
+    out_path: Path,
+    cfg: StaticGraphExportConfig,
+    adjacency_path: Optional[Path],
+    verify_windows_path: Optional[Path],
+    num_verify_windows: int,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Export pytorch flavor with a fixed node axis and a stacked horizon output.
+
+    - Adjacency (if given) is baked in as a dense or sparse initializer.
+    - The exported graph is checked against PyTorch on real input windows
+      (`[K, T, N, F]` .npy) before the artifact is accepted.
+
+    Returns the IO description for config.pbtxt (the signature describes the
+    unwrapped model, not the stacked-horizon graph).
+    """
+    pt_model = mlflow.pytorch.load_model(model_uri)
+    pt_model.eval()
+
+    adjacency = load_adjacency(adjacency_path) if adjacency_path else None
+
+    windows = None
+    if verify_windows_path:
+        windows = np.load(verify_windows_path, mmap_mode="r")[:num_verify_windows]
+        expected = (cfg.input_len, cfg.num_nodes, cfg.num_features)
+        if tuple(windows.shape[1:]) != expected:
+            raise RuntimeError(
+                f"Verification windows have shape {windows.shape[1:]}, expected {expected}"
+            )
+    else:
+        logger.warning(
+            "No verification windows provided; verifying on random inputs only."
+        )
+        rng = np.random.default_rng(0)
+        windows = rng.standard_normal(
+            (num_verify_windows, cfg.input_len, cfg.num_nodes, cfg.num_features)
+        ).astype(np.float32)
+
+    out_file = out_path / "model.onnx"
+    wrapper = export_static_graph_onnx(
+        pt_model, out_file, cfg, adjacency=adjacency, example=windows
+    )
+    verify_onnx_against_torch(wrapper, out_file, list(windows), cfg)
+
+    with torch.no_grad():
+        y = wrapper(torch.from_numpy(np.asarray(windows[:1], dtype=np.float32)))
+
+    inputs = [
+        {
+            "name": cfg.input_name,
+            "dtype": "float32",
+            "shape": [-1, cfg.input_len, cfg.num_nodes, cfg.num_features],
+        }
+    ]
+    outputs = [
+        {"name": cfg.output_name, "dtype": "float32", "shape": [-1, *y.shape[1:]]}
+    ]
+    return inputs, outputs
+
+
 def _detect_flavor(model_uri: str) -> str:
     local_path = mlflow.artifacts.download_artifacts(artifact_uri=model_uri)
     mlmodel_path = Path(local_path) / "MLmodel"
@@ -338,6 +408,31 @@ def promote_and_export(
     clean_version_dir: bool = typer.Option(
         True, help="If true, delete existing version dir before exporting."
     ),
+    static_graph: bool = typer.Option(
+        False,
+        help="Torch only: fixed node count, baked-in adjacency, stacked horizon.",
+    ),
+    num_nodes: Optional[int] = typer.Option(None, help="Static graph: node count."),
+    input_len: Optional[int] = typer.Option(
+        None, help="Static graph: input window length."
+    ),
+    num_features: int = typer.Option(1, help="Static graph: input features."),
+    horizon: int = typer.Option(12, help="Static graph: forecast horizon."),
+    autoregressive: bool = typer.Option(
+        False, help="Static graph: unroll a one-step model over the horizon."
+    ),
+    adjacency_path: Optional[Path] = typer.Option(
+        None, help="Static graph: [N, N] adjacency (.npy/.npz) to bake in."
+    ),
+    adjacency_format: str = typer.Option(
+        "dense", help="Static graph: adjacency initializer format (dense|sparse)."
+    ),
+    verify_windows: Optional[Path] = typer.Option(
+        None, help="Static graph: [K, T, N, F] .npy of real windows for verification."
+    ),
+    num_verify_windows: int = typer.Option(
+        8, help="Static graph: number of windows to verify against torch."
+    ),
 ) -> None:
     """
     Export to Triton model repository and then promote via MLflow aliasing.
@@ -373,6 +468,28 @@ def promote_and_export(
 
     if flavor == "sklearn":
         _export_sklearn_to_onnx(model_uri, export_path, inputs)
+    elif flavor == "pytorch" and static_graph:
+        if num_nodes is None or input_len is None:
+            raise RuntimeError("--static-graph requires --num-nodes and --input-len.")
+        if adjacency_format not in ("dense", "sparse"):
+            raise RuntimeError(f"Unsupported adjacency format: {adjacency_format}")
+        static_cfg = StaticGraphExportConfig(
+            num_nodes=num_nodes,
+            input_len=input_len,
+            num_features=num_features,
+            horizon=horizon,
+            autoregressive=autoregressive,
+            adjacency_format=adjacency_format,
+            input_name=inputs[0]["name"] if inputs else "input",
+        )
+        inputs, outputs = _export_torch_static_graph_to_onnx(
+            model_uri,
+            export_path,
+            static_cfg,
+            adjacency_path=adjacency_path,
+            verify_windows_path=verify_windows,
+            num_verify_windows=num_verify_windows,
+        )
     elif flavor == "pytorch":
         _export_torch_to_onnx(model_uri, export_path, inputs)
     else:
@@ -412,6 +529,7 @@ def promote_and_export(
         "platform": platform,
         "max_batch_size": max_bs,
         "flavor": flavor,
+        "static_graph": static_graph,
         "model_uri": model_uri,
     }
     _write_history(output_dir, triton_name, history_entry)
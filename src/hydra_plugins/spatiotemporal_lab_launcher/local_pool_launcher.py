@@ -0,0 +1,265 @@
+"""Hydra launcher that runs sweep trials concurrently in a local process pool.
+
+Select it with ``hydra/launcher=local_pool``. Each worker process runs one trial
+at a time, pinned to its own disjoint set of CPUs with a matching torch/OpenMP
+thread count, so concurrent trials do not oversubscribe cores. All trials are
+submitted up front: a trial that finishes early (e.g. early stopping) frees its
+worker and CPU slot for the next pending trial immediately.
+
+Before launching, the parent builds the datamodule of the first trial once and
+calls ``prepare_data()``, so shared artifacts (normalization stats cache, the
+shared decode cache for compressed sources) exist before workers start and stay
+alive for the whole sweep. Trials then memory-map the same read-only data and
+share it through the OS page cache.
+"""
+
+# No `from __future__ import annotations`: Hydra executes plugin modules without
+# registering them in sys.modules, which string annotations on dataclasses need.
+import importlib
+import logging
+import multiprocessing as mp
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, List, Optional, Sequence
+
+from hydra.core.config_store import ConfigStore
+from hydra.core.hydra_config import HydraConfig
+from hydra.core.singleton import Singleton
+from hydra.core.utils import (
+    JobReturn,
+    configure_log,
+    filter_overrides,
+    run_job,
+    setup_globals,
+)
+from hydra.plugins.launcher import Launcher
+from hydra.types import HydraContext, TaskFunction
+from omegaconf import DictConfig, open_dict
+
+log = logging.getLogger(__name__)
+
+_THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+@dataclass
+class LocalPoolLauncherConf:
+    _target_: str = (
+        "hydra_plugins.spatiotemporal_lab_launcher.local_pool_launcher."
+        "LocalPoolLauncher"
+    )
+    # Concurrent trials.
+    n_jobs: int = 2
+    # CPUs (and torch threads) per trial; null splits the available CPUs evenly.
+    threads_per_trial: Optional[int] = None
+    # Pin each trial to its CPU slot with sched_setaffinity (Linux only).
+    pin_cpus: bool = True
+    start_method: str = "spawn"
+    # Fresh worker process per trial, so no state leaks between trials.
+    max_tasks_per_child: Optional[int] = 1
+    # Run datamodule.prepare_data() once in the parent before launching.
+    prepare_data: bool = True
+
+
+ConfigStore.instance().store(
+    group="hydra/launcher", name="local_pool", node=LocalPoolLauncherConf
+)
+
+
+@dataclass(frozen=True)
+class _TaskRef:
+    """Picklable reference to the (possibly ``@hydra.main``-decorated) task function."""
+
+    module: str
+    qualname: str
+
+    @classmethod
+    def of(cls, fn: TaskFunction) -> "_TaskRef":
+        module = fn.__module__
+        if module == "__main__":
+            spec = getattr(sys.modules["__main__"], "__spec__", None)
+            if spec is None:
+                raise RuntimeError(
+                    "local_pool launcher needs the entrypoint run as a module "
+                    "(python -m ...), not as a script path."
+                )
+            module = spec.name
+        return cls(module, fn.__qualname__)
+
+    def resolve(self) -> TaskFunction:
+        obj: Any = importlib.import_module(self.module)
+        for part in self.qualname.split("."):
+            obj = getattr(obj, part)
+        # The module attribute is the @hydra.main wrapper; run the task itself.
+        return getattr(obj, "__wrapped__", obj)
+
+
+def _cpu_slots(n_jobs: int, threads_per_trial: Optional[int]) -> List[List[int]]:
+    if hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    else:
+        cpus = list(range(os.cpu_count() or 1))
+    per = threads_per_trial or max(1, len(cpus) // n_jobs)
+    slots = [cpus[i * per : (i + 1) * per] for i in range(n_jobs)]
+    # More slots than CPUs: wrap around rather than leave slots empty.
+    return [s or cpus[(i * per) % len(cpus) :][:per] for i, s in enumerate(slots)]
+
+
+def _pin(cpus: List[int], pin_cpus: bool) -> None:
+    if pin_cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    for var in _THREAD_ENV_VARS:
+        os.environ[var] = str(len(cpus))
+
+    import torch
+
+    torch.set_num_threads(len(cpus))
+
+
+def _execute_job(
+    idx: int,
+    overrides: Sequence[str],
+    hydra_context: HydraContext,
+    config: DictConfig,
+    task_ref: _TaskRef,
+    singleton_state: Any,
+    slots: Any,
+    pin_cpus: bool,
+) -> JobReturn:
+    Singleton.set_state(singleton_state)
+    # Resolvers were not shipped (closures do not pickle); re-register Hydra's.
+    setup_globals()
+
+    cpus = slots.get()
+    try:
+        _pin(cpus, pin_cpus)
+        sweep_config = hydra_context.config_loader.load_sweep_config(
+            config, list(overrides)
+        )
+        with open_dict(sweep_config):
+            sweep_config.hydra.job.id = f"{idx}"
+            sweep_config.hydra.job.num = idx
+        HydraConfig.instance().set_config(sweep_config)
+        ret = run_job(
+            hydra_context=hydra_context,
+            task_function=task_ref.resolve(),
+            config=sweep_config,
+            job_dir_key="hydra.sweep.dir",
+            job_subdir_key="hydra.sweep.subdir",
+        )
+        # The hydra node references this plugin's config class, which Hydra's
+        # plugin scan loads a second time in the worker, so it cannot be
+        # pickled back; the per-job hydra config is saved in the job dir.
+        ret.hydra_cfg = None
+        return ret
+    finally:
+        slots.put(cpus)
+
+
+class LocalPoolLauncher(Launcher):
+    def __init__(
+        self,
+        n_jobs: int = 2,
+        threads_per_trial: Optional[int] = None,
+        pin_cpus: bool = True,
+        start_method: str = "spawn",
+        max_tasks_per_child: Optional[int] = 1,
+        prepare_data: bool = True,
+    ) -> None:
+        self.n_jobs = max(1, int(n_jobs))
+        self.threads_per_trial = threads_per_trial
+        self.pin_cpus = pin_cpus
+        self.start_method = start_method
+        self.max_tasks_per_child = max_tasks_per_child
+        self.prepare_data = prepare_data
+        self.config: Optional[DictConfig] = None
+        self.task_function: Optional[TaskFunction] = None
+        self.hydra_context: Optional[HydraContext] = None
+
+    def setup(
+        self,
+        *,
+        hydra_context: HydraContext,
+        task_function: TaskFunction,
+        config: DictConfig,
+    ) -> None:
+        self.config = config
+        self.hydra_context = hydra_context
+        self.task_function = task_function
+
+    def _prepare_shared_data(self, overrides: Sequence[str]) -> Any:
+        assert self.hydra_context is not None and self.config is not None
+        from spatiotemporal_lab.data.factory import build_datamodule
+
+        sweep_config = self.hydra_context.config_loader.load_sweep_config(
+            self.config, list(overrides)
+        )
+        HydraConfig.instance().set_config(sweep_config)
+        datamodule = build_datamodule(sweep_config)
+        datamodule.prepare_data()
+        return datamodule
+
+    def launch(
+        self, job_overrides: Sequence[Sequence[str]], initial_job_idx: int
+    ) -> Sequence[JobReturn]:
+        setup_globals()
+        assert self.hydra_context is not None
+        assert self.config is not None
+        assert self.task_function is not None
+
+        configure_log(self.config.hydra.hydra_logging, self.config.hydra.verbose)
+        Path(str(self.config.hydra.sweep.dir)).mkdir(parents=True, exist_ok=True)
+        if not job_overrides:
+            return []
+
+        # Held until all trials finish: keeps the shared decode cache attached
+        # so trials never rebuild it between each other.
+        shared_data = (
+            self._prepare_shared_data(job_overrides[0]) if self.prepare_data else None
+        )
+
+        n_workers = min(self.n_jobs, len(job_overrides))
+        cpu_slots = _cpu_slots(n_workers, self.threads_per_trial)
+        log.info(
+            f"Launching {len(job_overrides)} jobs on {n_workers} worker(s), "
+            f"{len(cpu_slots[0])} CPU(s) each"
+        )
+
+        ctx = mp.get_context(self.start_method)
+        task_ref = _TaskRef.of(self.task_function)
+        singleton_state = {**Singleton.get_state(), "omegaconf_resolvers": {}}
+        with ctx.Manager() as manager:
+            slots = manager.Queue()
+            for slot in cpu_slots:
+                slots.put(slot)
+
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=ctx,
+                max_tasks_per_child=self.max_tasks_per_child,
+            ) as pool:
+                futures = []
+                for i, overrides in enumerate(job_overrides):
+                    idx = initial_job_idx + i
+                    lst = " ".join(filter_overrides(overrides))
+                    log.info(f"\t#{idx} : {lst}")
+                    futures.append(
+                        pool.submit(
+                            _execute_job,
+                            idx,
+                            list(overrides),
+                            self.hydra_context,
+                            self.config,
+                            task_ref,
+                            singleton_state,
+                            slots,
+                            self.pin_cpus,
+                        )
+                    )
+                runs = [f.result() for f in futures]
+        del shared_data
+
+        configure_log(self.config.hydra.hydra_logging, self.config.hydra.verbose)
+        return runs
@@ -2,6 +2,9 @@
 
 This is the canonical, reproducible training runner.
 Notebooks should call into this (or import its components), not re-implement it.
+
+Only Hydra is imported at module level; torch, Lightning and MLflow are imported
+once a run actually starts, so `--help`, `--cfg` and config errors stay fast.
 """
 
 from __future__ import annotations
@@ -13,17 +16,6 @@ from hydra.core.hydra_config import HydraConfig
 from loguru import logger
 from omegaconf import DictConfig
 
-from spatiotemporal_lab.data.factory import build_datamodule
-from spatiotemporal_lab.evaluation.evaluate import maybe_run_offline_eval
-from spatiotemporal_lab.integrations.mlflow import (
-    log_resolved_config,
-    maybe_init_mlflow,
-    set_standard_tags,
-)
-from spatiotemporal_lab.models.factory import build_lightning_module
-from spatiotemporal_lab.training.loops import fit
-from spatiotemporal_lab.utils.seed import seed_everything
-
 
 @hydra.main(
     version_base=None,
@@ -31,6 +23,14 @@ from spatiotemporal_lab.utils.seed import seed_everything
     config_name="config",
 )
 def main(cfg: DictConfig) -> None:
+    from spatiotemporal_lab.integrations.mlflow import (
+        log_profiling_artifacts,
+        log_resolved_config,
+        maybe_init_mlflow,
+        set_standard_tags,
+    )
+    from spatiotemporal_lab.utils.seed import seed_everything
+
     logger.info("Project: {} (env={})", cfg.project.name, cfg.project.env)
     logger.info("Model:   {}", cfg.model.name)
     logger.info("Data:    {}", cfg.data.name)
@@ -41,17 +41,21 @@ def main(cfg: DictConfig) -> None:
     run_dir = Path(HydraConfig.get().runtime.output_dir)
     logger.info("Run dir: {}", run_dir)
 
-    mlflow_ctx = maybe_init_mlflow(cfg)
-    if mlflow_ctx is not None:
-        with mlflow_ctx:
+    with maybe_init_mlflow(cfg) as run:
+        if run is not None:
             set_standard_tags(cfg)
             log_resolved_config(cfg, artifact_path="config")
-            _run_training(cfg)
-    else:
         _run_training(cfg)
+        if run is not None:
+            log_profiling_artifacts(cfg, artifact_path="profiling")
 
 
 def _run_training(cfg: DictConfig) -> None:
+    from spatiotemporal_lab.data.factory import build_datamodule
+    from spatiotemporal_lab.evaluation.evaluate import maybe_run_offline_eval
+    from spatiotemporal_lab.models.factory import build_lightning_module
+    from spatiotemporal_lab.training.loops import fit
+
     dm = build_datamodule(cfg)
     lm = build_lightning_module(cfg)
 
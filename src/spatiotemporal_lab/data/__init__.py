@@ -1 +1,37 @@
-# Package marker
+# Package marker; public names resolve lazily (torch/Lightning load on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "build_datamodule": "factory",
+        "DataModuleConfig": "datamodule",
+        "RandomDataModule": "datamodule",
+        "WindowDataModule": "datamodule",
+        "RandomClassificationDataset": "datasets",
+        "RandomDatasetConfig": "datasets",
+        "WindowDataset": "datasets",
+        "WindowDatasetConfig": "datasets",
+        "open_series": "datasets",
+        "FeatureConfig": "features",
+        "TemporalFeatures": "features",
+        "load_or_build_features": "features",
+        "ImportanceConfig": "importance",
+        "ImportanceSampler": "importance",
+        "ImportanceUpdateCallback": "importance",
+        "SumTree": "importance",
+        "NormStats": "normalization",
+        "load_or_compute_norm_stats": "normalization",
+        "PrefetchMetricsCallback": "prefetch",
+        "RingPrefetcher": "prefetch",
+        "WindowSampler": "samplers",
+        "SharedArray": "shm_cache",
+        "shared_array": "shm_cache",
+        "ValidityConfig": "validity",
+        "ValidityIndex": "validity",
+        "load_or_build_validity": "validity",
+        "Split": "splits",
+        "chronological_split_indices": "splits",
+        "random_split_indices": "splits",
+    },
+)
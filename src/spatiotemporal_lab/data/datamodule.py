@@ -1,14 +1,37 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Optional
+from pathlib import Path
+from typing import Callable, Optional, Union
 
+import numpy as np
 import pytorch_lightning as pl
-from torch.utils.data import DataLoader, Subset
+from loguru import logger
+from torch.utils.data import DataLoader, Sampler
 
-from spatiotemporal_lab.data.datasets import RandomClassificationDataset, RandomDatasetConfig
-from spatiotemporal_lab.data.splits import random_split_indices
+from spatiotemporal_lab.data.datasets import (
+    RandomClassificationDataset,
+    RandomDatasetConfig,
+    WindowDataset,
+    WindowDatasetConfig,
+    open_series,
+)
+from spatiotemporal_lab.data.features import FeatureConfig, load_or_build_features
+from spatiotemporal_lab.data.importance import ImportanceConfig, ImportanceSampler
+from spatiotemporal_lab.data.normalization import load_or_compute_norm_stats
+from spatiotemporal_lab.data.prefetch import RingPrefetcher
+from spatiotemporal_lab.data.samplers import WindowSampler
+from spatiotemporal_lab.data.splits import (
+    Split,
+    chronological_split_indices,
+    random_split_indices,
+)
 from spatiotemporal_lab.data.transforms import Identity
+from spatiotemporal_lab.data.validity import (
+    ValidityConfig,
+    ValidityIndex,
+    load_or_build_validity,
+)
 
 
 @dataclass(frozen=True)
@@ -20,21 +43,98 @@ class DataModuleConfig:
     seed: int = 42
     val_frac: float = 0.1
     test_frac: float = 0.1
+    shuffle: bool = True
+    drop_last: bool = False
+    # Background-thread gather into a ring of reusable (pinned) batch buffers,
+    # used instead of DataLoader workers for datasets with `gather_into`.
+    prefetch: bool = False
+    prefetch_ring_size: int = 4
+    # Loss-driven train sampling (see `importance`); None keeps uniform shuffle.
+    importance: Optional[ImportanceConfig] = None
 
 
-class RandomDataModule(pl.LightningDataModule):
+class _IndexedDataModule(pl.LightningDataModule):
+    """Shared loader plumbing: one dataset, split into index sets."""
+
+    def __init__(self, dm_cfg: DataModuleConfig):
+        super().__init__()
+        self.dm_cfg = dm_cfg
+        self._dataset = None
+        self._split: Optional[Split] = None
+        self._train_weights: Optional[np.ndarray] = None
+        self._importance_sampler: Optional[ImportanceSampler] = None
+
+    def _loader(
+        self, indices: np.ndarray, shuffle: bool, weights: Optional[np.ndarray] = None
+    ) -> Union[DataLoader, RingPrefetcher]:
+        # The sampler shards indices across DDP ranks itself, so the Trainer
+        # runs with use_distributed_sampler=False.
+        sampler = WindowSampler(
+            indices,
+            shuffle=shuffle,
+            seed=self.dm_cfg.seed,
+            drop_last=self.dm_cfg.drop_last,
+            weights=weights,
+        )
+        return self._wrap(sampler)
+
+    def _wrap(self, sampler: Sampler[int]) -> Union[DataLoader, RingPrefetcher]:
+        assert self._dataset is not None
+        if self.dm_cfg.prefetch and hasattr(self._dataset, "gather_into"):
+            return RingPrefetcher(
+                self._dataset,
+                sampler,
+                batch_size=self.dm_cfg.batch_size,
+                ring_size=self.dm_cfg.prefetch_ring_size,
+                pin_memory=self.dm_cfg.pin_memory,
+            )
+        return DataLoader(
+            self._dataset,
+            batch_size=self.dm_cfg.batch_size,
+            sampler=sampler,
+            num_workers=self.dm_cfg.num_workers,
+            pin_memory=self.dm_cfg.pin_memory,
+            persistent_workers=self.dm_cfg.persistent_workers
+            and self.dm_cfg.num_workers > 0,
+        )
+
+    def train_dataloader(self):
+        assert self._split is not None
+        if self.dm_cfg.importance is not None:
+            # Kept across dataloader reloads: it carries the learned priorities.
+            if self._importance_sampler is None:
+                self._importance_sampler = ImportanceSampler(
+                    self._split.train_idx,
+                    self.dm_cfg.importance,
+                    seed=self.dm_cfg.seed,
+                    base_weights=self._train_weights,
+                )
+            return self._wrap(self._importance_sampler)
+        return self._loader(
+            self._split.train_idx,
+            shuffle=self.dm_cfg.shuffle,
+            weights=self._train_weights,
+        )
+
+    def val_dataloader(self):
+        assert self._split is not None
+        return self._loader(self._split.val_idx, shuffle=False)
+
+    def test_dataloader(self):
+        assert self._split is not None
+        return self._loader(self._split.test_idx, shuffle=False)
+
+
+class RandomDataModule(_IndexedDataModule):
     def __init__(
         self,
         ds_cfg: RandomDatasetConfig,
         dm_cfg: DataModuleConfig,
         transform: Optional[Callable] = None,
     ):
-        super().__init__()
+        super().__init__(dm_cfg)
         self.ds_cfg = ds_cfg
-        self.dm_cfg = dm_cfg
         self.transform = transform or Identity()
-        self._dataset = None
-        self._split = None
 
     def setup(self, stage: Optional[str] = None) -> None:
         self._dataset = RandomClassificationDataset(
@@ -47,35 +147,137 @@ class RandomDataModule(pl.LightningDataModule):
             test_frac=self.dm_cfg.test_frac,
         )
 
-    def train_dataloader(self):
-        assert self._dataset is not None and self._split is not None
-        return DataLoader(
-            Subset(self._dataset, self._split.train_idx),
-            batch_size=self.dm_cfg.batch_size,
-            shuffle=True,
-            num_workers=self.dm_cfg.num_workers,
-            pin_memory=self.dm_cfg.pin_memory,
-            persistent_workers=self.dm_cfg.persistent_workers,
+
+class WindowDataModule(_IndexedDataModule):
+    """Sliding-window forecasting over a `[T, N, C]` series (see `open_series`).
+
+    Splits are chronological. Normalization stats are computed on the train
+    range only and cached next to the data file, so every run after the first
+    (including concurrent sweep trials) just loads them. Temporal features
+    (`feature_cfg`) are materialized the same way (see `features`), as is the
+    validity index (`validity_cfg`) that drops or down-weights windows that
+    fall mostly in sensor outages (see `validity`).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ds_cfg: WindowDatasetConfig,
+        dm_cfg: DataModuleConfig,
+        normalize: bool = True,
+        transform: Optional[Callable] = None,
+        key: Optional[str] = None,
+        cache_dir: Optional[Path] = None,
+        chunk_steps: int = 4096,
+        feature_cfg: Optional[FeatureConfig] = None,
+        validity_cfg: Optional[ValidityConfig] = None,
+    ):
+        super().__init__(dm_cfg)
+        self.path = Path(path)
+        self.ds_cfg = ds_cfg
+        self.normalize = normalize
+        self.transform = transform or Identity()
+        self.key = key
+        self.cache_dir = cache_dir
+        self.chunk_steps = chunk_steps
+        self.feature_cfg = feature_cfg
+        self.validity_cfg = validity_cfg
+        self._series = None
+
+    def _open(self):
+        # Kept open for the module's lifetime: for containers this holds a
+        # reference on the shared decode cache, so later attaches are free.
+        if self._series is None:
+            self._series = open_series(
+                self.path,
+                key=self.key,
+                cache_dir=self.cache_dir,
+                chunk_steps=self.chunk_steps,
+            )
+        return self._series
+
+    def _split_and_train_end(self, n_steps: int):
+        n_windows = max(0, n_steps - self.ds_cfg.input_len - self.ds_cfg.horizon + 1)
+        split = chronological_split_indices(
+            n_windows, val_frac=self.dm_cfg.val_frac, test_frac=self.dm_cfg.test_frac
+        )
+        # Last time step visible to any training window (inputs and targets).
+        train_end = (
+            len(split.train_idx) + self.ds_cfg.input_len + self.ds_cfg.horizon - 1
         )
+        return split, min(train_end, n_steps)
 
-    def val_dataloader(self):
-        assert self._dataset is not None and self._split is not None
-        return DataLoader(
-            Subset(self._dataset, self._split.val_idx),
-            batch_size=self.dm_cfg.batch_size,
-            shuffle=False,
-            num_workers=self.dm_cfg.num_workers,
-            pin_memory=self.dm_cfg.pin_memory,
-            persistent_workers=self.dm_cfg.persistent_workers,
+    def prepare_data(self) -> None:
+        series = self._open()
+        if self.normalize:
+            _, train_end = self._split_and_train_end(series.shape[0])
+            load_or_compute_norm_stats(self.path, series, train_end, self.key)
+        if self.feature_cfg is not None:
+            load_or_build_features(self.path, series, self.feature_cfg, self.key)
+        if self.validity_cfg is not None:
+            self._validity(series)
+
+    def _validity(self, series) -> ValidityIndex:
+        assert self.validity_cfg is not None
+        return load_or_build_validity(
+            self.path,
+            series,
+            null_value=self.validity_cfg.null_value,
+            chunk_steps=self.validity_cfg.chunk_steps,
+            key=self.key,
         )
 
-    def test_dataloader(self):
-        assert self._dataset is not None and self._split is not None
-        return DataLoader(
-            Subset(self._dataset, self._split.test_idx),
-            batch_size=self.dm_cfg.batch_size,
-            shuffle=False,
-            num_workers=self.dm_cfg.num_workers,
-            pin_memory=self.dm_cfg.pin_memory,
-            persistent_workers=self.dm_cfg.persistent_workers,
+    def _apply_validity(self, split: Split, validity: ValidityIndex) -> Split:
+        cfg = self.validity_cfg
+        assert cfg is not None
+        missing = validity.window_missing(self.ds_cfg.input_len, self.ds_cfg.horizon)
+
+        def keep(idx: np.ndarray) -> np.ndarray:
+            return idx[missing[idx] <= cfg.max_missing]
+
+        train = split.train_idx
+        n_gap = int((missing[train] > cfg.max_missing).sum())
+        logger.info(
+            "Validity ({}): {}/{} train windows more than {:.0%} missing.",
+            cfg.mode,
+            n_gap,
+            len(train),
+            cfg.max_missing,
+        )
+        if cfg.mode == "weight":
+            self._train_weights = np.where(
+                missing[train] <= cfg.max_missing, 1.0 - missing[train], 0.0
+            )
+        else:
+            train = keep(train)
+        if cfg.filter_eval:
+            return Split(train, keep(split.val_idx), keep(split.test_idx))
+        return Split(train, split.val_idx, split.test_idx)
+
+    def setup(self, stage: Optional[str] = None) -> None:
+        series = self._open()
+        self._split, train_end = self._split_and_train_end(series.shape[0])
+        stats = (
+            load_or_compute_norm_stats(self.path, series, train_end, self.key)
+            if self.normalize
+            else None
+        )
+        features = (
+            load_or_build_features(self.path, series, self.feature_cfg, self.key)
+            if self.feature_cfg is not None
+            else None
+        )
+        validity = None
+        if self.validity_cfg is not None:
+            validity = self._validity(series)
+            self._split = self._apply_validity(self._split, validity)
+        self._dataset = WindowDataset(
+            series,
+            self.ds_cfg,
+            stats=stats,
+            transform=self.transform,
+            features=features,
+            validity=validity,
+            mask_targets=self.validity_cfg is not None
+            and self.validity_cfg.mask_targets,
         )
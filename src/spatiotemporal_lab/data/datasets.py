@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from spatiotemporal_lab.data.features import TemporalFeatures
+from spatiotemporal_lab.data.normalization import NormStats
+from spatiotemporal_lab.data.shm_cache import SharedArray, shared_array
+from spatiotemporal_lab.data.transforms import Identity
+from spatiotemporal_lab.data.validity import ValidityIndex
+
+
+def _transform_in_place(transform: Optional[Callable], x: torch.Tensor) -> None:
+    if transform is not None and not isinstance(transform, Identity):
+        x.copy_(transform(x))
+
+
+@dataclass(frozen=True)
+class RandomDatasetConfig:
+    n_samples: int = 1024
+    n_features: int = 32
+    n_classes: int = 2
+
+
+class RandomClassificationDataset(Dataset):
+    def __init__(
+        self,
+        cfg: RandomDatasetConfig,
+        transform: Optional[Callable] = None,
+        seed: int = 42,
+    ):
+        g = torch.Generator().manual_seed(seed)
+        self.x = torch.randn(cfg.n_samples, cfg.n_features, generator=g)
+        self.y = torch.randint(0, cfg.n_classes, (cfg.n_samples,), generator=g)
+        self.transform = transform
+
+    def __len__(self) -> int:
+        return self.x.shape[0]
+
+    def __getitem__(self, idx: int):
+        x = self.x[idx]
+        if self.transform is not None:
+            x = self.transform(x)
+        return x, self.y[idx]
+
+    def sample_spec(self):
+        return [(tuple(self.x.shape[1:]), self.x.dtype), ((), self.y.dtype)]
+
+    def gather_into(self, indices: np.ndarray, out: Sequence[torch.Tensor]) -> None:
+        """Batched `__getitem__` into preallocated buffers (see `RingPrefetcher`)."""
+        n = len(indices)
+        idx = torch.from_numpy(indices)
+        torch.index_select(self.x, 0, idx, out=out[0][:n])
+        torch.index_select(self.y, 0, idx, out=out[1][:n])
+        _transform_in_place(self.transform, out[0][:n])
+
+
+@dataclass(frozen=True)
+class WindowDatasetConfig:
+    input_len: int = 12
+    horizon: int = 12
+
+
+def open_series(
+    path: Path,
+    key: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    chunk_steps: int = 4096,
+) -> Union[np.ndarray, SharedArray]:
+    """Open a `[T, N]` / `[T, N, C]` series read-only, as `[T, N, C]`.
+
+    `.npy` files are memory-mapped directly. Containers that cannot be mapped
+    (`.npz`, HDF5, Zarr; `key` selects the array) are decoded once into the
+    host-wide shared cache (see `shm_cache`). Either way pages are shared by
+    every process reading the same source (DataLoader workers, sweep trials).
+    """
+    path = Path(path)
+    if path.suffix.lower() != ".npy":
+        return shared_array(path, key=key, cache_dir=cache_dir, chunk_steps=chunk_steps)
+
+    series = np.load(path, mmap_mode="r")
+    if series.ndim == 2:
+        series = series[..., None]
+    if series.ndim != 3:
+        raise ValueError(f"Expected [T, N] or [T, N, C] series, got {series.shape}")
+    return series
+
+
+class WindowDataset(Dataset):
+    """Sliding windows over a `[T, N, C]` series; index `i` is the window start.
+
+    `series` is anything `open_series` returns (memmap or `SharedArray`).
+
+    Returns `(x, y)` with `x = series[i : i + input_len]` (normalized when
+    `stats` is given) and `y` the following `horizon` steps in original units.
+    With precomputed `features`, `x` gets their channels appended: node
+    features (z-scaled like the series) then calendar encodings, giving
+    `[input_len, N, C + features.num_channels]`.
+    With `validity` and `mask_targets`, missing target readings are NaN so
+    the `masked_*` metrics skip them.
+    """
+
+    def __init__(
+        self,
+        series: np.ndarray,
+        cfg: WindowDatasetConfig,
+        stats: Optional[NormStats] = None,
+        transform: Optional[Callable] = None,
+        features: Optional[TemporalFeatures] = None,
+        validity: Optional[ValidityIndex] = None,
+        mask_targets: bool = False,
+    ):
+        self.series = series
+        self.cfg = cfg
+        self.stats = stats
+        self.transform = transform
+        self.features = features
+        self.validity = validity
+        self.mask_targets = mask_targets and validity is not None
+        self._node_affine = (
+            features.node_affine(stats)
+            if features is not None and features.node is not None and stats is not None
+            else None
+        )
+
+    def __len__(self) -> int:
+        return max(0, self.series.shape[0] - self.cfg.input_len - self.cfg.horizon + 1)
+
+    def sample_spec(self):
+        _, n, c = self.series.shape
+        extra = 0 if self.features is None else self.features.num_channels
+        return [
+            ((self.cfg.input_len, n, c + extra), torch.float32),
+            ((self.cfg.horizon, n, c), torch.float32),
+        ]
+
+    def _write(self, x: np.ndarray, y: np.ndarray, start: int) -> None:
+        t_in, t_out = self.cfg.input_len, self.cfg.horizon
+        c = self.series.shape[2]
+        mid = start + t_in
+        np.copyto(x[..., :c], self.series[start:mid], casting="unsafe")
+        np.copyto(y, self.series[mid : mid + t_out], casting="unsafe")
+        if self.mask_targets:
+            y[~self.validity.valid(mid, mid + t_out)] = np.nan
+        feats = self.features
+        if feats is None:
+            return
+        if feats.node is not None:
+            c_node = c + feats.node.shape[2]
+            np.copyto(x[..., c:c_node], feats.node[start:mid], casting="unsafe")
+            c = c_node
+        if feats.calendar is not None:
+            x[..., c:] = feats.calendar[start:mid, None, :]
+
+    def _normalize(self, x: np.ndarray) -> None:
+        # In place on `[..., N, C + F]`; calendar channels stay as they are.
+        if self.stats is None:
+            return
+        c = self.series.shape[2]
+        np.subtract(x[..., :c], self.stats.mean, out=x[..., :c])
+        np.divide(x[..., :c], self.stats.std, out=x[..., :c])
+        if self._node_affine is not None:
+            shift, scale = self._node_affine
+            node = x[..., c : c + shift.shape[-1]]
+            np.subtract(node, shift, out=node)
+            np.divide(node, scale, out=node)
+
+    def __getitem__(self, idx: int):
+        (x_shape, _), (y_shape, _) = self.sample_spec()
+        x = np.empty(x_shape, dtype=np.float32)
+        y = np.empty(y_shape, dtype=np.float32)
+        self._write(x, y, idx)
+        self._normalize(x)
+        x = torch.from_numpy(x)
+        if self.transform is not None:
+            x = self.transform(x)
+        return x, torch.from_numpy(y)
+
+    def gather_into(self, indices: np.ndarray, out: Sequence[torch.Tensor]) -> None:
+        """Batched `__getitem__` into preallocated buffers (see `RingPrefetcher`).
+
+        Windows are copied straight from the series into the buffers and
+        normalized in place; nothing is allocated per batch.
+        """
+        n = len(indices)
+        xs, ys = out[0][:n].numpy(), out[1][:n].numpy()
+        for row, start in enumerate(indices.tolist()):
+            self._write(xs[row], ys[row], start)
+        self._normalize(xs)
+        _transform_in_place(self.transform, out[0][:n])
@@ -1,18 +1,35 @@
 from __future__ import annotations
 
+from pathlib import Path
+from typing import Union
+
 from omegaconf import DictConfig
 
-from spatiotemporal_lab.data.datamodule import DataModuleConfig, RandomDataModule
-from spatiotemporal_lab.data.datasets import RandomDatasetConfig
+from spatiotemporal_lab.data.datamodule import (
+    DataModuleConfig,
+    RandomDataModule,
+    WindowDataModule,
+)
+from spatiotemporal_lab.data.datasets import RandomDatasetConfig, WindowDatasetConfig
+from spatiotemporal_lab.data.features import FeatureConfig
+from spatiotemporal_lab.data.importance import ImportanceConfig
 from spatiotemporal_lab.data.transforms import Identity
+from spatiotemporal_lab.data.validity import ValidityConfig
 
+# Sliding-window series sources; all but npy go through the shared decode cache.
+_SERIES_FORMATS = ("npy", "npz", "hdf5", "zarr")
 
-def build_datamodule(cfg: DictConfig) -> RandomDataModule:
-    ds_cfg = RandomDatasetConfig(
-        n_samples=int(cfg.data.get("n_samples", 1024)),
-        n_features=int(cfg.data.get("n_features", 32)),
-        n_classes=int(cfg.data.get("n_classes", 2)),
-    )
+
+def build_datamodule(cfg: DictConfig) -> Union[RandomDataModule, WindowDataModule]:
+    prefetch_cfg = cfg.data.get("prefetch", None) or {}
+    sampler_cfg = cfg.data.get("sampler", None) or {}
+    importance = None
+    if str(sampler_cfg.get("name", "uniform")) == "importance":
+        importance = ImportanceConfig(
+            alpha=float(sampler_cfg.get("alpha", 0.6)),
+            eps=float(sampler_cfg.get("eps", 1e-3)),
+            uniform_frac=float(sampler_cfg.get("uniform_frac", 0.1)),
+        )
     dm_cfg = DataModuleConfig(
         batch_size=int(cfg.data.get("batch_size", 64)),
         num_workers=int(cfg.data.get("num_workers", 0)),
@@ -21,6 +38,72 @@ def build_datamodule(cfg: DictConfig) -> RandomDataModule:
         seed=int(cfg.get("seed", 42)),
         val_frac=float(cfg.data.get("val_frac", 0.1)),
         test_frac=float(cfg.data.get("test_frac", 0.1)),
+        shuffle=bool(cfg.data.get("shuffle", True)),
+        drop_last=bool(cfg.data.get("drop_last", False)),
+        prefetch=bool(prefetch_cfg.get("enabled", False)),
+        prefetch_ring_size=int(prefetch_cfg.get("ring_size", 4)),
+        importance=importance,
     )
     transform = Identity()
+
+    if cfg.data.get("format", None) in _SERIES_FORMATS:
+        window_cfg = cfg.data.get("window", None) or {}
+        norm_cfg = cfg.data.get("normalization", None) or {}
+        cache_cfg = cfg.data.get("shared_cache", None) or {}
+        cache_dir = cache_cfg.get("dir", None)
+        feat_cfg = cfg.data.get("features", None) or {}
+        rolling_cfg = feat_cfg.get("rolling", None) or {}
+        feature_cfg = (
+            FeatureConfig(
+                steps_per_day=int(feat_cfg.get("steps_per_day", 288)),
+                start=feat_cfg.get("start", None),
+                time_of_day=bool(feat_cfg.get("time_of_day", True)),
+                day_of_week=bool(feat_cfg.get("day_of_week", True)),
+                lags=tuple(int(k) for k in feat_cfg.get("lags", None) or ()),
+                rolling_windows=tuple(
+                    int(w) for w in rolling_cfg.get("windows", None) or ()
+                ),
+                rolling_stats=tuple(
+                    str(s) for s in rolling_cfg.get("stats", None) or ("mean", "std")
+                ),
+                chunk_steps=int(cache_cfg.get("chunk_steps", 4096)),
+            )
+            if bool(feat_cfg.get("enabled", False))
+            else None
+        )
+        ds_cfg = WindowDatasetConfig(
+            input_len=int(window_cfg.get("input_len", 12)),
+            horizon=int(window_cfg.get("horizon", 12)),
+        )
+        valid_cfg = cfg.data.get("validity", None) or {}
+        validity_cfg = (
+            ValidityConfig(
+                null_value=valid_cfg.get("null_value", 0.0),
+                max_missing=float(valid_cfg.get("max_missing", 0.5)),
+                mode=str(valid_cfg.get("mode", "filter")),
+                filter_eval=bool(valid_cfg.get("filter_eval", False)),
+                mask_targets=bool(valid_cfg.get("mask_targets", False)),
+                chunk_steps=int(cache_cfg.get("chunk_steps", 4096)),
+            )
+            if bool(valid_cfg.get("enabled", False))
+            else None
+        )
+        return WindowDataModule(
+            Path(str(cfg.data.path)),
+            ds_cfg,
+            dm_cfg,
+            normalize=bool(norm_cfg.get("enabled", True)),
+            transform=transform,
+            key=cfg.data.get("key", None),
+            cache_dir=Path(str(cache_dir)) if cache_dir else None,
+            chunk_steps=int(cache_cfg.get("chunk_steps", 4096)),
+            feature_cfg=feature_cfg,
+            validity_cfg=validity_cfg,
+        )
+
+    ds_cfg = RandomDatasetConfig(
+        n_samples=int(cfg.data.get("n_samples", 1024)),
+        n_features=int(cfg.data.get("n_features", 32)),
+        n_classes=int(cfg.data.get("n_classes", 2)),
+    )
     return RandomDataModule(ds_cfg, dm_cfg, transform=transform)
@@ -0,0 +1,223 @@
+"""Precomputed temporal features, aligned with the series and memory-mapped.
+
+Calendar encodings (time of day, day of week) and per-node lag / rolling
+statistics are materialized once into a directory next to the data file:
+
+- `calendar.npy`: `[T, F_cal]`, shared by all nodes.
+- `node.npy`: `[T, N, C * F_node]`, one block of `C` channels per feature.
+
+Windows then slice these arrays instead of recomputing features per sample.
+Values are stored in original units; `TemporalFeatures.node_affine` gives the
+shift/scale that puts node features on the same z-scale as the inputs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+from spatiotemporal_lab.data.normalization import NormStats
+
+_ROLLING_STATS = ("mean", "std")
+
+
+@dataclass(frozen=True)
+class FeatureConfig:
+    steps_per_day: int = 288
+    # Timestamp of step 0 (ISO 8601); null means midnight on a Monday.
+    start: Optional[str] = None
+    time_of_day: bool = True
+    day_of_week: bool = True
+    lags: Tuple[int, ...] = ()
+    rolling_windows: Tuple[int, ...] = ()
+    rolling_stats: Tuple[str, ...] = _ROLLING_STATS
+    chunk_steps: int = 4096
+
+
+@dataclass
+class TemporalFeatures:
+    calendar: Optional[np.ndarray]
+    node: Optional[np.ndarray]
+    calendar_names: List[str] = field(default_factory=list)
+    node_names: List[str] = field(default_factory=list)
+
+    @property
+    def num_channels(self) -> int:
+        """Feature channels appended to each `[N, C]` input step."""
+        n_cal = 0 if self.calendar is None else self.calendar.shape[1]
+        n_node = 0 if self.node is None else self.node.shape[2]
+        return n_cal + n_node
+
+    def node_affine(self, stats: NormStats) -> Tuple[np.ndarray, np.ndarray]:
+        """`(shift, scale)` of shape `[N, C * F_node]`; `(v - shift) / scale`.
+
+        Lags and rolling means are z-scored like the series; rolling stds are
+        only rescaled.
+        """
+        shifts, scales = [], []
+        for name in self.node_names:
+            shifts.append(
+                np.zeros_like(stats.mean) if name.endswith("_std") else stats.mean
+            )
+            scales.append(stats.std)
+        return (
+            np.concatenate(shifts, axis=-1).astype(np.float32),
+            np.concatenate(scales, axis=-1).astype(np.float32),
+        )
+
+
+def _node_feature_names(cfg: FeatureConfig) -> List[str]:
+    names = [f"lag_{k}" for k in cfg.lags]
+    for w in cfg.rolling_windows:
+        names += [f"roll{w}_{s}" for s in cfg.rolling_stats]
+    return names
+
+
+def calendar_features(
+    num_steps: int, cfg: FeatureConfig
+) -> Tuple[np.ndarray, List[str]]:
+    """`[T, F_cal]` float32: time of day as a fraction of the day in `[0, 1)`,
+    day of week as an index 0 (Monday) to 6, as LargeST models expect."""
+    start = datetime.fromisoformat(cfg.start) if cfg.start else datetime(2018, 1, 1)
+    seconds = start.hour * 3600 + start.minute * 60 + start.second
+    offset = seconds * cfg.steps_per_day // 86400
+    t = np.arange(num_steps, dtype=np.int64) + offset
+    cols, names = [], []
+    if cfg.time_of_day:
+        cols.append((t % cfg.steps_per_day) / cfg.steps_per_day)
+        names.append("time_of_day")
+    if cfg.day_of_week:
+        cols.append((t // cfg.steps_per_day + start.weekday()) % 7)
+        names.append("day_of_week")
+    if not cols:
+        return np.zeros((num_steps, 0), np.float32), names
+    return np.stack(cols, axis=1).astype(np.float32), names
+
+
+def _write_node_features(
+    series: np.ndarray, cfg: FeatureConfig, out: np.ndarray
+) -> None:
+    """Fill `out[T, N, C * F]` chunk by chunk.
+
+    Steps before the start of the series use edge padding for lags and a
+    shorter (expanding) window for rolling statistics. Rolling statistics skip
+    NaN readings and are NaN only where the whole window is missing.
+    """
+    num_steps, _, c = series.shape
+    back = max([*cfg.lags, *(w - 1 for w in cfg.rolling_windows), 0])
+    for a in range(0, num_steps, cfg.chunk_steps):
+        b = min(a + cfg.chunk_steps, num_steps)
+        base = max(0, a - back)
+        block = np.asarray(series[base:b], dtype=np.float64)
+        t = np.arange(a, b)
+        col = 0
+        for k in cfg.lags:
+            out[a:b, :, col : col + c] = block[np.maximum(t - k, 0) - base]
+            col += c
+        if cfg.rolling_windows:
+            finite = np.isfinite(block)
+            filled = np.where(finite, block, 0.0)
+            zero = np.zeros((1,) + block.shape[1:])
+            csum = np.concatenate([zero, np.cumsum(filled, axis=0)])
+            csq = np.concatenate([zero, np.cumsum(np.square(filled), axis=0)])
+            cnt = np.concatenate([zero, np.cumsum(finite, axis=0)])
+            for w in cfg.rolling_windows:
+                lo = np.maximum(t - w + 1, 0) - base
+                hi = t + 1 - base
+                count = cnt[hi] - cnt[lo]
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    mean = (csum[hi] - csum[lo]) / count
+                for s in cfg.rolling_stats:
+                    if s == "mean":
+                        out[a:b, :, col : col + c] = mean
+                    else:
+                        with np.errstate(invalid="ignore", divide="ignore"):
+                            var = (csq[hi] - csq[lo]) / count - np.square(mean)
+                        out[a:b, :, col : col + c] = np.sqrt(np.maximum(var, 0.0))
+                    col += c
+
+
+def features_cache_dir(
+    series_path: Path,
+    num_steps: int,
+    cfg: FeatureConfig,
+    key: Optional[str] = None,
+) -> Path:
+    st = Path(series_path).stat()
+    params = {k: v for k, v in asdict(cfg).items() if k != "chunk_steps"}
+    ident = json.dumps(
+        [params, num_steps, st.st_size, st.st_mtime_ns, key], sort_keys=True
+    )
+    digest = hashlib.sha1(ident.encode()).hexdigest()[:12]
+    return series_path.with_name(f"{series_path.stem}.features-{digest}")
+
+
+def _open(directory: Path) -> TemporalFeatures:
+    meta = json.loads((directory / "meta.json").read_text())
+    calendar = node = None
+    if meta["calendar_names"]:
+        calendar = np.load(directory / "calendar.npy", mmap_mode="r")
+    if meta["node_names"]:
+        node = np.load(directory / "node.npy", mmap_mode="r")
+    return TemporalFeatures(calendar, node, meta["calendar_names"], meta["node_names"])
+
+
+def load_or_build_features(
+    series_path: Path,
+    series: np.ndarray,
+    cfg: FeatureConfig,
+    key: Optional[str] = None,
+) -> TemporalFeatures:
+    """Open the feature arrays for `series`, materializing them on a miss.
+
+    Built into a temp directory and renamed into place, so concurrent runs
+    never see a partial build (the loser of a race discards its copy).
+    """
+    unknown = set(cfg.rolling_stats) - set(_ROLLING_STATS)
+    if unknown:
+        raise ValueError(
+            f"Unknown rolling stats {sorted(unknown)}; use {_ROLLING_STATS}"
+        )
+    series_path = Path(series_path)
+    target = features_cache_dir(series_path, series.shape[0], cfg, key)
+    if (target / "meta.json").exists():
+        return _open(target)
+
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    calendar, cal_names = calendar_features(series.shape[0], cfg)
+    if cal_names:
+        np.save(tmp / "calendar.npy", calendar)
+    node_names = _node_feature_names(cfg)
+    if node_names:
+        t, n, c = series.shape
+        node = np.lib.format.open_memmap(
+            tmp / "node.npy",
+            mode="w+",
+            dtype=np.float32,
+            shape=(t, n, c * len(node_names)),
+        )
+        _write_node_features(series, cfg, node)
+        node.flush()
+        del node
+    (tmp / "meta.json").write_text(
+        json.dumps({"calendar_names": cal_names, "node_names": node_names})
+    )
+    try:
+        os.rename(tmp, target)
+        logger.info(
+            "Materialized temporal features {} into {}", cal_names + node_names, target
+        )
+    except OSError:  # built concurrently by another process
+        shutil.rmtree(tmp, ignore_errors=True)
+    return _open(target)
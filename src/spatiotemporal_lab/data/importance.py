@@ -0,0 +1,216 @@
+"""Loss-driven importance sampling over training windows.
+
+`ImportanceSampler` draws windows with probability proportional to a priority
+`(loss + eps) ** alpha`, mixed with a `uniform_frac` share of uniform draws so
+no window starves. Priorities live in an array-backed `SumTree`: a batch of
+`k` updates or draws costs O(k log n) and is vectorized over the batch.
+
+`ImportanceUpdateCallback` refreshes priorities from each training batch's
+per-window loss. Windows not yet seen keep the highest priority observed so far,
+so every window is visited early on.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+import numpy as np
+import pytorch_lightning as pl
+import torch
+from loguru import logger
+from torch.utils.data import Sampler
+
+from spatiotemporal_lab.data.samplers import _dist_world
+
+
+class SumTree:
+    """Complete binary tree of priorities; internal nodes hold subtree sums."""
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._leaves = 1 << max(0, (self.capacity - 1).bit_length())
+        self.tree = np.zeros(2 * self._leaves, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.tree[1])
+
+    def get(self, pos: np.ndarray) -> np.ndarray:
+        return self.tree[np.asarray(pos) + self._leaves]
+
+    def set(self, pos: np.ndarray, values: np.ndarray) -> None:
+        node = np.asarray(pos, dtype=np.int64) + self._leaves
+        self.tree[node] = values
+        node = np.unique(node // 2)
+        while node.size and node[0] >= 1:
+            self.tree[node] = self.tree[2 * node] + self.tree[2 * node + 1]
+            node = np.unique(node // 2)
+            node = node[node >= 1]
+
+    def find(self, mass: np.ndarray) -> np.ndarray:
+        """Leaf positions whose cumulative-sum interval contains each `mass`."""
+        mass = np.minimum(
+            np.asarray(mass, dtype=np.float64), np.nextafter(self.total, 0)
+        )
+        node = np.ones(len(mass), dtype=np.int64)
+        if mass.size == 0:
+            return node
+        while self._leaves > 1 and node[0] < self._leaves:
+            left = 2 * node
+            left_sum = self.tree[left]
+            right = mass >= left_sum
+            mass = np.where(right, mass - left_sum, mass)
+            node = np.where(right, left + 1, left)
+        return node - self._leaves
+
+
+@dataclass(frozen=True)
+class ImportanceConfig:
+    alpha: float = 0.6
+    eps: float = 1e-3
+    uniform_frac: float = 0.1
+
+
+class ImportanceSampler(Sampler[int]):
+    """Draws `ceil(len(indices) / num_replicas)` windows per rank and epoch.
+
+    Same surface as `WindowSampler` (explicit index set, DDP sharding by
+    rank, `set_epoch`). `base_weights` (e.g. the validity weights) scale the
+    priorities; windows with weight 0 are never drawn. `drawn` holds this
+    epoch's order so losses can be mapped back to windows.
+    """
+
+    def __init__(
+        self,
+        indices: np.ndarray,
+        cfg: ImportanceConfig = ImportanceConfig(),
+        seed: int = 42,
+        num_replicas: Optional[int] = None,
+        rank: Optional[int] = None,
+        base_weights: Optional[np.ndarray] = None,
+    ):
+        world, world_rank = _dist_world()
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.cfg = cfg
+        self.seed = seed
+        self.num_replicas = num_replicas if num_replicas is not None else world
+        self.rank = rank if rank is not None else world_rank
+        self.epoch = 0
+        self.num_samples = math.ceil(len(self.indices) / self.num_replicas)
+
+        base = (
+            np.ones(len(self.indices))
+            if base_weights is None
+            else np.asarray(base_weights, dtype=np.float64)
+        )
+        if base.shape != self.indices.shape or base.sum() <= 0:
+            raise ValueError("base_weights must match indices and have a positive sum")
+        self._base = base
+        self._eligible = np.flatnonzero(base > 0)
+        # Window index -> position in `indices`.
+        self._pos = np.full(int(self.indices.max(initial=-1)) + 1, -1, dtype=np.int64)
+        self._pos[self.indices] = np.arange(len(self.indices))
+        self._max_priority = 1.0
+        self._seen = np.zeros(len(self.indices), dtype=bool)
+        self.tree = SumTree(len(self.indices))
+        self.tree.set(np.arange(len(self.indices)), base)
+        self.drawn = np.empty(0, dtype=np.int64)
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def update(self, window_idx: np.ndarray, losses: np.ndarray) -> None:
+        """Set the priorities of windows `window_idx` from their latest losses."""
+        pos = self._pos[np.asarray(window_idx, dtype=np.int64)]
+        losses = np.asarray(losses, dtype=np.float64)[pos >= 0]
+        pos = pos[pos >= 0]
+        if not pos.size:
+            return
+        priority = (losses + self.cfg.eps) ** self.cfg.alpha
+        priority = np.nan_to_num(priority, nan=self._max_priority)
+        self._seen[pos] = True
+        self.tree.set(pos, self._base[pos] * priority)
+        if priority.max() > self._max_priority:
+            # Keep windows not visited yet at the highest priority observed.
+            self._max_priority = float(priority.max())
+            unseen = np.flatnonzero(~self._seen)
+            self.tree.set(unseen, self._base[unseen] * self._max_priority)
+
+    def __iter__(self) -> Iterator[int]:
+        rng = np.random.default_rng([self.seed, self.epoch, self.rank])
+        n = self.num_samples
+        uniform = rng.random(n) < self.cfg.uniform_frac
+        pos = self.tree.find(rng.random(n) * self.tree.total)
+        pos[uniform] = rng.choice(self._eligible, size=int(uniform.sum()))
+        self.drawn = self.indices[pos]
+        return iter(self.drawn.tolist())
+
+    def __len__(self) -> int:
+        return self.num_samples
+
+
+def per_sample_loss(pred: torch.Tensor, target: torch.Tensor) -> torch.Tensor:
+    """Mean absolute error per sample over finite targets (`[B]`)."""
+    mask = torch.isfinite(target)
+    err = torch.where(mask, (pred - target).abs(), torch.zeros_like(pred))
+    dims = tuple(range(1, err.ndim))
+    return err.sum(dims) / mask.sum(dims).clamp(min=1)
+
+
+class ImportanceUpdateCallback(pl.Callback):
+    """Feeds per-window training losses back into an `ImportanceSampler`.
+
+    Uses `outputs["sample_loss"]` (`[B]`) when `training_step` returns it;
+    otherwise it recomputes the MAE per sample with a no-grad forward pass of
+    `(x, y)` batches. No-op unless the train loader's sampler is an
+    `ImportanceSampler`.
+    """
+
+    def __init__(self, update_every_n_steps: int = 1):
+        super().__init__()
+        self.update_every_n_steps = max(1, int(update_every_n_steps))
+        self._offset = 0
+        self._disabled = False
+
+    def on_train_epoch_start(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        self._offset = 0
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        sampler = getattr(trainer.train_dataloader, "sampler", None)
+        if not isinstance(sampler, ImportanceSampler) or self._disabled:
+            return
+        x, y = batch[0], batch[1]
+        start, self._offset = self._offset, self._offset + len(x)
+        if batch_idx % self.update_every_n_steps != 0:
+            return
+
+        if isinstance(outputs, Mapping) and "sample_loss" in outputs:
+            losses = outputs["sample_loss"].detach()
+        else:
+            with torch.no_grad():
+                pred = pl_module(x)
+            if pred.shape != y.shape:
+                logger.warning(
+                    "Importance sampling disabled: prediction {} does not match "
+                    "target {}; return `sample_loss` from training_step instead.",
+                    tuple(pred.shape),
+                    tuple(y.shape),
+                )
+                self._disabled = True
+                return
+            losses = per_sample_loss(pred.float(), y.float())
+        sampler.update(
+            sampler.drawn[start : start + len(x)], losses.float().cpu().numpy()
+        )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class NormStats:
+    """Per-node, per-channel z-score statistics (`[N, C]`)."""
+
+    mean: np.ndarray
+    std: np.ndarray
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        return (x - self.mean) / self.std
+
+
+def compute_norm_stats(
+    series: np.ndarray, end: int, chunk_size: int = 4096
+) -> NormStats:
+    """Mean/std over `series[:end]`, accumulated in float64 chunks.
+
+    Chunking keeps memory bounded when `series` is a memory-mapped array.
+    Non-finite readings (outages stored as NaN) are left out of both moments.
+    """
+    total = np.zeros(series.shape[1:], dtype=np.float64)
+    total_sq = np.zeros(series.shape[1:], dtype=np.float64)
+    count = np.zeros(series.shape[1:], dtype=np.int64)
+    for start in range(0, end, chunk_size):
+        block = np.asarray(series[start : min(start + chunk_size, end)], np.float64)
+        finite = np.isfinite(block)
+        block = np.where(finite, block, 0.0)
+        total += block.sum(axis=0)
+        total_sq += np.square(block).sum(axis=0)
+        count += finite.sum(axis=0)
+    n = np.maximum(count, 1)
+    mean = total / n
+    std = np.sqrt(np.maximum(total_sq / n - np.square(mean), 0.0))
+    std[(std < 1e-6) | (count == 0)] = 1.0
+    return NormStats(mean.astype(np.float32), std.astype(np.float32))
+
+
+def stats_cache_path(series_path: Path, end: int, key: Optional[str] = None) -> Path:
+    """Cache file for the stats of `series[:end]`.
+
+    The name hashes the dataset key and the file's size and mtime, so a
+    regenerated or replaced series never reuses stale statistics.
+    """
+    series_path = Path(series_path)
+    st = series_path.stat()
+    ident = json.dumps([key, st.st_size, st.st_mtime_ns])
+    digest = hashlib.sha1(ident.encode()).hexdigest()[:12]
+    return series_path.with_name(f"{series_path.stem}.stats-{end}-{digest}.npz")
+
+
+def load_or_compute_norm_stats(
+    series_path: Path, series: np.ndarray, end: int, key: Optional[str] = None
+) -> NormStats:
+    """Load cached stats next to the data, computing and caching them on a miss.
+
+    The cache is written to a temp file and renamed into place, so concurrent
+    runs (sweep trials, DDP ranks) never read a partial file.
+    """
+    path = stats_cache_path(series_path, end, key)
+    if path.exists():
+        with np.load(path) as f:
+            return NormStats(f["mean"], f["std"])
+
+    stats = compute_norm_stats(series, end)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, mean=stats.mean, std=stats.std)
+    os.replace(tmp, path)
+    return stats
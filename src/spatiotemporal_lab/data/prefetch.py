@@ -0,0 +1,223 @@
+"""Host-side batch prefetcher over a ring of reusable (optionally pinned) buffers.
+
+`RingPrefetcher` replaces a `DataLoader` for datasets that can gather a whole
+batch in place (`gather_into`). A background thread fills preallocated batch
+buffers from the sampler's index order while the model runs the current step,
+so no per-batch tensors are allocated and the copy overlaps with compute (the
+numpy gather releases the GIL).
+
+Buffers are recycled: a yielded batch stays valid only until `consumer_hold`
+further batches have been drawn. The default of 2 covers Lightning, which
+fetches one batch ahead of the step it runs. Do not keep references to batch
+tensors beyond the step.
+"""
+
+from __future__ import annotations
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+import pytorch_lightning as pl
+import torch
+from torch.utils.data import Sampler
+
+_DONE = object()
+
+
+class BatchGatherable(Protocol):
+    def sample_spec(self) -> Sequence[Tuple[Tuple[int, ...], torch.dtype]]:
+        """(shape, dtype) of each per-sample field, e.g. `[(x_shape, f32), (y_shape, f32)]`."""
+
+    def gather_into(self, indices: np.ndarray, out: Sequence[torch.Tensor]) -> None:
+        """Write samples `indices` into `out[k][: len(indices)]` for every field `k`."""
+
+
+class RingPrefetcher:
+    """Iterable of batches gathered on a background thread into a buffer ring.
+
+    Exposes `sampler` (so Lightning calls `set_epoch`), `batch_sampler = None`
+    (as a DataLoader with a plain sampler does) and `__len__`. `stats`
+    holds the last and cumulative queue depth / stall time for metrics.
+    """
+
+    def __init__(
+        self,
+        dataset: BatchGatherable,
+        sampler: Sampler[int],
+        batch_size: int,
+        ring_size: int = 4,
+        pin_memory: bool = False,
+        drop_last: bool = False,
+        consumer_hold: int = 2,
+    ):
+        if ring_size <= consumer_hold:
+            raise ValueError(
+                f"ring_size ({ring_size}) must exceed consumer_hold ({consumer_hold})"
+            )
+        self.dataset = dataset
+        self.sampler = sampler
+        self.batch_sampler = None
+        self.batch_size = int(batch_size)
+        self.ring_size = int(ring_size)
+        self.pin_memory = pin_memory and torch.cuda.is_available()
+        self.drop_last = drop_last
+        self.consumer_hold = int(consumer_hold)
+        self.stats: Dict[str, float] = {
+            "batches": 0,
+            "queue_depth": 0,
+            "stall_s": 0.0,
+            "stall_s_total": 0.0,
+            "queue_depth_total": 0,
+        }
+        self._buffers: Optional[List[Tuple[torch.Tensor, ...]]] = None
+        self._active_stop: Optional[threading.Event] = None
+        self._active_thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        n = len(self.sampler)
+        return (
+            n // self.batch_size if self.drop_last else math.ceil(n / self.batch_size)
+        )
+
+    def _allocate(self) -> List[Tuple[torch.Tensor, ...]]:
+        def _buf(shape: Tuple[int, ...], dtype: torch.dtype) -> torch.Tensor:
+            t = torch.empty((self.batch_size, *shape), dtype=dtype)
+            return t.pin_memory() if self.pin_memory else t
+
+        spec = self.dataset.sample_spec()
+        return [
+            tuple(_buf(shape, dtype) for shape, dtype in spec)
+            for _ in range(self.ring_size)
+        ]
+
+    def _fill(
+        self,
+        order: np.ndarray,
+        free: "queue.Queue[int]",
+        ready: "queue.Queue[Any]",
+        stop: threading.Event,
+    ) -> None:
+        assert self._buffers is not None
+        try:
+            stop_at = len(order)
+            if self.drop_last:
+                stop_at -= stop_at % self.batch_size
+            for start in range(0, stop_at, self.batch_size):
+                while True:
+                    if stop.is_set():
+                        return
+                    try:
+                        slot = free.get(timeout=0.1)
+                        break
+                    except queue.Empty:
+                        continue
+                idx = order[start : start + self.batch_size]
+                self.dataset.gather_into(idx, self._buffers[slot])
+                ready.put((slot, len(idx)))
+            ready.put(_DONE)
+        except BaseException as e:  # surfaced on the consumer thread
+            ready.put(e)
+
+    def close(self) -> None:
+        """Stop the background filler of the current epoch and wait for it.
+
+        The join matters: the next epoch reuses the same buffers, and a filler
+        still inside `gather_into` would overwrite batches being consumed.
+        """
+        if self._active_stop is not None:
+            self._active_stop.set()
+            self._active_stop = None
+        if self._active_thread is not None:
+            if self._active_thread is not threading.current_thread():
+                self._active_thread.join()
+            self._active_thread = None
+
+    def __iter__(self) -> Iterator[Tuple[torch.Tensor, ...]]:
+        self.close()
+        if self._buffers is None:
+            self._buffers = self._allocate()
+        return self._iterate()
+
+    def _iterate(self) -> Iterator[Tuple[torch.Tensor, ...]]:
+        assert self._buffers is not None
+        order = np.fromiter(iter(self.sampler), dtype=np.int64)
+        free: "queue.Queue[int]" = queue.Queue()
+        ready: "queue.Queue[Any]" = queue.Queue()
+        for slot in range(self.ring_size):
+            free.put(slot)
+        stop = threading.Event()
+        self._active_stop = stop
+        thread = threading.Thread(
+            target=self._fill,
+            args=(order, free, ready, stop),
+            name="ring-prefetcher",
+            daemon=True,
+        )
+        self._active_thread = thread
+        thread.start()
+
+        held: deque = deque()
+        try:
+            while True:
+                depth = ready.qsize()
+                t0 = time.perf_counter()
+                item = ready.get()
+                stall = time.perf_counter() - t0
+                if item is _DONE:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                slot, n = item
+                self.stats["batches"] += 1
+                self.stats["queue_depth"] = depth
+                self.stats["queue_depth_total"] += depth
+                self.stats["stall_s"] = stall
+                self.stats["stall_s_total"] += stall
+
+                held.append(slot)
+                if len(held) > self.consumer_hold:
+                    free.put(held.popleft())
+                yield tuple(buf[:n] for buf in self._buffers[slot])
+        finally:
+            stop.set()
+            thread.join()
+
+
+class PrefetchMetricsCallback(pl.Callback):
+    """Logs `data/prefetch_*` metrics when the train loader is a `RingPrefetcher`."""
+
+    def __init__(self, log_every_n_steps: int = 50):
+        super().__init__()
+        self.log_every_n_steps = max(1, int(log_every_n_steps))
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        loader = trainer.train_dataloader
+        if not isinstance(loader, RingPrefetcher):
+            return
+        if trainer.global_step % self.log_every_n_steps != 0:
+            return
+        s = loader.stats
+        batches = max(1, s["batches"])
+        pl_module.log_dict(
+            {
+                "data/prefetch_queue_depth": float(s["queue_depth"]),
+                "data/prefetch_queue_depth_mean": s["queue_depth_total"] / batches,
+                "data/prefetch_stall_ms": s["stall_s"] * 1000.0,
+                "data/prefetch_stall_ms_mean": 1000.0 * s["stall_s_total"] / batches,
+            },
+            on_step=True,
+            on_epoch=False,
+            rank_zero_only=True,
+        )
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import math
+from typing import Iterator, Optional
+
+import numpy as np
+import torch.distributed as dist
+from torch.utils.data import Sampler
+
+
+def _dist_world() -> tuple[int, int]:
+    if dist.is_available() and dist.is_initialized():
+        return dist.get_world_size(), dist.get_rank()
+    return 1, 0
+
+
+class WindowSampler(Sampler[int]):
+    """Samples window indices from an explicit index set, sharded across ranks.
+
+    Behaves like `DistributedSampler` but over a subset of dataset indices
+    (e.g. a train split), so the datamodule does not need `Subset` wrapping
+    and Lightning does not need to inject its own sampler.
+
+    - Each rank sees `ceil(len(indices) / num_replicas)` indices per epoch
+      (padded by wrapping around unless `drop_last`).
+    - Shuffling is seeded by `seed + epoch`; call `set_epoch` each epoch
+      (Lightning does this automatically).
+    - With `weights` (one per index) a shuffled epoch draws `len(indices)`
+      indices with replacement, proportional to weight.
+    """
+
+    def __init__(
+        self,
+        indices: np.ndarray,
+        shuffle: bool = True,
+        seed: int = 42,
+        num_replicas: Optional[int] = None,
+        rank: Optional[int] = None,
+        drop_last: bool = False,
+        weights: Optional[np.ndarray] = None,
+    ):
+        world, world_rank = _dist_world()
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = None
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            if weights.shape != self.indices.shape or weights.sum() <= 0:
+                raise ValueError("weights must match indices and have a positive sum")
+            self.weights = weights / weights.sum()
+        self.shuffle = shuffle
+        self.seed = seed
+        self.num_replicas = num_replicas if num_replicas is not None else world
+        self.rank = rank if rank is not None else world_rank
+        self.drop_last = drop_last
+        self.epoch = 0
+
+        if not 0 <= self.rank < self.num_replicas:
+            raise ValueError(
+                f"rank {self.rank} out of range for num_replicas={self.num_replicas}"
+            )
+
+        n = len(self.indices)
+        if drop_last:
+            self.num_samples = n // self.num_replicas
+        else:
+            self.num_samples = math.ceil(n / self.num_replicas)
+        self.total_size = self.num_samples * self.num_replicas
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def _epoch_order(self) -> np.ndarray:
+        if self.shuffle:
+            rng = np.random.default_rng(self.seed + self.epoch)
+            if self.weights is not None:
+                return rng.choice(self.indices, size=len(self.indices), p=self.weights)
+            return self.indices[rng.permutation(len(self.indices))]
+        return self.indices
+
+    def __iter__(self) -> Iterator[int]:
+        order = self._epoch_order()
+        if self.total_size > len(order):
+            order = np.resize(order, self.total_size)
+        else:
+            order = order[: self.total_size]
+        return iter(order[self.rank : self.total_size : self.num_replicas].tolist())
+
+    def __len__(self) -> int:
+        return self.num_samples
@@ -0,0 +1,277 @@
+"""Decode-once, host-wide cache for series that cannot be memory-mapped.
+
+Compressed containers (`.npz`, HDF5, compressed Zarr) have to be decoded before
+use. Without a cache every DataLoader worker and every concurrent sweep trial
+decodes and holds its own copy. `shared_array()` decodes the source once, chunk
+by chunk, into an uncompressed `.npy` file under `/dev/shm` (RAM-backed), and
+every other process attaches to it by name with a read-only memory map, so all
+of them share one copy of the pages.
+
+Lifetime is reference counted with `flock`: each attached process holds a
+shared lock on `<name>.lock`. On release (or process exit) a holder that can
+take the exclusive lock is the last one and removes the segment. A crashed
+process releases its lock automatically; a leftover segment is simply reused
+by the next run with the same source. The (empty) lock files are left in place.
+
+If `/dev/shm` does not have room for the decoded series, the segment is built in
+the on-disk temp directory instead and memory-mapped from there the same way.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX: no reference counting
+    fcntl = None
+
+_DEFAULT_DIR = Path("/dev/shm")
+_PREFIX = "stlab-"
+# Headroom left free in the cache filesystem after a build.
+_FREE_MARGIN_BYTES = 64 << 20
+
+
+def default_cache_dir() -> Path:
+    return _DEFAULT_DIR if _DEFAULT_DIR.is_dir() else disk_cache_dir()
+
+
+def disk_cache_dir() -> Path:
+    return Path(tempfile.gettempdir())
+
+
+def cache_name(path: Path, key: Optional[str] = None) -> str:
+    """Stable name for (source file, contents version, dataset key)."""
+    st = Path(path).stat()
+    ident = f"{Path(path).resolve()}|{st.st_size}|{st.st_mtime_ns}|{key or ''}"
+    return _PREFIX + hashlib.sha1(ident.encode()).hexdigest()[:16]
+
+
+def _open_source(path: Path, key: Optional[str]) -> Tuple[Any, Callable[[], None]]:
+    """Array-like supporting `src[a:b]` along time, plus a close function."""
+    suffix = path.suffix.lower()
+    if suffix == ".npz":
+        f = np.load(path)
+        return f[key or f.files[0]], f.close
+    if suffix in (".h5", ".hdf5"):
+        import h5py
+
+        f = h5py.File(path, "r")
+        return f[key or next(iter(f.keys()))], f.close
+    if suffix == ".zarr" or path.is_dir():
+        import zarr
+
+        root = zarr.open(str(path), mode="r")
+        return (root[key] if key else root), lambda: None
+    if suffix == ".npy":
+        return np.load(path, mmap_mode="r"), lambda: None
+    raise ValueError(f"Unsupported series format: {path}")
+
+
+def _fits(cache_dir: Path, src: Any) -> bool:
+    nbytes = int(np.prod(src.shape)) * np.dtype(src.dtype).itemsize
+    return shutil.disk_usage(cache_dir).free >= nbytes + _FREE_MARGIN_BYTES
+
+
+def _decode_to(src: Any, out_path: Path, chunk_steps: int) -> Tuple[int, ...]:
+    shape = tuple(src.shape)
+    if len(shape) == 2:
+        shape = shape + (1,)
+    if len(shape) != 3:
+        raise ValueError(f"Expected [T, N] or [T, N, C] series, got {tuple(src.shape)}")
+    out = np.lib.format.open_memmap(
+        out_path, mode="w+", dtype=np.dtype(src.dtype), shape=shape
+    )
+    for start in range(0, shape[0], chunk_steps):
+        block = np.asarray(src[start : start + chunk_steps])
+        out[start : start + len(block)] = block.reshape((len(block),) + shape[1:])
+    out.flush()
+    del out
+    return shape
+
+
+class SharedArray:
+    """Read-only `[T, N, C]` array living in the shared cache.
+
+    Supports the slicing/shape surface the datasets use. Pickling sends only the
+    name, so DataLoader workers started with `spawn` attach instead of copying.
+    """
+
+    def __init__(self, name: str, cache_dir: Path, lock_fd: Optional[int] = None):
+        self.name = name
+        self.cache_dir = Path(cache_dir)
+        # `lock_fd` already holds the shared lock when handed over by shared_array().
+        self._lock_fd = lock_fd if lock_fd is not None else self._lock_shared()
+        self.array = np.load(self.data_path, mmap_mode="r")
+        atexit.register(self.release)
+
+    @property
+    def data_path(self) -> Path:
+        return self.cache_dir / f"{self.name}.npy"
+
+    @property
+    def lock_path(self) -> Path:
+        return self.cache_dir / f"{self.name}.lock"
+
+    def _lock_shared(self) -> Optional[int]:
+        if fcntl is None:
+            return None
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o666)
+        fcntl.flock(fd, fcntl.LOCK_SH)
+        return fd
+
+    # -- array surface -----------------------------------------------------
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.array.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.array.ndim
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.array.dtype
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, idx: Any) -> np.ndarray:
+        return self.array[idx]
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        return np.asarray(self.array, dtype=dtype)
+
+    # -- lifetime ----------------------------------------------------------
+
+    def release(self) -> None:
+        """Detach; removes the segment if no other process is attached."""
+        atexit.unregister(self.release)
+        self.array = None
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is None:
+            return
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return  # still attached elsewhere
+        else:
+            self.data_path.unlink(missing_ok=True)
+            logger.debug("Removed shared cache {}", self.data_path)
+        finally:
+            os.close(fd)
+
+    def __getstate__(self) -> dict:
+        return {"name": self.name, "cache_dir": str(self.cache_dir)}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["name"], Path(state["cache_dir"]))
+
+
+def shared_array(
+    path: Path,
+    key: Optional[str] = None,
+    cache_dir: Optional[Path] = None,
+    chunk_steps: int = 4096,
+    fallback_dir: Optional[Path] = None,
+) -> SharedArray:
+    """Attach to the cached decode of `path` (dataset `key`), building it if missing.
+
+    Concurrent callers that find it missing serialize on a build lock; exactly
+    one decodes, the rest wait and then attach. When the decode would not fit
+    in `cache_dir`, it is built in `fallback_dir` (default: the on-disk temp
+    directory) instead.
+    """
+    path = Path(path)
+    cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+    fallback_dir = Path(fallback_dir) if fallback_dir else disk_cache_dir()
+    name = cache_name(path, key)
+
+    can_fall_back = fallback_dir.resolve() != cache_dir.resolve()
+    if can_fall_back and not (cache_dir / f"{name}.npy").exists():
+        if (fallback_dir / f"{name}.npy").exists():
+            cache_dir, can_fall_back = fallback_dir, False
+
+    shared = _attach_or_build(path, key, cache_dir, name, chunk_steps, can_fall_back)
+    if shared is None:
+        logger.warning(
+            "Not enough free space in {} for {}; caching it in {} instead.",
+            cache_dir,
+            path,
+            fallback_dir,
+        )
+        shared = _attach_or_build(path, key, fallback_dir, name, chunk_steps, False)
+    return shared
+
+
+def _attach_or_build(
+    path: Path,
+    key: Optional[str],
+    cache_dir: Path,
+    name: str,
+    chunk_steps: int,
+    check_space: bool,
+) -> Optional[SharedArray]:
+    """Attach to `name` in `cache_dir`, building it first if missing.
+
+    Returns `None` without building when `check_space` is set and the decode
+    does not fit.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    data_path = cache_dir / f"{name}.npy"
+
+    if fcntl is None:
+        if not data_path.exists():
+            if not _build(path, key, cache_dir, name, chunk_steps, check_space):
+                return None
+        return SharedArray(name, cache_dir)
+
+    while True:
+        lock_fd = os.open(cache_dir / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o666)
+        fcntl.flock(lock_fd, fcntl.LOCK_SH)
+        if data_path.exists():
+            return SharedArray(name, cache_dir, lock_fd=lock_fd)
+        os.close(lock_fd)
+
+        # Missing: build under a separate lock so attached readers never block
+        # the builder (and vice versa). A last holder may remove a fresh
+        # segment before we attach; the loop then simply rebuilds.
+        build_fd = os.open(cache_dir / f"{name}.build", os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(build_fd, fcntl.LOCK_EX)
+            if not data_path.exists():
+                if not _build(path, key, cache_dir, name, chunk_steps, check_space):
+                    return None
+        finally:
+            os.close(build_fd)
+
+
+def _build(
+    path: Path,
+    key: Optional[str],
+    cache_dir: Path,
+    name: str,
+    chunk_steps: int,
+    check_space: bool = False,
+) -> bool:
+    tmp = cache_dir / f"{name}.{os.getpid()}.tmp.npy"
+    src, close = _open_source(path, key)
+    try:
+        if check_space and not _fits(cache_dir, src):
+            return False
+        shape = _decode_to(src, tmp, chunk_steps)
+    finally:
+        close()
+    os.replace(tmp, cache_dir / f"{name}.npy")
+    logger.info("Decoded {} into shared cache {} {}", path, cache_dir / name, shape)
+    return True
@@ -27,3 +27,17 @@ def random_split_indices(
     val = idx[n_test : n_test + n_val]
     train = idx[n_test + n_val :]
     return Split(train, val, test)
+
+
+def chronological_split_indices(
+    n: int, val_frac: float = 0.1, test_frac: float = 0.1
+) -> Split:
+    """Contiguous train / val / test ranges in time order (no leakage across splits)."""
+    assert (
+        0.0 <= val_frac < 1.0 and 0.0 <= test_frac < 1.0 and val_frac + test_frac < 1.0
+    )
+    n_test = int(n * test_frac)
+    n_val = int(n * val_frac)
+    n_train = n - n_val - n_test
+    idx = np.arange(n)
+    return Split(idx[:n_train], idx[n_train : n_train + n_val], idx[n_train + n_val :])
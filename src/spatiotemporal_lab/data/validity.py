@@ -0,0 +1,137 @@
+"""Per-(time, node) validity bitmap and gap-aware window index.
+
+A reading is missing when any channel is non-finite or equals `null_value`
+(LargeST encodes sensor outages as 0). The bitmap is built once, chunk by
+chunk, and cached next to the series in `<stem>.validity-<hash>/`:
+
+- `bitmap.npy`: `[T, ceil(N / 8)]` uint8, nodes bit-packed (`np.packbits`).
+- `step_valid.npy`: `[T]` int32, valid nodes per step.
+
+Window missing ratios for any `(input_len, horizon)` then come from one
+cumulative sum over `step_valid`, in O(T).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from loguru import logger
+
+_MODES = ("filter", "weight")
+
+
+@dataclass(frozen=True)
+class ValidityConfig:
+    null_value: Optional[float] = 0.0
+    # Windows whose span is more than this fraction missing are dropped
+    # ("filter") or never sampled ("weight"; others drawn by valid fraction).
+    max_missing: float = 0.5
+    mode: str = "filter"
+    # Also drop gap windows from val/test (otherwise only masked in metrics).
+    filter_eval: bool = False
+    # Missing target readings become NaN for the masked metrics.
+    mask_targets: bool = False
+    chunk_steps: int = 4096
+
+    def __post_init__(self) -> None:
+        if self.mode not in _MODES:
+            raise ValueError(
+                f"validity mode must be one of {_MODES}, got {self.mode!r}"
+            )
+
+
+@dataclass
+class ValidityIndex:
+    bitmap: np.ndarray
+    step_valid: np.ndarray
+    num_nodes: int
+
+    def valid(self, start: int, stop: int) -> np.ndarray:
+        """Bool `[stop - start, N]` validity of steps `start:stop`."""
+        bits = np.asarray(self.bitmap[start:stop])
+        return np.unpackbits(bits, axis=1, count=self.num_nodes).astype(bool)
+
+    def window_missing(self, input_len: int, horizon: int) -> np.ndarray:
+        """Missing ratio over each window's full span, indexed by window start."""
+        span = input_len + horizon
+        n_windows = max(0, len(self.step_valid) - span + 1)
+        csum = np.concatenate([[0], np.cumsum(self.step_valid, dtype=np.int64)])
+        valid = csum[span : span + n_windows] - csum[:n_windows]
+        return (1.0 - valid / (span * self.num_nodes)).astype(np.float32)
+
+
+def _valid_block(block: np.ndarray, null_value: Optional[float]) -> np.ndarray:
+    ok = np.isfinite(block)
+    if null_value is not None:
+        ok &= block != null_value
+    return ok.all(axis=-1)
+
+
+def validity_cache_dir(
+    series_path: Path, null_value: Optional[float], key: Optional[str] = None
+) -> Path:
+    st = Path(series_path).stat()
+    ident = json.dumps([null_value, st.st_size, st.st_mtime_ns, key])
+    digest = hashlib.sha1(ident.encode()).hexdigest()[:12]
+    return series_path.with_name(f"{series_path.stem}.validity-{digest}")
+
+
+def _open(directory: Path, num_nodes: int) -> ValidityIndex:
+    return ValidityIndex(
+        np.load(directory / "bitmap.npy", mmap_mode="r"),
+        np.load(directory / "step_valid.npy"),
+        num_nodes,
+    )
+
+
+def load_or_build_validity(
+    series_path: Path,
+    series: np.ndarray,
+    null_value: Optional[float] = 0.0,
+    chunk_steps: int = 4096,
+    key: Optional[str] = None,
+) -> ValidityIndex:
+    """Open the cached validity index of `series`, building it on a miss.
+
+    Built into a temp directory and renamed into place, like the feature cache.
+    """
+    series_path = Path(series_path)
+    num_steps, num_nodes = series.shape[:2]
+    target = validity_cache_dir(series_path, null_value, key)
+    if (target / "step_valid.npy").exists():
+        return _open(target, num_nodes)
+
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    bitmap = np.lib.format.open_memmap(
+        tmp / "bitmap.npy",
+        mode="w+",
+        dtype=np.uint8,
+        shape=(num_steps, (num_nodes + 7) // 8),
+    )
+    step_valid = np.empty(num_steps, dtype=np.int32)
+    for a in range(0, num_steps, chunk_steps):
+        ok = _valid_block(np.asarray(series[a : a + chunk_steps]), null_value)
+        bitmap[a : a + len(ok)] = np.packbits(ok, axis=1)
+        step_valid[a : a + len(ok)] = ok.sum(axis=1)
+    bitmap.flush()
+    del bitmap
+    np.save(tmp / "step_valid.npy", step_valid)
+    try:
+        os.rename(tmp, target)
+        logger.info(
+            "Validity index: {:.1%} of readings missing ({})",
+            1.0 - step_valid.sum() / max(1, num_steps * num_nodes),
+            target,
+        )
+    except OSError:  # built concurrently by another process
+        shutil.rmtree(tmp, ignore_errors=True)
+    return _open(target, num_nodes)
@@ -1 +1,15 @@
-# Package marker
+# Package marker; public names resolve lazily (torch/Lightning load on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "maybe_run_offline_eval": "evaluate",
+        "accuracy": "metrics",
+        "masked_mae": "metrics",
+        "masked_mape": "metrics",
+        "masked_mse": "metrics",
+        "masked_rmse": "metrics",
+        "valid_mask": "metrics",
+    },
+)
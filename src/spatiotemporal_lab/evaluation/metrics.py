@@ -1,7 +1,71 @@
 from __future__ import annotations
 
+from typing import Optional
+
 import torch
 
 
 def accuracy(logits: torch.Tensor, y: torch.Tensor) -> torch.Tensor:
     return (logits.argmax(dim=1) == y).float().mean()
+
+
+def valid_mask(
+    target: torch.Tensor, null_value: Optional[float] = None
+) -> torch.Tensor:
+    """Readings to score: finite (see `data.validity.mask_targets`) and != null_value."""
+    mask = torch.isfinite(target)
+    if null_value is not None:
+        mask &= target != null_value
+    return mask
+
+
+def _masked_mean(err: torch.Tensor, mask: torch.Tensor) -> torch.Tensor:
+    err = torch.where(mask, err, torch.zeros_like(err))
+    return err.sum() / mask.sum().clamp(min=1)
+
+
+def _fill(target: torch.Tensor, mask: torch.Tensor, value: float) -> torch.Tensor:
+    # Masked targets are NaN/null; replace them *before* the arithmetic, since
+    # `where` after the fact still back-propagates NaN * 0 = NaN into `pred`.
+    return torch.where(mask, target, torch.full_like(target, value))
+
+
+def masked_mae(
+    pred: torch.Tensor,
+    target: torch.Tensor,
+    mask: Optional[torch.Tensor] = None,
+    null_value: Optional[float] = None,
+) -> torch.Tensor:
+    mask = valid_mask(target, null_value) if mask is None else mask
+    return _masked_mean((pred - _fill(target, mask, 0.0)).abs(), mask)
+
+
+def masked_mse(
+    pred: torch.Tensor,
+    target: torch.Tensor,
+    mask: Optional[torch.Tensor] = None,
+    null_value: Optional[float] = None,
+) -> torch.Tensor:
+    mask = valid_mask(target, null_value) if mask is None else mask
+    return _masked_mean((pred - _fill(target, mask, 0.0)).square(), mask)
+
+
+def masked_rmse(
+    pred: torch.Tensor,
+    target: torch.Tensor,
+    mask: Optional[torch.Tensor] = None,
+    null_value: Optional[float] = None,
+) -> torch.Tensor:
+    return masked_mse(pred, target, mask, null_value).sqrt()
+
+
+def masked_mape(
+    pred: torch.Tensor,
+    target: torch.Tensor,
+    mask: Optional[torch.Tensor] = None,
+    null_value: Optional[float] = 0.0,
+) -> torch.Tensor:
+    mask = valid_mask(target, null_value) if mask is None else mask
+    mask = mask & (target != 0)
+    target = _fill(target, mask, 1.0)
+    return _masked_mean(((pred - target) / target).abs(), mask)
@@ -1 +1,14 @@
-# Package marker
+# Package marker; public names resolve lazily (torch/ONNX load on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "Predictor": "predictor",
+        "StaticGraphExportConfig": "onnx_export",
+        "StaticGraphForecaster": "onnx_export",
+        "export_static_graph_onnx": "onnx_export",
+        "load_adjacency": "onnx_export",
+        "verify_onnx_against_torch": "onnx_export",
+    },
+)
@@ -1 +1,14 @@
-# Package marker
+# Package marker; public names resolve lazily (MLflow loads on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "BatchedMlflowLogger": "mlflow",
+        "active_batch_logger": "mlflow",
+        "log_profiling_artifacts": "mlflow",
+        "log_resolved_config": "mlflow",
+        "maybe_init_mlflow": "mlflow",
+        "set_standard_tags": "mlflow",
+    },
+)
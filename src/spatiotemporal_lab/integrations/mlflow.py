@@ -1,25 +1,200 @@
+"""MLflow run setup and batched logging.
+
+`mlflow` (and its pandas/sqlalchemy dependency tree) is imported inside the
+functions that need it, so importing this module stays cheap when tracking is
+disabled.
+"""
+
 from __future__ import annotations
 
 import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional
 
-import mlflow
 from loguru import logger
 from omegaconf import DictConfig, OmegaConf
 
+if TYPE_CHECKING:
+    from mlflow.entities import Metric, Param, RunTag
+    from mlflow.tracking import MlflowClient
+
+# MLflow log_batch limits (per request).
+_MAX_METRICS_PER_BATCH = 1000
+_MAX_PARAMS_TAGS_PER_BATCH = 100
+# Older tracking servers reject param values longer than this.
+_MAX_PARAM_VALUE_LENGTH = 500
+
+_FLUSH = object()
+_STOP = object()
+
+_active_batch_logger: Optional["BatchedMlflowLogger"] = None
+
 
 def _tracking_uri(cfg: DictConfig) -> Optional[str]:
     # Prefer env var (opsec); fall back to cfg.mlflow.tracking_uri if explicitly set.
     return os.getenv("MLFLOW_TRACKING_URI") or cfg.mlflow.get("tracking_uri")
 
 
+class BatchedMlflowLogger:
+    """Buffers metrics/params/tags and sends them with `MlflowClient.log_batch`.
+
+    Logging calls only enqueue; a background thread flushes when
+    `max_batch_size` entries are buffered or `flush_interval_s` has passed.
+    A failed flush is logged and dropped so tracking never stalls training.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        client: Optional[MlflowClient] = None,
+        max_batch_size: int = 1000,
+        flush_interval_s: float = 5.0,
+        max_queue_size: int = 100_000,
+    ):
+        from mlflow.tracking import MlflowClient
+
+        self.run_id = run_id
+        self.client = client or MlflowClient()
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.flush_interval_s = float(flush_interval_s)
+        self.dropped = 0
+
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue_size)
+        self._metrics: List[Metric] = []
+        self._params: Dict[str, Param] = {}
+        self._tags: Dict[str, RunTag] = {}
+        self._thread = threading.Thread(
+            target=self._run, name="mlflow-batch-logger", daemon=True
+        )
+        self._thread.start()
+
+    # -- producer side -----------------------------------------------------
+
+    def _put(self, item: Any) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def log_metric(self, key: str, value: float, step: Optional[int] = None) -> None:
+        from mlflow.entities import Metric
+
+        ts = int(time.time() * 1000)
+        self._put(Metric(key, float(value), ts, int(step or 0)))
+
+    def log_metrics(
+        self, metrics: Mapping[str, float], step: Optional[int] = None
+    ) -> None:
+        for key, value in metrics.items():
+            self.log_metric(key, value, step=step)
+
+    def log_params(self, params: Mapping[str, Any]) -> None:
+        from mlflow.entities import Param
+
+        for key, value in params.items():
+            self._put(Param(key, str(value)[:_MAX_PARAM_VALUE_LENGTH]))
+
+    def set_tags(self, tags: Mapping[str, Any]) -> None:
+        from mlflow.entities import RunTag
+
+        for key, value in tags.items():
+            self._put(RunTag(key, str(value)))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until everything enqueued so far has been sent."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        done = threading.Event()
+        self._queue.put((_STOP, done))
+        done.wait()
+        self._thread.join()
+        if self.dropped:
+            logger.warning("MLflow batch logger dropped {} entries.", self.dropped)
+
+    # -- consumer side -----------------------------------------------------
+
+    def _buffered(self) -> int:
+        return len(self._metrics) + len(self._params) + len(self._tags)
+
+    def _add(self, item: Any) -> None:
+        from mlflow.entities import Metric, Param, RunTag
+
+        if isinstance(item, Metric):
+            self._metrics.append(item)
+        elif isinstance(item, Param):
+            self._params[item.key] = item
+        elif isinstance(item, RunTag):
+            self._tags[item.key] = item
+
+    def _send(self) -> None:
+        # Params go in their own requests: the server rejects a whole batch when
+        # a param is re-logged with a different value, which must not cost the
+        # metrics sent alongside it.
+        metrics, params, tags = (
+            self._metrics,
+            list(self._params.values()),
+            list(self._tags.values()),
+        )
+        self._metrics, self._params, self._tags = [], {}, {}
+        self._send_chunks("metrics", metrics, _MAX_METRICS_PER_BATCH)
+        self._send_chunks("params", params, _MAX_PARAMS_TAGS_PER_BATCH)
+        self._send_chunks("tags", tags, _MAX_PARAMS_TAGS_PER_BATCH)
+
+    def _send_chunks(self, kind: str, items: List[Any], limit: int) -> None:
+        for start in range(0, len(items), limit):
+            chunk = items[start : start + limit]
+            try:
+                self.client.log_batch(self.run_id, **{kind: chunk})
+            except Exception:
+                self.dropped += len(chunk)
+                logger.exception(
+                    "MLflow log_batch failed; dropping {} {}.", len(chunk), kind
+                )
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.flush_interval_s
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple) and item and item[0] in (_FLUSH, _STOP):
+                # Everything put before the marker is already buffered (FIFO).
+                self._send()
+                item[1].set()
+                if item[0] is _STOP:
+                    return
+            elif item is not None:
+                self._add(item)
+
+            if self._buffered() >= self.max_batch_size or time.monotonic() >= deadline:
+                self._send()
+                deadline = time.monotonic() + self.flush_interval_s
+
+
+def active_batch_logger() -> Optional[BatchedMlflowLogger]:
+    """Batched logger of the run opened by `maybe_init_mlflow`, if any."""
+    return _active_batch_logger
+
+
 @contextmanager
 def maybe_init_mlflow(cfg: DictConfig):
+    global _active_batch_logger
+
     if not bool(cfg.mlflow.get("enabled", True)):
         yield None
         return
 
+    import mlflow
+
     uri = _tracking_uri(cfg)
     if uri:
         mlflow.set_tracking_uri(uri)
@@ -31,8 +206,21 @@ def maybe_init_mlflow(cfg: DictConfig):
     run_name = str(cfg.mlflow.get("run_name", cfg.model.name))
 
     mlflow.set_experiment(exp_name)
-    with mlflow.start_run(run_name=run_name):
-        yield
+    with mlflow.start_run(run_name=run_name) as run:
+        async_cfg = cfg.mlflow.get("async_logging", None) or {}
+        if bool(async_cfg.get("enabled", True)):
+            _active_batch_logger = BatchedMlflowLogger(
+                run.info.run_id,
+                max_batch_size=int(async_cfg.get("max_batch_size", 1000)),
+                flush_interval_s=float(async_cfg.get("flush_interval_s", 5.0)),
+                max_queue_size=int(async_cfg.get("max_queue_size", 100_000)),
+            )
+        try:
+            yield run
+        finally:
+            if _active_batch_logger is not None:
+                _active_batch_logger.close()
+                _active_batch_logger = None
 
 
 def set_standard_tags(cfg: DictConfig) -> None:
@@ -42,11 +230,34 @@ def set_standard_tags(cfg: DictConfig) -> None:
     tags.setdefault("model_name", str(cfg.model.name))
     tags.setdefault("data_name", str(cfg.data.name))
     tags.setdefault("debug", str(bool(cfg.get("debug", False))))
-    mlflow.set_tags(tags)
+    batch_logger = active_batch_logger()
+    if batch_logger is not None:
+        batch_logger.set_tags(tags)
+    else:
+        import mlflow
+
+        mlflow.set_tags(tags)
 
 
 def log_resolved_config(cfg: DictConfig, artifact_path: str = "config") -> None:
     if not bool(cfg.mlflow.get("log_config_as_artifact", True)):
         return
+    import mlflow
+
     resolved = OmegaConf.to_yaml(cfg, resolve=True)
     mlflow.log_text(resolved, f"{artifact_path}/resolved.yaml")
+
+
+def log_profiling_artifacts(cfg: DictConfig, artifact_path: str = "profiling") -> None:
+    """Upload `cfg.profiling.output_dir` (traces, folded stacks, timings) to the run."""
+    prof_cfg = cfg.get("profiling", None) or {}
+    if not bool(prof_cfg.get("enabled", False)) or not bool(
+        prof_cfg.get("log_to_mlflow", True)
+    ):
+        return
+    output_dir = Path(str(prof_cfg.get("output_dir", "profiling")))
+    if not output_dir.is_dir():
+        return
+    import mlflow
+
+    mlflow.log_artifacts(str(output_dir), artifact_path)
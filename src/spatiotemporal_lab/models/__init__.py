@@ -0,0 +1,11 @@
+# Package marker; public names resolve lazily (torch/Lightning load on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "apply_activation_checkpointing": "checkpointing",
+        "apply_runtime_profile": "factory",
+        "build_lightning_module": "factory",
+    },
+)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import torch
+from torch import nn
+from torch.utils.checkpoint import checkpoint
+
+
+class _CheckpointedForward:
+    """Instance-level `forward` override that recomputes activations in backward.
+
+    Installed on the block itself (not as a wrapper module) so parameter names
+    and state dict keys are identical with checkpointing on or off.
+    """
+
+    def __init__(self, module: nn.Module, use_reentrant: bool = False):
+        self.module = module
+        self.use_reentrant = use_reentrant
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        forward = type(self.module).forward
+        if self.module.training and torch.is_grad_enabled():
+            return checkpoint(
+                forward,
+                self.module,
+                *args,
+                use_reentrant=self.use_reentrant,
+                **kwargs,
+            )
+        return forward(self.module, *args, **kwargs)
+
+
+def apply_activation_checkpointing(
+    root: nn.Module, targets: Sequence[str], use_reentrant: bool = False
+) -> int:
+    """Checkpoint each block under the given submodule paths; returns the count.
+
+    A target naming a container (`nn.ModuleList` / `nn.Sequential`) checkpoints
+    every child block separately; any other module is checkpointed as a whole.
+    """
+    count = 0
+    for target in targets:
+        sub = root.get_submodule(target)
+        blocks = (
+            list(sub.children())
+            if isinstance(sub, (nn.ModuleList, nn.Sequential))
+            else [sub]
+        )
+        for block in blocks:
+            block.forward = _CheckpointedForward(block, use_reentrant=use_reentrant)
+            count += 1
+    return count
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import pytorch_lightning as pl
+import torch
+from hydra.utils import instantiate
+from loguru import logger
+from omegaconf import DictConfig, OmegaConf
+
+from spatiotemporal_lab.models.checkpointing import apply_activation_checkpointing
+
+# Keys under cfg.model consumed here rather than passed to the model constructor.
+_FACTORY_KEYS = ("name", "activation_checkpointing")
+
+
+def build_lightning_module(cfg: DictConfig) -> pl.LightningModule:
+    params = OmegaConf.to_container(cfg.model, resolve=True)
+    for key in _FACTORY_KEYS:
+        params.pop(key, None)
+    lm = instantiate(params)
+
+    ckpt_cfg = cfg.model.get("activation_checkpointing", None) or {}
+    if bool(ckpt_cfg.get("enabled", False)):
+        targets = list(ckpt_cfg.get("modules", ["blocks"]))
+        n = apply_activation_checkpointing(
+            lm, targets, use_reentrant=bool(ckpt_cfg.get("use_reentrant", False))
+        )
+        logger.info("Activation checkpointing enabled on {} block(s).", n)
+
+    return apply_runtime_profile(cfg, lm)
+
+
+def apply_runtime_profile(
+    cfg: DictConfig, lm: pl.LightningModule
+) -> pl.LightningModule:
+    """Apply memory-format and compilation settings from `cfg.trainer`."""
+    if bool(cfg.trainer.get("channels_last", False)):
+        lm = lm.to(memory_format=torch.channels_last)
+        logger.info("Model parameters converted to channels_last.")
+
+    compile_cfg = cfg.trainer.get("compile", None) or {}
+    if bool(compile_cfg.get("enabled", False)):
+        mode = compile_cfg.get("mode", "default")
+        logger.info("Compiling LightningModule with torch.compile (mode={}).", mode)
+        lm = torch.compile(
+            lm,
+            mode=None if mode == "default" else mode,
+            fullgraph=bool(compile_cfg.get("fullgraph", False)),
+            dynamic=compile_cfg.get("dynamic", None),
+        )
+    return lm
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Annotated, Any, Optional, Tuple
+
+import numpy as np
+from pydantic import GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic_core import core_schema
+
+
+@dataclass(frozen=True)
+class NumpyArray:
+    """Pydantic annotation for `np.ndarray` fields validated by shape and dtype.
+
+    Input is converted with one `np.asarray` call instead of validating every
+    element as a Python float. `shape` entries of `None` match any size. JSON
+    output goes through `tolist()`.
+    """
+
+    dtype: str = "float32"
+    ndim: Optional[int] = None
+    shape: Optional[Tuple[Optional[int], ...]] = None
+
+    def validate(self, value: Any) -> np.ndarray:
+        try:
+            arr = np.asarray(value, dtype=self.dtype)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"expected a rectangular {self.dtype} array: {e}") from e
+        if self.ndim is not None and arr.ndim != self.ndim:
+            raise ValueError(f"expected {self.ndim} dimensions, got shape {arr.shape}")
+        if self.shape is not None and (
+            len(arr.shape) != len(self.shape)
+            or any(e is not None and e != s for s, e in zip(arr.shape, self.shape))
+        ):
+            raise ValueError(f"expected shape {self.shape}, got {arr.shape}")
+        return arr
+
+    def __get_pydantic_core_schema__(
+        self, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            self.validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda a: a.tolist(), when_used="json"
+            ),
+        )
+
+    def __get_pydantic_json_schema__(
+        self, schema: core_schema.CoreSchema, handler: GetJsonSchemaHandler
+    ) -> dict[str, Any]:
+        item: dict[str, Any] = {"type": "number"}
+        for _ in range(self.ndim or (len(self.shape) if self.shape else 1)):
+            item = {"type": "array", "items": item}
+        return item
+
+
+FloatMatrix = Annotated[np.ndarray, NumpyArray(ndim=2)]
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field
 
-from pydantic import BaseModel, Field
+from .arrays import FloatMatrix
 
 
 class PredictRequest(BaseModel):
-    inputs: List[List[float]] = Field(..., description="Batch of feature vectors")
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inputs: FloatMatrix = Field(..., description="Batch of feature vectors")
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field
 
-from pydantic import BaseModel, Field
+from .arrays import FloatMatrix
 
 
 class PredictResponse(BaseModel):
-    probabilities: List[List[float]] = Field(
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    probabilities: FloatMatrix = Field(
         ..., description="Per-class probabilities for each input"
     )
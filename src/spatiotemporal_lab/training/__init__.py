@@ -1 +1,21 @@
-# Package marker
+# Package marker; public names resolve lazily (torch/Lightning load on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "AsyncShardedCheckpoint": "async_checkpoint",
+        "ShardedCheckpointIO": "async_checkpoint",
+        "ShardedCheckpointLoader": "async_checkpoint",
+        "load_sharded_checkpoint": "async_checkpoint",
+        "MlflowBatchLightningLogger": "loggers",
+        "PeakMemoryCallback": "memory",
+        "StackSampler": "profiling",
+        "StepTimingCallback": "profiling",
+        "TorchProfilerCallback": "profiling",
+        "build_profiling_callbacks": "profiling",
+        "build_trainer": "loops",
+        "configure_torch_runtime": "loops",
+        "fit": "loops",
+    },
+)
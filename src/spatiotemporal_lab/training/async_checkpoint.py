@@ -0,0 +1,235 @@
+"""Asynchronous, sharded checkpointing.
+
+- `AsyncShardedCheckpoint` is a drop-in `ModelCheckpoint`: it snapshots the
+  checkpoint to CPU memory on the training thread and hands the write to a
+  background thread, so the loop only pays for the copy.
+- `ShardedCheckpointIO` writes a checkpoint as a directory of tensor shards
+  plus an index; only `AsyncShardedCheckpoint` saves through it.
+- `ShardedCheckpointLoader` is the trainer plugin: it saves single-file
+  checkpoints exactly like `TorchCheckpointIO`, and on load recognizes sharded
+  directories and maps their shards with `torch.load(mmap=True)`, so resuming
+  does not read the whole checkpoint into RAM.
+
+Layout of a sharded checkpoint (`<name>.ckpt/`)::
+
+    index.pt          # checkpoint dict with tensors replaced by shard refs
+    shard_00000.pt    # {key: tensor}, at most `max_shard_mb` unless a single
+    shard_00001.pt    # tensor is larger than that
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from weakref import proxy
+
+import pytorch_lightning as pl
+import torch
+from lightning_fabric.plugins.io.torch_io import TorchCheckpointIO
+from lightning_utilities.core.apply_func import apply_to_collection
+from loguru import logger
+from pytorch_lightning.callbacks import ModelCheckpoint
+from pytorch_lightning.loggers import Logger
+
+_INDEX_FILE = "index.pt"
+
+
+@dataclass(frozen=True)
+class _ShardRef:
+    shard: int
+    key: str
+
+
+def is_sharded_checkpoint(path: Any) -> bool:
+    return (Path(path) / _INDEX_FILE).is_file()
+
+
+class ShardedCheckpointLoader(TorchCheckpointIO):
+    """`TorchCheckpointIO` that can also load and remove sharded directories."""
+
+    def __init__(self, mmap: bool = True):
+        super().__init__()
+        self.mmap = mmap
+
+    def load_checkpoint(
+        self, path: Any, map_location: Optional[Any] = None, **kwargs: Any
+    ) -> Dict[str, Any]:
+        if not is_sharded_checkpoint(path):
+            return super().load_checkpoint(path, map_location=map_location, **kwargs)
+        return load_sharded_checkpoint(path, map_location=map_location, mmap=self.mmap)
+
+    def remove_checkpoint(self, path: Any) -> None:
+        if Path(path).is_dir():
+            shutil.rmtree(path)
+            return
+        super().remove_checkpoint(path)
+
+
+class ShardedCheckpointIO(ShardedCheckpointLoader):
+    def __init__(self, max_shard_mb: float = 512.0, mmap: bool = True):
+        super().__init__(mmap=mmap)
+        self.max_shard_bytes = int(max_shard_mb * 1024 * 1024)
+
+    def save_checkpoint(
+        self,
+        checkpoint: Dict[str, Any],
+        path: Any,
+        storage_options: Optional[Any] = None,
+    ) -> None:
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        tmp.mkdir(parents=True)
+
+        shards: List[Dict[str, torch.Tensor]] = [{}]
+        shard_bytes = [0]
+
+        def _to_ref(t: torch.Tensor) -> _ShardRef:
+            nbytes = t.numel() * t.element_size()
+            if shards[-1] and shard_bytes[-1] + nbytes > self.max_shard_bytes:
+                shards.append({})
+                shard_bytes.append(0)
+            key = f"t{len(shards[-1])}"
+            shards[-1][key] = t
+            shard_bytes[-1] += nbytes
+            return _ShardRef(len(shards) - 1, key)
+
+        skeleton = apply_to_collection(checkpoint, torch.Tensor, _to_ref)
+        for i, shard in enumerate(shards):
+            torch.save(shard, tmp / f"shard_{i:05d}.pt")
+        torch.save(skeleton, tmp / _INDEX_FILE)
+
+        # Swap in the finished directory so a crash never leaves a partial checkpoint.
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+        os.replace(tmp, path)
+
+
+def load_sharded_checkpoint(
+    path: Any, map_location: Optional[Any] = "cpu", mmap: bool = True
+) -> Dict[str, Any]:
+    """Load a sharded checkpoint; with `mmap=True` tensors stay file-backed until touched."""
+    path = Path(path)
+    skeleton = torch.load(
+        path / _INDEX_FILE, map_location=map_location, weights_only=False
+    )
+    shard_files = sorted(path.glob("shard_*.pt"))
+    shards = [
+        torch.load(f, map_location=map_location, mmap=mmap, weights_only=True)
+        for f in shard_files
+    ]
+    return apply_to_collection(skeleton, _ShardRef, lambda r: shards[r.shard][r.key])
+
+
+def _snapshot(t: torch.Tensor) -> torch.Tensor:
+    # Point-in-time CPU copy taken on the training thread.
+    return t.detach().to("cpu", copy=True)
+
+
+class AsyncShardedCheckpoint(ModelCheckpoint):
+    """`ModelCheckpoint` that writes sharded checkpoints on a background thread.
+
+    Accepts every `ModelCheckpoint` argument (monitor, top-k, filename, ...).
+    Writes and removals go through one worker thread, so they apply in order;
+    pending writes are flushed at the end of training and on exceptions.
+    Loggers get `after_save_checkpoint` on the training thread once the write
+    has finished, so they never see a checkpoint that is still being written.
+    """
+
+    def __init__(self, *args: Any, max_shard_mb: float = 512.0, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._io = ShardedCheckpointIO(max_shard_mb=max_shard_mb)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Tuple[Future, List[Logger]]] = []
+
+    def _submit(self, fn: Any, *args: Any, notify: Sequence[Logger] = ()) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="ckpt-writer"
+            )
+        self._collect()
+        self._pending.append((self._executor.submit(fn, *args), list(notify)))
+
+    def _collect(self, block: bool = False) -> None:
+        """Notify loggers of finished writes; re-raise the first writer error.
+
+        With `block=False` only writes that are already done are collected.
+        """
+        while self._pending:
+            fut, notify = self._pending[0]
+            if not (block or fut.done()):
+                return
+            self._pending.pop(0)
+            fut.result()
+            for pl_logger in notify:
+                pl_logger.after_save_checkpoint(proxy(self))
+
+    def wait(self) -> None:
+        """Block until every queued write/removal has finished."""
+        self._collect(block=True)
+
+    def _save_checkpoint(self, trainer: "pl.Trainer", filepath: str) -> None:
+        checkpoint = trainer._checkpoint_connector.dump_checkpoint(
+            self.save_weights_only
+        )
+        if trainer.is_global_zero:
+            snapshot = apply_to_collection(checkpoint, torch.Tensor, _snapshot)
+            self._submit(
+                self._io.save_checkpoint, snapshot, filepath, notify=trainer.loggers
+            )
+        self._last_global_step_saved = trainer.global_step
+        self._last_checkpoint_saved = filepath
+
+    def _remove_checkpoint(self, trainer: "pl.Trainer", filepath: str) -> None:
+        if trainer.is_global_zero:
+            self._submit(self._io.remove_checkpoint, filepath)
+
+    def on_train_batch_end(
+        self, trainer: "pl.Trainer", pl_module: "pl.LightningModule", *args: Any
+    ) -> None:
+        super().on_train_batch_end(trainer, pl_module, *args)
+        self._collect()
+
+    def on_train_end(
+        self, trainer: "pl.Trainer", pl_module: "pl.LightningModule"
+    ) -> None:
+        super().on_train_end(trainer, pl_module)
+        self.wait()
+
+    def on_exception(
+        self,
+        trainer: "pl.Trainer",
+        pl_module: "pl.LightningModule",
+        exception: BaseException,
+    ) -> None:
+        # Flush what can still be written, but never mask the original error:
+        # writer failures are logged, before and after the exception save.
+        self._flush_logging_errors(exception)
+        super().on_exception(trainer, pl_module, exception)
+        self._flush_logging_errors(exception)
+
+    def _flush_logging_errors(self, exception: BaseException) -> None:
+        while self._pending:
+            try:
+                self.wait()
+            except Exception:
+                logger.exception(
+                    "Checkpoint write failed while handling {}",
+                    type(exception).__name__,
+                )
+
+    def teardown(
+        self, trainer: "pl.Trainer", pl_module: "pl.LightningModule", stage: str
+    ) -> None:
+        super().teardown(trainer, pl_module, stage)
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,57 @@
+"""Lightning logger that feeds the MLflow batch queue."""
+
+from __future__ import annotations
+
+from argparse import Namespace
+from typing import Any, Dict, Mapping, Optional
+
+from pytorch_lightning.loggers import Logger
+from pytorch_lightning.utilities import rank_zero_only
+
+from spatiotemporal_lab.integrations.mlflow import BatchedMlflowLogger
+
+
+def flatten_params(params: Any, prefix: str = "", sep: str = "/") -> Dict[str, Any]:
+    """Flatten nested mappings/namespaces into ``{"a/b": value}`` leaves."""
+    if isinstance(params, Namespace):
+        params = vars(params)
+    flat: Dict[str, Any] = {}
+    for key, value in (params or {}).items():
+        name = f"{prefix}{sep}{key}" if prefix else str(key)
+        if isinstance(value, Namespace):
+            value = vars(value)
+        if isinstance(value, Mapping) and value:
+            flat.update(flatten_params(value, name, sep))
+        else:
+            flat[name] = value
+    return flat
+
+
+class MlflowBatchLightningLogger(Logger):
+    """Routes `self.log(...)` metrics and hyperparameters to the batch queue."""
+
+    def __init__(self, batch_logger: BatchedMlflowLogger):
+        super().__init__()
+        self._batch_logger = batch_logger
+
+    @property
+    def name(self) -> str:
+        return "mlflow-batch"
+
+    @property
+    def version(self) -> str:
+        return self._batch_logger.run_id
+
+    @rank_zero_only
+    def log_metrics(
+        self, metrics: Mapping[str, float], step: Optional[int] = None
+    ) -> None:
+        self._batch_logger.log_metrics(metrics, step=step)
+
+    @rank_zero_only
+    def log_hyperparams(self, params: Any, *args: Any, **kwargs: Any) -> None:
+        self._batch_logger.log_params(flatten_params(params))
+
+    @rank_zero_only
+    def finalize(self, status: str) -> None:
+        self._batch_logger.flush()
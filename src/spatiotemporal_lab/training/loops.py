@@ -1,25 +1,158 @@
 from __future__ import annotations
 
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Union
+
 import pytorch_lightning as pl
+import torch
+from hydra.utils import instantiate
 from loguru import logger
 from omegaconf import DictConfig
+from pytorch_lightning.loggers import Logger
+from pytorch_lightning.strategies import DDPStrategy, Strategy
+
+from spatiotemporal_lab.integrations.mlflow import active_batch_logger
+from spatiotemporal_lab.training.async_checkpoint import ShardedCheckpointLoader
+from spatiotemporal_lab.training.loggers import MlflowBatchLightningLogger
+from spatiotemporal_lab.training.profiling import build_profiling_callbacks
+
+_DDP_STRATEGIES = ("ddp", "ddp_spawn")
+
+
+def configure_torch_runtime(cfg: DictConfig) -> Dict[str, Any]:
+    """Process-wide torch settings from `cfg.trainer` (threads, matmul precision).
+
+    Returns the settings in effect afterwards, whether or not they were changed.
+    """
+    num_threads: Optional[int] = cfg.trainer.get("num_threads", None)
+    if num_threads:
+        torch.set_num_threads(int(num_threads))
+        logger.info("torch intra-op threads: {}", torch.get_num_threads())
+
+    num_interop_threads: Optional[int] = cfg.trainer.get("num_interop_threads", None)
+    if num_interop_threads:
+        try:
+            torch.set_num_interop_threads(int(num_interop_threads))
+            logger.info("torch inter-op threads: {}", torch.get_num_interop_threads())
+        except RuntimeError:
+            # Can only be set once, before any inter-op parallel work has started.
+            logger.warning(
+                "Could not set inter-op threads (already initialized); keeping {}.",
+                torch.get_num_interop_threads(),
+            )
+
+    matmul_precision: Optional[str] = cfg.trainer.get("matmul_precision", None)
+    if matmul_precision:
+        torch.set_float32_matmul_precision(str(matmul_precision))
+
+    return {
+        "num_threads": torch.get_num_threads(),
+        "num_interop_threads": torch.get_num_interop_threads(),
+        "matmul_precision": torch.get_float32_matmul_precision(),
+    }
+
+
+def build_strategy(cfg: DictConfig) -> Union[str, Strategy]:
+    """Resolve `cfg.trainer.strategy`; DDP variants are configured from `cfg.trainer.ddp`."""
+    name = str(cfg.trainer.get("strategy", "auto"))
+    if name not in _DDP_STRATEGIES:
+        return name
+
+    ddp_cfg = cfg.trainer.get("ddp", None) or {}
+    backend = ddp_cfg.get("process_group_backend", None)
+    if backend is None and cfg.trainer.get("accelerator", "auto") == "cpu":
+        backend = "gloo"
+
+    start_method = "spawn" if name == "ddp_spawn" else "popen"
+    logger.info(
+        "Using DDP (start_method={}, backend={}, num_nodes={}).",
+        start_method,
+        backend or "auto",
+        cfg.trainer.get("num_nodes", 1),
+    )
+    return DDPStrategy(
+        start_method=start_method,
+        process_group_backend=backend,
+        timeout=timedelta(seconds=int(ddp_cfg.get("timeout_s", 1800))),
+        bucket_cap_mb=ddp_cfg.get("bucket_cap_mb", 25),
+        gradient_as_bucket_view=bool(ddp_cfg.get("gradient_as_bucket_view", True)),
+        find_unused_parameters=bool(ddp_cfg.get("find_unused_parameters", False)),
+        static_graph=bool(ddp_cfg.get("static_graph", False)),
+    )
+
+
+def build_callbacks(cfg: DictConfig) -> List[pl.Callback]:
+    """Instantiate `cfg.trainer.callbacks` (null entries skipped) plus `cfg.profiling` hooks."""
+    callbacks_cfg = cfg.trainer.get("callbacks", None) or {}
+    callbacks = [
+        instantiate(cb_cfg)
+        for cb_cfg in callbacks_cfg.values()
+        if cb_cfg is not None and "_target_" in cb_cfg
+    ]
+    sampler_cfg = (cfg.get("data", None) or {}).get("sampler", None) or {}
+    if str(sampler_cfg.get("name", "uniform")) == "importance":
+        from spatiotemporal_lab.data.importance import ImportanceUpdateCallback
+
+        if not any(isinstance(cb, ImportanceUpdateCallback) for cb in callbacks):
+            logger.warning(
+                "Importance sampler without ImportanceUpdateCallback: priorities "
+                "will not be refreshed (select trainer/callbacks=performance)."
+            )
+    return callbacks + build_profiling_callbacks(cfg)
+
+
+def build_loggers(cfg: DictConfig) -> Union[bool, List[Logger]]:
+    """Route Lightning metrics to the active MLflow batch logger when there is one."""
+    batch_logger = active_batch_logger()
+    log_metrics = bool((cfg.get("mlflow", None) or {}).get("log_metrics", True))
+    if batch_logger is None or not log_metrics:
+        return True
+    return [MlflowBatchLightningLogger(batch_logger)]
 
 
 def build_trainer(cfg: DictConfig) -> pl.Trainer:
+    configure_torch_runtime(cfg)
+
     max_epochs = int(cfg.trainer.get("max_epochs", 3))
+    max_steps = int(cfg.trainer.get("max_steps", -1))
+    limit_train_batches = cfg.trainer.get("limit_train_batches", None)
+    limit_val_batches = cfg.trainer.get("limit_val_batches", None)
     accelerator = cfg.trainer.get("accelerator", "auto")
     devices = cfg.trainer.get("devices", "auto")
+    num_nodes = int(cfg.trainer.get("num_nodes", 1))
+    accumulate_grad_batches = int(cfg.trainer.get("accumulate_grad_batches", 1))
+    use_distributed_sampler = bool(cfg.trainer.get("use_distributed_sampler", False))
+    precision = str(cfg.trainer.get("precision", "32"))
+    deterministic = cfg.trainer.get("deterministic", None)
+    benchmark = cfg.trainer.get("benchmark", None)
     log_every_n_steps = int(cfg.trainer.get("log_every_n_steps", 50))
     enable_checkpointing = bool(cfg.trainer.get("enable_checkpointing", True))
     enable_progress_bar = bool(cfg.trainer.get("enable_progress_bar", True))
+    fast_dev_run = cfg.trainer.get("fast_dev_run", False)
+    mmap_checkpoints = bool(cfg.trainer.get("mmap_checkpoints", True))
 
     return pl.Trainer(
         max_epochs=max_epochs,
+        max_steps=max_steps,
+        limit_train_batches=limit_train_batches,
+        limit_val_batches=limit_val_batches,
         accelerator=accelerator,
         devices=devices,
+        num_nodes=num_nodes,
+        strategy=build_strategy(cfg),
+        callbacks=build_callbacks(cfg),
+        logger=build_loggers(cfg),
+        # Saves plain .ckpt files; also resumes from sharded directories (mmap).
+        plugins=[ShardedCheckpointLoader(mmap=mmap_checkpoints)],
+        accumulate_grad_batches=accumulate_grad_batches,
+        use_distributed_sampler=use_distributed_sampler,
+        precision=precision,
+        deterministic=deterministic,
+        benchmark=benchmark,
         log_every_n_steps=log_every_n_steps,
         enable_checkpointing=enable_checkpointing,
         enable_progress_bar=enable_progress_bar,
+        fast_dev_run=fast_dev_run,
     )
 
 
@@ -30,5 +163,9 @@ def fit(
 ) -> pl.Trainer:
     trainer = build_trainer(cfg)
     logger.info("Fitting model...")
-    trainer.fit(lightning_module, datamodule=datamodule)
+    trainer.fit(
+        lightning_module,
+        datamodule=datamodule,
+        ckpt_path=cfg.trainer.get("ckpt_path", None),
+    )
     return trainer
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import resource
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+import pytorch_lightning as pl
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident set size, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, KiB elsewhere.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MiB (Linux only; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except OSError:
+        return None
+    return pages * resource.getpagesize() / (1024 * 1024)
+
+
+class PeakMemoryCallback(pl.Callback):
+    """Logs host RSS during training and optionally writes a JSON summary.
+
+    The summary (`report_path`) carries the effective batch configuration next
+    to the peak RSS, so runs with different activation checkpointing /
+    accumulation settings can be compared directly (see `tools/memory_report.py`).
+    """
+
+    def __init__(self, log_every_n_steps: int = 50, report_path: Optional[str] = None):
+        super().__init__()
+        self.log_every_n_steps = max(1, int(log_every_n_steps))
+        self.report_path = report_path
+        self._baseline_mb = 0.0
+
+    def on_train_start(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        self._baseline_mb = peak_rss_mb()
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        if trainer.global_step % self.log_every_n_steps != 0:
+            return
+        metrics = {"mem/peak_rss_mb": peak_rss_mb()}
+        rss = current_rss_mb()
+        if rss is not None:
+            metrics["mem/rss_mb"] = rss
+        pl_module.log_dict(metrics, on_step=True, on_epoch=False, rank_zero_only=True)
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
+        if not self.report_path or not trainer.is_global_zero:
+            return
+        dm = trainer.datamodule
+        dm_cfg = getattr(dm, "dm_cfg", None)
+        report = {
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_before_train_mb": self._baseline_mb,
+            "global_step": trainer.global_step,
+            "batch_size": getattr(dm_cfg, "batch_size", None),
+            "accumulate_grad_batches": trainer.accumulate_grad_batches,
+            "precision": str(trainer.precision),
+        }
+        path = Path(self.report_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
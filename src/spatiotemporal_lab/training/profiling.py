@@ -0,0 +1,365 @@
+"""Training profiling hooks, driven by `cfg.profiling`.
+
+- `StepTimingCallback` splits every training step into data wait, forward,
+  backward and optimizer time and logs them as `time/*_ms` metrics; a summary
+  is written to `step_timing.json`.
+- `StackSampler` samples the training thread's Python stack at a fixed
+  interval (py-spy style, in-process) and writes folded stacks prefixed with
+  the current phase (`phase;file:function;... count`), which flamegraph.pl,
+  speedscope and inferno read directly.
+- `TorchProfilerCallback` runs `torch.profiler` over a window of steps and
+  exports a Chrome trace, a folded-stack file and an op summary table.
+
+Everything is written to `cfg.profiling.output_dir` on global rank zero.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytorch_lightning as pl
+import torch
+from loguru import logger
+from omegaconf import DictConfig
+
+_PHASES = ("data", "forward", "backward", "optimizer")
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a background thread."""
+
+    def __init__(self, interval_ms: float = 10.0, max_depth: int = 64):
+        self.interval_s = max(0.001, float(interval_ms) / 1000.0)
+        self.max_depth = int(max_depth)
+        self.phase = "other"
+        self.samples: Counter = Counter()
+        self._target_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, thread_id: Optional[int] = None) -> None:
+        self._target_id = thread_id or threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="stack-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join([self.phase, *reversed(stack)])] += 1
+
+    def write_folded(self, path: Path) -> None:
+        lines = [f"{stack} {count}" for stack, count in self.samples.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class StepTimingCallback(pl.Callback):
+    """Per-step wall time by phase; optionally tags a `StackSampler` with the phase.
+
+    Data wait is the gap between the end of one training batch and the start
+    of the next, i.e. time spent fetching the batch (plus loop overhead).
+    """
+
+    def __init__(
+        self,
+        log_every_n_steps: int = 50,
+        output_dir: Optional[str] = None,
+        sampler: Optional[StackSampler] = None,
+    ):
+        super().__init__()
+        self.log_every_n_steps = max(1, int(log_every_n_steps))
+        self.output_dir = output_dir
+        self.sampler = sampler
+        self._marks: Dict[str, float] = {}
+        self._last_end: Optional[float] = None
+        self._totals_s: Dict[str, float] = dict.fromkeys(_PHASES, 0.0)
+        self._steps = 0
+
+    def _set_phase(self, phase: str) -> None:
+        if self.sampler is not None:
+            self.sampler.phase = phase
+
+    def on_train_start(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        if self.sampler is not None and trainer.is_global_zero:
+            self.sampler.start()
+
+    def on_train_epoch_start(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        self._last_end = time.perf_counter()
+        self._set_phase("data")
+
+    def on_train_batch_start(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        now = time.perf_counter()
+        self._marks = {"start": now}
+        if self._last_end is not None:
+            self._marks["data_s"] = now - self._last_end
+        self._set_phase("forward")
+
+    def on_before_backward(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule, loss: torch.Tensor
+    ) -> None:
+        self._marks["backward_start"] = time.perf_counter()
+        self._set_phase("backward")
+
+    def on_after_backward(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        self._marks["backward_end"] = time.perf_counter()
+        self._set_phase("other")
+
+    def on_before_optimizer_step(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        optimizer: torch.optim.Optimizer,
+    ) -> None:
+        self._marks["optimizer_start"] = time.perf_counter()
+        self._set_phase("optimizer")
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        end = time.perf_counter()
+        m = self._marks
+        start = m.get("start", end)
+        phases = {
+            "data": m.get("data_s", 0.0),
+            "forward": m.get("backward_start", end) - start,
+            "backward": m.get("backward_end", m.get("backward_start", end))
+            - m.get("backward_start", end),
+            # Without a step this batch (gradient accumulation) there is no optimizer time.
+            "optimizer": end - m["optimizer_start"] if "optimizer_start" in m else 0.0,
+        }
+        for name, seconds in phases.items():
+            self._totals_s[name] += seconds
+        self._steps += 1
+        self._last_end = end
+        self._set_phase("data")
+
+        if trainer.global_step % self.log_every_n_steps != 0:
+            return
+        step_s = phases["data"] + (end - start)
+        metrics = {f"time/{name}_ms": s * 1000.0 for name, s in phases.items()}
+        metrics["time/step_ms"] = step_s * 1000.0
+        metrics["time/data_wait_frac"] = phases["data"] / step_s if step_s else 0.0
+        pl_module.log_dict(metrics, on_step=True, on_epoch=False, rank_zero_only=True)
+
+    def on_validation_start(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        self._set_phase("validation")
+
+    def on_validation_end(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        # The next training batch is timed from here, not from before validation.
+        self._last_end = time.perf_counter()
+        self._set_phase("data")
+
+    def summary(self) -> Dict[str, Any]:
+        total = sum(self._totals_s.values())
+        return {
+            "steps": self._steps,
+            "mean_ms": {
+                k: 1000.0 * v / max(1, self._steps) for k, v in self._totals_s.items()
+            },
+            "fraction": {
+                k: v / total if total else 0.0 for k, v in self._totals_s.items()
+            },
+        }
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
+        if self.sampler is not None:
+            self.sampler.stop()
+        if not self.output_dir or not trainer.is_global_zero:
+            return
+        out = Path(self.output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        summary = self.summary()
+        (out / "step_timing.json").write_text(
+            json.dumps(summary, indent=2), encoding="utf-8"
+        )
+        logger.info(
+            "Step time split: {}",
+            ", ".join(f"{k}={v:.0%}" for k, v in summary["fraction"].items()),
+        )
+        if self.sampler is not None:
+            self.sampler.write_folded(out / "python_stacks.folded")
+
+
+class TorchProfilerCallback(pl.Callback):
+    """Profiles training steps `[wait + warmup, wait + warmup + active)` with torch.profiler.
+
+    Per profiled cycle writes `torch_trace_<step>.json` (chrome://tracing,
+    Perfetto), `torch_stacks_<step>.folded` (with `with_stack`) and
+    `torch_ops_<step>.txt` (top ops by self CPU time).
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        wait: int = 5,
+        warmup: int = 2,
+        active: int = 5,
+        repeat: int = 1,
+        record_shapes: bool = True,
+        profile_memory: bool = False,
+        with_stack: bool = True,
+        row_limit: int = 30,
+    ):
+        super().__init__()
+        self.output_dir = Path(output_dir)
+        self.schedule = torch.profiler.schedule(
+            wait=wait, warmup=warmup, active=active, repeat=repeat
+        )
+        self.record_shapes = record_shapes
+        self.profile_memory = profile_memory
+        self.with_stack = with_stack
+        self.row_limit = row_limit
+        self._profiler: Optional[torch.profiler.profile] = None
+
+    def _on_trace_ready(self, prof: torch.profiler.profile) -> None:
+        step = prof.step_num
+        prof.export_chrome_trace(str(self.output_dir / f"torch_trace_{step}.json"))
+        if self.with_stack:
+            prof.export_stacks(
+                str(self.output_dir / f"torch_stacks_{step}.folded"),
+                "self_cpu_time_total",
+            )
+        table = prof.key_averages().table(
+            sort_by="self_cpu_time_total", row_limit=self.row_limit
+        )
+        (self.output_dir / f"torch_ops_{step}.txt").write_text(table, encoding="utf-8")
+        logger.info("torch.profiler trace written for step {}.", step)
+
+    def on_train_start(
+        self, trainer: pl.Trainer, pl_module: pl.LightningModule
+    ) -> None:
+        if not trainer.is_global_zero:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        activities = [torch.profiler.ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(torch.profiler.ProfilerActivity.CUDA)
+        experimental_config = None
+        if self.with_stack:
+            from torch.profiler import _ExperimentalConfig
+
+            # Without verbose mode export_stacks() writes an empty file.
+            experimental_config = _ExperimentalConfig(verbose=True)
+        self._profiler = torch.profiler.profile(
+            activities=activities,
+            schedule=self.schedule,
+            on_trace_ready=self._on_trace_ready,
+            record_shapes=self.record_shapes,
+            profile_memory=self.profile_memory,
+            with_stack=self.with_stack,
+            experimental_config=experimental_config,
+        )
+        self._profiler.__enter__()
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        outputs: Any,
+        batch: Any,
+        batch_idx: int,
+    ) -> None:
+        if self._profiler is not None:
+            self._profiler.step()
+
+    def _close(self) -> None:
+        if self._profiler is not None:
+            self._profiler.__exit__(None, None, None)
+            self._profiler = None
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:
+        self._close()
+
+    def on_exception(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,
+        exception: BaseException,
+    ) -> None:
+        self._close()
+
+
+def build_profiling_callbacks(cfg: DictConfig) -> List[pl.Callback]:
+    """Callbacks for `cfg.profiling` (empty unless `profiling.enabled`)."""
+    prof_cfg = cfg.get("profiling", None) or {}
+    if not bool(prof_cfg.get("enabled", False)):
+        return []
+    output_dir = str(prof_cfg.get("output_dir", "profiling"))
+    callbacks: List[pl.Callback] = []
+
+    sampler_cfg = prof_cfg.get("sampler", None) or {}
+    sampler = None
+    if bool(sampler_cfg.get("enabled", True)):
+        sampler = StackSampler(
+            interval_ms=float(sampler_cfg.get("interval_ms", 10.0)),
+            max_depth=int(sampler_cfg.get("max_depth", 64)),
+        )
+
+    timing_cfg = prof_cfg.get("step_timing", None) or {}
+    if bool(timing_cfg.get("enabled", True)) or sampler is not None:
+        callbacks.append(
+            StepTimingCallback(
+                log_every_n_steps=int(timing_cfg.get("log_every_n_steps", 50)),
+                output_dir=output_dir,
+                sampler=sampler,
+            )
+        )
+
+    torch_cfg = prof_cfg.get("torch_profiler", None) or {}
+    if bool(torch_cfg.get("enabled", True)):
+        callbacks.append(
+            TorchProfilerCallback(
+                output_dir=output_dir,
+                wait=int(torch_cfg.get("wait", 5)),
+                warmup=int(torch_cfg.get("warmup", 2)),
+                active=int(torch_cfg.get("active", 5)),
+                repeat=int(torch_cfg.get("repeat", 1)),
+                record_shapes=bool(torch_cfg.get("record_shapes", True)),
+                profile_memory=bool(torch_cfg.get("profile_memory", False)),
+                with_stack=bool(torch_cfg.get("with_stack", True)),
+                row_limit=int(torch_cfg.get("row_limit", 30)),
+            )
+        )
+    return callbacks
@@ -1 +1,11 @@
-# Package marker
+# Package marker; public names resolve lazily (torch loads on first use).
+from spatiotemporal_lab.utils.lazy import lazy_exports
+
+__getattr__, __dir__, __all__ = lazy_exports(
+    __name__,
+    {
+        "lazy_exports": "lazy",
+        "repo_root": "paths",
+        "seed_everything": "seed",
+    },
+)
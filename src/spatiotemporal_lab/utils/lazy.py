@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+
+def lazy_exports(
+    package: str, exports: Mapping[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """PEP 562 hooks that import `package.<submodule>` only when a name is used.
+
+    `exports` maps public name -> submodule (relative to `package`). Returns
+    `(__getattr__, __dir__, __all__)` for the package `__init__` to bind::
+
+        __getattr__, __dir__, __all__ = lazy_exports(__name__, {"fit": "loops"})
+    """
+    resolved: Dict[str, Any] = {}
+
+    def __getattr__(name: str) -> Any:
+        if name in resolved:
+            return resolved[name]
+        submodule = exports.get(name)
+        if submodule is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{submodule}"), name)
+        resolved[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(exports)
+
+    return __getattr__, __dir__, sorted(exports)
@@ -0,0 +1,45 @@
+import pytest
+import pytorch_lightning as pl
+import torch
+from omegaconf import OmegaConf
+
+from spatiotemporal_lab.data.factory import build_datamodule
+from spatiotemporal_lab.training.loops import build_trainer
+
+
+class _TinyClassifier(pl.LightningModule):
+    def __init__(self, n_features: int = 8, n_classes: int = 2):
+        super().__init__()
+        self.net = torch.nn.Linear(n_features, n_classes)
+
+    def training_step(self, batch, batch_idx):
+        x, y = batch
+        return torch.nn.functional.cross_entropy(self.net(x), y)
+
+    def configure_optimizers(self):
+        return torch.optim.SGD(self.parameters(), lr=0.1)
+
+
+@pytest.mark.slow
+def test_ddp_gloo_two_process_fit(tmp_path) -> None:
+    cfg = OmegaConf.create(
+        {
+            "seed": 0,
+            "data": {"n_samples": 64, "n_features": 8, "batch_size": 8},
+            "trainer": {
+                "max_epochs": 1,
+                "accelerator": "cpu",
+                "devices": 2,
+                "strategy": "ddp_spawn",
+                "accumulate_grad_batches": 2,
+                "ddp": {"bucket_cap_mb": 1},
+                "enable_progress_bar": False,
+                "enable_checkpointing": False,
+            },
+        }
+    )
+    trainer = build_trainer(cfg)
+    trainer.fit(_TinyClassifier(), datamodule=build_datamodule(cfg))
+
+    assert trainer.world_size == 2
+    assert trainer.state.finished
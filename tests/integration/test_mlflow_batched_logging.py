@@ -0,0 +1,45 @@
+import pytest
+from omegaconf import OmegaConf
+
+mlflow = pytest.importorskip("mlflow")
+
+from spatiotemporal_lab.integrations.mlflow import (  # noqa: E402
+    active_batch_logger,
+    maybe_init_mlflow,
+    set_standard_tags,
+)
+
+
+def test_batched_logging_flushes_on_context_exit(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("MLFLOW_TRACKING_URI", raising=False)
+    # Recent MLflow releases gate the file store behind an explicit opt-in.
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    cfg = OmegaConf.create(
+        {
+            "project": {"name": "test-project", "env": "ci"},
+            "model": {"name": "tiny"},
+            "data": {"name": "synthetic"},
+            "mlflow": {
+                "enabled": True,
+                "tracking_uri": f"file:{tmp_path / 'mlruns'}",
+                # Large thresholds: nothing is sent until the context exits.
+                "async_logging": {"max_batch_size": 10_000, "flush_interval_s": 60},
+            },
+        }
+    )
+
+    with maybe_init_mlflow(cfg) as run:
+        set_standard_tags(cfg)
+        batch_logger = active_batch_logger()
+        for step in range(250):
+            batch_logger.log_metrics({"train_loss": 1.0 / (step + 1)}, step=step)
+        batch_logger.log_params({"lr": 1e-3})
+        run_id = run.info.run_id
+
+    assert active_batch_logger() is None
+    client = mlflow.tracking.MlflowClient()
+    history = client.get_metric_history(run_id, "train_loss")
+    assert len(history) == 250
+    stored = client.get_run(run_id).data
+    assert stored.params["lr"] == "0.001"
+    assert stored.tags["project"] == "test-project"
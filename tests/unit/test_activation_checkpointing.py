@@ -0,0 +1,34 @@
+import copy
+
+import torch
+from torch import nn
+
+from spatiotemporal_lab.models.checkpointing import apply_activation_checkpointing
+
+
+class _Stack(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.blocks = nn.ModuleList(
+            [nn.Sequential(nn.Linear(8, 8), nn.Tanh()) for _ in range(3)]
+        )
+
+    def forward(self, x):
+        for block in self.blocks:
+            x = block(x)
+        return x
+
+
+def test_checkpointing_preserves_gradients_and_state_dict_keys() -> None:
+    torch.manual_seed(0)
+    ref = _Stack()
+    ckpt = copy.deepcopy(ref)
+    assert apply_activation_checkpointing(ckpt, ["blocks"]) == 3
+
+    x = torch.randn(4, 8)
+    ref(x).sum().backward()
+    ckpt(x).sum().backward()
+
+    assert list(ckpt.state_dict()) == list(ref.state_dict())
+    for p_ref, p_ckpt in zip(ref.parameters(), ckpt.parameters()):
+        torch.testing.assert_close(p_ref.grad, p_ckpt.grad)
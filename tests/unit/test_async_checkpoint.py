@@ -0,0 +1,150 @@
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytorch_lightning as pl
+import torch
+from loguru import logger as loguru_logger
+from pytorch_lightning.callbacks import ModelCheckpoint
+from pytorch_lightning.loggers import Logger
+from torch.utils.data import DataLoader, TensorDataset
+
+from spatiotemporal_lab.training.async_checkpoint import (
+    AsyncShardedCheckpoint,
+    ShardedCheckpointIO,
+    ShardedCheckpointLoader,
+    is_sharded_checkpoint,
+)
+
+
+def test_sharded_checkpoint_roundtrip_with_mmap(tmp_path) -> None:
+    checkpoint = {
+        "epoch": 3,
+        "state_dict": {f"layer{i}.weight": torch.randn(64, 64) for i in range(4)},
+        "optimizer_states": [{"state": {0: {"step": torch.tensor(7.0)}}}],
+    }
+    io = ShardedCheckpointIO(max_shard_mb=0.02, mmap=True)
+    path = tmp_path / "model.ckpt"
+    io.save_checkpoint(checkpoint, path)
+
+    assert is_sharded_checkpoint(path)
+    assert len(list(path.glob("shard_*.pt"))) > 1
+
+    loaded = io.load_checkpoint(path)
+    assert loaded["epoch"] == 3
+    for key, value in checkpoint["state_dict"].items():
+        torch.testing.assert_close(loaded["state_dict"][key], value)
+    assert loaded["optimizer_states"][0]["state"][0]["step"].item() == 7.0
+
+    io.remove_checkpoint(path)
+    assert not path.exists()
+
+
+class _RecordingLogger(Logger):
+    """Records whether each announced checkpoint was already on disk."""
+
+    def __init__(self):
+        super().__init__()
+        self.seen = []
+
+    @property
+    def name(self):
+        return "recording"
+
+    @property
+    def version(self):
+        return 0
+
+    def log_metrics(self, metrics, step=None):
+        pass
+
+    def log_hyperparams(self, params, *args, **kwargs):
+        pass
+
+    def after_save_checkpoint(self, checkpoint_callback):
+        path = checkpoint_callback._last_checkpoint_saved
+        self.seen.append(is_sharded_checkpoint(path))
+
+
+class _Linear(pl.LightningModule):
+    def __init__(self):
+        super().__init__()
+        self.layer = torch.nn.Linear(4, 1)
+
+    def training_step(self, batch, batch_idx):
+        x, y = batch
+        return torch.nn.functional.mse_loss(self.layer(x), y)
+
+    def configure_optimizers(self):
+        return torch.optim.SGD(self.parameters(), lr=0.1)
+
+
+def test_loggers_hear_about_checkpoints_only_once_written(tmp_path) -> None:
+    recorder = _RecordingLogger()
+    ckpt = AsyncShardedCheckpoint(
+        dirpath=tmp_path, every_n_train_steps=2, save_top_k=-1
+    )
+    trainer = pl.Trainer(
+        max_epochs=1,
+        accelerator="cpu",
+        callbacks=[ckpt],
+        logger=recorder,
+        enable_progress_bar=False,
+        enable_model_summary=False,
+    )
+    data = TensorDataset(torch.randn(48, 4), torch.randn(48, 1))
+    trainer.fit(_Linear(), DataLoader(data, batch_size=8))
+
+    assert len(recorder.seen) == 3 and all(recorder.seen)
+    assert not ckpt._pending
+
+
+def test_on_exception_logs_writer_errors_instead_of_raising(tmp_path) -> None:
+    ckpt = AsyncShardedCheckpoint(dirpath=tmp_path)
+
+    gate = threading.Event()
+
+    def _fail():
+        gate.wait(5)
+        raise OSError("disk full")
+
+    ckpt._submit(_fail)
+    ckpt._submit(lambda: (tmp_path / "after").touch())
+    gate.set()
+    messages = []
+    handler = loguru_logger.add(lambda m: messages.append(m.record["message"]))
+    try:
+        ckpt.on_exception(SimpleNamespace(), None, KeyboardInterrupt())
+    finally:
+        loguru_logger.remove(handler)
+
+    assert messages == ["Checkpoint write failed while handling KeyboardInterrupt"]
+    assert (tmp_path / "after").exists() and not ckpt._pending
+
+
+def test_loader_plugin_saves_single_files_and_resumes_from_shards(tmp_path) -> None:
+    data = DataLoader(TensorDataset(torch.randn(16, 4), torch.randn(16, 1)), 8)
+
+    def _trainer(**kwargs) -> pl.Trainer:
+        return pl.Trainer(
+            accelerator="cpu",
+            plugins=[ShardedCheckpointLoader()],
+            logger=False,
+            enable_progress_bar=False,
+            enable_model_summary=False,
+            default_root_dir=tmp_path,
+            **kwargs,
+        )
+
+    stock = ModelCheckpoint(dirpath=tmp_path / "stock")
+    _trainer(max_epochs=1, callbacks=[stock]).fit(_Linear(), data)
+    assert Path(stock.best_model_path).is_file()
+    _Linear.load_from_checkpoint(stock.best_model_path)
+
+    sharded = AsyncShardedCheckpoint(dirpath=tmp_path / "sharded", max_shard_mb=0.0001)
+    _trainer(max_epochs=1, callbacks=[sharded]).fit(_Linear(), data)
+    assert is_sharded_checkpoint(sharded.best_model_path)
+
+    resumed = _trainer(max_epochs=2)
+    resumed.fit(_Linear(), data, ckpt_path=sharded.best_model_path)
+    assert resumed.global_step == 4
@@ -0,0 +1,64 @@
+"""Cold-import regression budget (`python -X importtime`).
+
+Heavy dependencies must not load at import time of entrypoints; the budgets are
+generous (CI variance) and exist to catch an eager `import torch`/`mlflow`
+sneaking back in, which costs seconds rather than milliseconds.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HEAVY = ("torch", "pytorch_lightning", "mlflow", "pandas", "sqlalchemy", "onnx")
+
+
+def _importtime(module: str, cwd: Path) -> tuple[float, set[str]]:
+    """Return (cumulative seconds, imported top-level package names) for `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env={"PYTHONPATH": str(REPO_ROOT / "src"), "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    packages = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+        packages.add(name.strip().split(".")[0])
+    return total_us / 1e6, packages
+
+
+@pytest.mark.parametrize(
+    ("module", "budget_s"),
+    [
+        ("spatiotemporal_lab", 0.5),
+        ("spatiotemporal_lab.data", 0.5),
+        ("spatiotemporal_lab.training", 0.5),
+        ("spatiotemporal_lab.integrations.mlflow", 0.5),
+        ("spatiotemporal_lab.cli.train", 1.5),
+    ],
+)
+def test_package_import_is_lazy(module: str, budget_s: float) -> None:
+    seconds, packages = _importtime(module, REPO_ROOT)
+    assert not packages & set(HEAVY), (
+        f"{module} eagerly imports {packages & set(HEAVY)}"
+    )
+    assert seconds < budget_s, f"import {module} took {seconds:.2f}s"
+
+
+def test_api_app_import_is_lazy() -> None:
+    pytest.importorskip("fastapi")
+    seconds, packages = _importtime("app.main", REPO_ROOT / "deployment" / "api")
+    assert not packages & set(HEAVY), (
+        f"app.main eagerly imports {packages & set(HEAVY)}"
+    )
+    assert seconds < 2.0, f"import app.main took {seconds:.2f}s"
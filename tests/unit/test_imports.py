@@ -4,3 +4,10 @@ import importlib
 def test_import_package_root() -> None:
     mod = importlib.import_module("spatiotemporal_lab")
     assert mod is not None
+
+
+def test_lazy_subpackage_exports_resolve() -> None:
+    training = importlib.import_module("spatiotemporal_lab.training")
+    loops = importlib.import_module("spatiotemporal_lab.training.loops")
+    assert training.fit is loops.fit
+    assert "fit" in dir(training)
@@ -0,0 +1,22 @@
+import pytest
+import torch
+
+from spatiotemporal_lab.evaluation.metrics import (
+    masked_mae,
+    masked_mape,
+    masked_mse,
+    masked_rmse,
+)
+
+
+@pytest.mark.parametrize("metric", [masked_mae, masked_mse, masked_rmse, masked_mape])
+def test_masked_metrics_have_finite_grads_with_nan_targets(metric) -> None:
+    target = torch.tensor([[1.0, float("nan"), 3.0], [0.0, 5.0, float("nan")]])
+    pred = torch.ones_like(target, requires_grad=True)
+
+    loss = metric(pred, target)
+    loss.backward()
+
+    assert torch.isfinite(loss)
+    assert torch.isfinite(pred.grad).all()
+    assert (pred.grad[~torch.isfinite(target)] == 0).all()
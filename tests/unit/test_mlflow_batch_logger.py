@@ -0,0 +1,75 @@
+from argparse import Namespace
+
+import pytest
+from omegaconf import OmegaConf
+
+pytest.importorskip("mlflow")
+
+from spatiotemporal_lab.integrations.mlflow import BatchedMlflowLogger  # noqa: E402
+from spatiotemporal_lab.training.loggers import (  # noqa: E402
+    MlflowBatchLightningLogger,
+    flatten_params,
+)
+
+
+class _FakeClient:
+    """Records each `log_batch` call; rejects batches carrying params if asked."""
+
+    def __init__(self, reject_params: bool = False):
+        self.calls = []
+        self.reject_params = reject_params
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=()):
+        self.calls.append(
+            {"metrics": list(metrics), "params": list(params), "tags": list(tags)}
+        )
+        if params and self.reject_params:
+            raise RuntimeError("param value changed")
+
+
+def _logger(client: _FakeClient) -> BatchedMlflowLogger:
+    return BatchedMlflowLogger("run", client=client, flush_interval_s=60)
+
+
+def test_hyperparams_are_flattened_and_truncated() -> None:
+    client = _FakeClient()
+    batch_logger = _logger(client)
+    lightning_logger = MlflowBatchLightningLogger(batch_logger)
+    lightning_logger.log_hyperparams(
+        Namespace(optim={"lr": 0.1, "betas": [0.9, 0.99]}, note="x" * 1000)
+    )
+    batch_logger.close()
+
+    params = {p.key: p.value for call in client.calls for p in call["params"]}
+    assert params == {
+        "optim/lr": "0.1",
+        "optim/betas": "[0.9, 0.99]",
+        "note": "x" * 500,
+    }
+
+
+def test_flatten_params_handles_configs_and_namespaces() -> None:
+    cfg = OmegaConf.create({"model": {"hidden": 64, "layers": []}, "seed": 1})
+    assert flatten_params(Namespace(cfg=cfg, extra=Namespace(a=None), empty={})) == {
+        "cfg/model/hidden": 64,
+        "cfg/model/layers": [],
+        "cfg/seed": 1,
+        "extra/a": None,
+        "empty": {},
+    }
+    assert flatten_params(None) == {}
+
+
+def test_rejected_params_do_not_take_metrics_down() -> None:
+    client = _FakeClient(reject_params=True)
+    batch_logger = _logger(client)
+    batch_logger.log_params({"lr": 0.1})
+    batch_logger.log_metrics({"loss": 1.0, "mae": 2.0}, step=3)
+    batch_logger.set_tags({"env": "dev"})
+    batch_logger.close()
+
+    assert all(sum(map(bool, call.values())) == 1 for call in client.calls)
+    metrics = [m.key for call in client.calls for m in call["metrics"]]
+    tags = [t.key for call in client.calls for t in call["tags"]]
+    assert metrics == ["loss", "mae"] and tags == ["env"]
+    assert batch_logger.dropped == 1
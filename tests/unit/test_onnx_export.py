@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import torch
+from torch import nn
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from spatiotemporal_lab.inference.onnx_export import (  # noqa: E402
+    StaticGraphExportConfig,
+    export_static_graph_onnx,
+    verify_onnx_against_torch,
+)
+
+
+class _OneStepGCN(nn.Module):
+    def __init__(self, features: int):
+        super().__init__()
+        self.proj = nn.Linear(features, features)
+
+    def forward(self, x: torch.Tensor, adj: torch.Tensor) -> torch.Tensor:
+        last = x[:, -1]
+        return self.proj(torch.einsum("nm,bmf->bnf", adj, last))
+
+
+def test_static_graph_export_matches_torch(tmp_path) -> None:
+    rng = np.random.default_rng(0)
+    n, t, f, h = 6, 4, 2, 3
+    adj = (rng.random((n, n)) > 0.7).astype(np.float32)
+    windows = rng.standard_normal((3, t, n, f)).astype(np.float32)
+    cfg = StaticGraphExportConfig(
+        num_nodes=n,
+        input_len=t,
+        num_features=f,
+        horizon=h,
+        autoregressive=True,
+        adjacency_format="sparse",
+    )
+
+    out_file = tmp_path / "model.onnx"
+    wrapper = export_static_graph_onnx(
+        _OneStepGCN(f), out_file, cfg, adjacency=adj, example=windows
+    )
+    verify_onnx_against_torch(wrapper, out_file, list(windows), cfg)
+    # Batch axis stays dynamic in the exported graph.
+    verify_onnx_against_torch(wrapper, out_file, [windows], cfg)
+
+    assert wrapper(torch.from_numpy(windows)).shape == (3, h, n, f)
+
+
+class _MixThenPropagate(nn.Module):
+    def __init__(self, nodes: int):
+        super().__init__()
+        self.mix = nn.Linear(nodes, nodes, bias=False)
+
+    def forward(self, x: torch.Tensor, adj: torch.Tensor) -> torch.Tensor:
+        mixed = self.mix(x[:, -1].transpose(1, 2)).transpose(1, 2)
+        return torch.einsum("nm,bmf->bnf", adj, mixed)
+
+
+def test_sparse_export_keeps_other_square_weights_dense(tmp_path) -> None:
+    import onnx
+
+    n, t, f = 5, 3, 2
+    adj = np.eye(n, dtype=np.float32)
+    cfg = StaticGraphExportConfig(
+        num_nodes=n,
+        input_len=t,
+        num_features=f,
+        horizon=1,
+        adjacency_format="sparse",
+    )
+    out_file = tmp_path / "model.onnx"
+    wrapper = export_static_graph_onnx(
+        _MixThenPropagate(n), out_file, cfg, adjacency=adj
+    )
+
+    graph = onnx.load(out_file.as_posix()).graph
+    sparse = [s.values.name for s in graph.sparse_initializer]
+    dense_square = [i.name for i in graph.initializer if list(i.dims) == [n, n]]
+    assert sparse == ["adjacency"]
+    assert len(dense_square) == 1  # the Linear weight stays dense
+
+    windows = np.random.default_rng(1).standard_normal((3, t, n, f))
+    verify_onnx_against_torch(wrapper, out_file, [windows.astype(np.float32)], cfg)
@@ -0,0 +1,50 @@
+import pytorch_lightning as pl
+import torch
+from omegaconf import OmegaConf
+from torch.utils.data import DataLoader, TensorDataset
+
+from spatiotemporal_lab.training.profiling import build_profiling_callbacks
+
+
+class _Linear(pl.LightningModule):
+    def __init__(self):
+        super().__init__()
+        self.layer = torch.nn.Linear(4, 1)
+
+    def training_step(self, batch, batch_idx):
+        x, y = batch
+        return torch.nn.functional.mse_loss(self.layer(x), y)
+
+    def configure_optimizers(self):
+        return torch.optim.SGD(self.parameters(), lr=0.1)
+
+
+def test_profiling_callbacks_write_step_timing_and_traces(tmp_path) -> None:
+    cfg = OmegaConf.create(
+        {
+            "profiling": {
+                "enabled": True,
+                "output_dir": str(tmp_path),
+                "step_timing": {"log_every_n_steps": 1},
+                "sampler": {"interval_ms": 1},
+                "torch_profiler": {"wait": 1, "warmup": 1, "active": 2},
+            }
+        }
+    )
+
+    data = TensorDataset(torch.randn(64, 4), torch.randn(64, 1))
+    trainer = pl.Trainer(
+        max_epochs=1,
+        accelerator="cpu",
+        callbacks=build_profiling_callbacks(cfg),
+        logger=False,
+        enable_checkpointing=False,
+        enable_progress_bar=False,
+    )
+    trainer.fit(_Linear(), DataLoader(data, batch_size=8))
+
+    names = {p.name for p in tmp_path.iterdir()}
+    assert {"step_timing.json", "python_stacks.folded"} <= names
+    assert any(n.startswith("torch_trace_") for n in names)
+    assert any(n.startswith("torch_stacks_") for n in names)
+    assert "time/optimizer_ms" in trainer.callback_metrics
@@ -0,0 +1,55 @@
+import numpy as np
+
+from spatiotemporal_lab.data.importance import (
+    ImportanceConfig,
+    ImportanceSampler,
+    SumTree,
+)
+from spatiotemporal_lab.data.samplers import WindowSampler
+
+
+def test_window_sampler_shards_cover_indices_disjointly() -> None:
+    indices = np.arange(100, 110)
+    shards = [
+        list(WindowSampler(indices, shuffle=True, seed=0, num_replicas=3, rank=r))
+        for r in range(3)
+    ]
+
+    assert all(len(s) == 4 for s in shards)
+    seen = [i for s in shards for i in s]
+    assert set(seen) == set(indices.tolist())
+    # 12 slots for 10 indices: exactly two are padded by wrap-around.
+    assert len(seen) - len(set(seen)) == 2
+
+
+def test_window_sampler_reshuffles_per_epoch() -> None:
+    sampler = WindowSampler(np.arange(50), shuffle=True, seed=0)
+    first = list(sampler)
+    sampler.set_epoch(1)
+    assert list(sampler) != first
+    assert sorted(sampler) == sorted(first)
+
+
+def test_sum_tree_samples_in_proportion_to_priority() -> None:
+    tree = SumTree(5)
+    tree.set(np.arange(5), np.array([1.0, 0.0, 2.0, 0.0, 1.0]))
+    tree.set(np.array([3]), np.array([4.0]))
+    assert tree.total == 8.0
+
+    draws = tree.find(np.random.default_rng(0).random(80_000) * tree.total)
+    freq = np.bincount(draws, minlength=5) / len(draws)
+    np.testing.assert_allclose(freq, [1 / 8, 0, 2 / 8, 4 / 8, 1 / 8], atol=0.01)
+    assert tree.find(np.array([])).shape == (0,)
+
+
+def test_importance_sampler_focuses_on_high_loss_windows() -> None:
+    indices = np.arange(100, 200)
+    sampler = ImportanceSampler(
+        indices, ImportanceConfig(alpha=1.0, uniform_frac=0.1), seed=0
+    )
+    sampler.update(indices, np.where(indices < 110, 10.0, 0.1))
+
+    drawn = np.array(list(sampler))
+    assert len(drawn) == 100 and set(drawn) <= set(indices)
+    # 10 windows hold 100 / 109.9 of the priority mass.
+    assert (drawn < 110).mean() > 0.7
@@ -0,0 +1,57 @@
+import pickle
+import shutil
+from pathlib import Path
+
+import numpy as np
+
+from spatiotemporal_lab.data.shm_cache import shared_array
+
+
+def test_shared_array_decodes_once_and_refcounts(tmp_path) -> None:
+    series = np.arange(5 * 3, dtype=np.float32).reshape(5, 3)
+    src = tmp_path / "series.npz"
+    np.savez_compressed(src, flow=series)
+    cache_dir = tmp_path / "shm"
+
+    first = shared_array(src, key="flow", cache_dir=cache_dir, chunk_steps=2)
+    second = shared_array(src, key="flow", cache_dir=cache_dir)
+    assert first.shape == (5, 3, 1)
+    np.testing.assert_array_equal(second[1:3, :, 0], series[1:3])
+    assert len(list(cache_dir.glob("*.npy"))) == 1
+
+    # Pickling (spawned DataLoader workers) re-attaches by name, no copy.
+    attached = pickle.loads(pickle.dumps(first))
+    assert pickle.dumps(first).__len__() < 200
+    np.testing.assert_array_equal(np.asarray(attached)[..., 0], series)
+
+    for handle in (first, attached):
+        handle.release()
+        assert first.data_path.exists()  # still referenced
+    second.release()
+    assert not first.data_path.exists()
+
+
+def test_shared_array_falls_back_to_disk_when_shm_is_full(
+    tmp_path, monkeypatch
+) -> None:
+    series = np.arange(4 * 2, dtype=np.float32).reshape(4, 2)
+    src = tmp_path / "series.npz"
+    np.savez_compressed(src, flow=series)
+    shm, disk = tmp_path / "shm", tmp_path / "disk"
+
+    real_usage = shutil.disk_usage
+
+    def usage(path):
+        actual = real_usage(path)
+        return actual._replace(free=0) if Path(path) == shm else actual
+
+    monkeypatch.setattr("spatiotemporal_lab.data.shm_cache.shutil.disk_usage", usage)
+    first = shared_array(src, key="flow", cache_dir=shm, fallback_dir=disk)
+    second = shared_array(src, key="flow", cache_dir=shm, fallback_dir=disk)
+
+    assert first.cache_dir == second.cache_dir == disk
+    assert not list(shm.glob("*.npy")) and len(list(disk.glob("*.npy"))) == 1
+    np.testing.assert_array_equal(second[:, :, 0], series)
+    first.release()
+    second.release()
+    assert not first.data_path.exists()
@@ -0,0 +1,127 @@
+from pathlib import Path
+
+import pytest
+import torch
+from hydra import compose, initialize_config_dir
+from loguru import logger
+from omegaconf import OmegaConf
+
+from spatiotemporal_lab.models.factory import apply_runtime_profile
+from spatiotemporal_lab.training.loops import (
+    build_callbacks,
+    build_trainer,
+    configure_torch_runtime,
+)
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
+
+
+def test_build_trainer_respects_precision_and_determinism() -> None:
+    cfg = OmegaConf.create(
+        {
+            "trainer": {
+                "max_epochs": 1,
+                "accelerator": "cpu",
+                "devices": 1,
+                "precision": "bf16-mixed",
+                "deterministic": True,
+                "enable_progress_bar": False,
+                "enable_checkpointing": False,
+            }
+        }
+    )
+    trainer = build_trainer(cfg)
+    assert trainer.precision == "bf16-mixed"
+
+
+def test_callbacks_are_opt_in() -> None:
+    with initialize_config_dir(str(CONFIG_DIR), version_base=None):
+        default = compose("config")
+        opted_in = compose("config", overrides=["trainer/callbacks=[base,performance]"])
+    assert build_callbacks(default) == []
+    assert "peak_memory" in opted_in.trainer.callbacks
+    assert "early_stopping" in opted_in.trainer.callbacks
+
+
+def test_importance_sampler_without_its_callback_warns() -> None:
+    messages = []
+    handler = logger.add(
+        lambda m: messages.append(m.record["message"]), level="WARNING"
+    )
+    try:
+        with initialize_config_dir(str(CONFIG_DIR), version_base=None):
+            bare = compose("config", overrides=["data.sampler.name=importance"])
+            wired = compose(
+                "config",
+                overrides=[
+                    "data.sampler.name=importance",
+                    "trainer/callbacks=performance",
+                    "~trainer.callbacks.model_checkpoint",
+                ],
+            )
+        build_callbacks(bare)
+        assert any("ImportanceUpdateCallback" in m for m in messages)
+        messages.clear()
+        build_callbacks(wired)
+        assert not messages
+    finally:
+        logger.remove(handler)
+
+
+@pytest.fixture
+def restore_torch_runtime(monkeypatch):
+    # Lightning exports this when deterministic=True; undo restores the original.
+    monkeypatch.delenv("CUBLAS_WORKSPACE_CONFIG", raising=False)
+    threads = torch.get_num_threads()
+    precision = torch.get_float32_matmul_precision()
+    deterministic = torch.are_deterministic_algorithms_enabled()
+    yield
+    torch.set_num_threads(threads)
+    torch.set_float32_matmul_precision(precision)
+    torch.use_deterministic_algorithms(deterministic)
+
+
+def test_runtime_applies_thread_count(restore_torch_runtime) -> None:
+    before = configure_torch_runtime(OmegaConf.create({"trainer": {}}))
+    assert before["num_threads"] == torch.get_num_threads()
+
+    cfg = OmegaConf.create({"trainer": {"num_threads": 2, "matmul_precision": "high"}})
+    applied = configure_torch_runtime(cfg)
+    assert applied["num_threads"] == torch.get_num_threads() == 2
+    assert applied["matmul_precision"] == "high"
+
+
+@pytest.mark.parametrize("deterministic", [True, False])
+def test_trainer_toggles_deterministic_algorithms(
+    restore_torch_runtime, deterministic: bool
+) -> None:
+    cfg = OmegaConf.create(
+        {
+            "trainer": {
+                "accelerator": "cpu",
+                "deterministic": deterministic,
+                "enable_progress_bar": False,
+                "enable_checkpointing": False,
+            }
+        }
+    )
+    build_trainer(cfg)
+    assert torch.are_deterministic_algorithms_enabled() is deterministic
+
+
+def test_runtime_profile_compiles_with_selected_mode(monkeypatch) -> None:
+    calls = []
+    monkeypatch.setattr(
+        torch, "compile", lambda module, **kwargs: calls.append(kwargs) or module
+    )
+    module = torch.nn.Linear(2, 2)
+
+    off = OmegaConf.create({"trainer": {"compile": {"enabled": False}}})
+    assert apply_runtime_profile(off, module) is module and not calls
+
+    for mode, expected in [("default", None), ("max-autotune", "max-autotune")]:
+        cfg = OmegaConf.create(
+            {"trainer": {"compile": {"enabled": True, "mode": mode}}}
+        )
+        apply_runtime_profile(cfg, module)
+        assert calls[-1] == {"mode": expected, "fullgraph": False, "dynamic": None}
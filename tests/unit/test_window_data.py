@@ -0,0 +1,203 @@
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from spatiotemporal_lab.data.datamodule import DataModuleConfig, WindowDataModule
+from spatiotemporal_lab.data.datasets import WindowDatasetConfig
+from spatiotemporal_lab.data.features import (
+    FeatureConfig,
+    features_cache_dir,
+    load_or_build_features,
+)
+from spatiotemporal_lab.data.normalization import compute_norm_stats, stats_cache_path
+from spatiotemporal_lab.data.prefetch import RingPrefetcher
+from spatiotemporal_lab.data.validity import ValidityConfig, validity_cache_dir
+from spatiotemporal_lab.evaluation.metrics import masked_mae
+
+
+def test_window_datamodule_caches_train_only_stats(tmp_path: Path) -> None:
+    series = np.random.default_rng(0).normal(5.0, 2.0, size=(120, 4)).astype("f4")
+    path = tmp_path / "series.npy"
+    np.save(path, series)
+
+    dm = WindowDataModule(
+        path,
+        WindowDatasetConfig(input_len=6, horizon=3),
+        DataModuleConfig(batch_size=8, val_frac=0.2, test_frac=0.2),
+    )
+    dm.prepare_data()
+    dm.setup()
+
+    # 112 windows -> 68 train windows, covering steps [0, 68 + 6 + 3 - 1).
+    cache = stats_cache_path(path, 76)
+    assert cache.exists()
+    with np.load(cache) as f:
+        np.testing.assert_allclose(f["mean"][:, 0], series[:76].mean(axis=0), rtol=1e-5)
+
+    x, y = next(iter(dm.train_dataloader()))
+    assert x.shape == (8, 6, 4, 1) and y.shape == (8, 3, 4, 1)
+    assert dm._split.val_idx[0] == dm._split.train_idx[-1] + 1
+
+
+def test_ring_prefetcher_matches_dataloader(tmp_path: Path) -> None:
+    series = np.random.default_rng(1).normal(size=(90, 3)).astype("f4")
+    path = tmp_path / "series.npy"
+    np.save(path, series)
+
+    def batches(prefetch: bool):
+        dm = WindowDataModule(
+            path,
+            WindowDatasetConfig(input_len=4, horizon=2),
+            DataModuleConfig(batch_size=5, shuffle=False, prefetch=prefetch),
+        )
+        dm.setup()
+        loader = dm.train_dataloader()
+        return loader, [(x.clone(), y.clone()) for x, y in loader]
+
+    ring, got = batches(prefetch=True)
+    assert isinstance(ring, RingPrefetcher) and len(ring) == len(got)
+    _, want = batches(prefetch=False)
+    assert len(got) == len(want)
+    for (gx, gy), (wx, wy) in zip(got, want):
+        torch.testing.assert_close(gx, wx)
+        torch.testing.assert_close(gy, wy)
+    assert ring.stats["batches"] == len(got)
+
+
+def test_precomputed_features_align_with_windows(tmp_path: Path) -> None:
+    series = np.random.default_rng(2).normal(size=(40, 3)).astype("f4")
+    path = tmp_path / "series.npy"
+    np.save(path, series)
+
+    feature_cfg = FeatureConfig(
+        steps_per_day=8,
+        start="2024-01-07T12:00",  # Sunday, half a day in
+        lags=(2,),
+        rolling_windows=(3,),
+        chunk_steps=16,  # exercise the carry-over between chunks
+    )
+    dm = WindowDataModule(
+        path,
+        WindowDatasetConfig(input_len=4, horizon=2),
+        DataModuleConfig(batch_size=4, shuffle=False, prefetch=True),
+        normalize=False,
+        feature_cfg=feature_cfg,
+    )
+    dm.prepare_data()
+    dm.setup()
+    ds = dm._dataset
+
+    x, _ = ds[17]
+    # series, lag_2, roll3_mean, roll3_std, time_of_day, day_of_week
+    assert x.shape == (4, 3, 6)
+    np.testing.assert_allclose(x[:, :, 1], series[15:19])
+    want_mean = np.stack([series[t - 2 : t + 1].mean(0) for t in range(17, 21)])
+    want_std = np.stack([series[t - 2 : t + 1].std(0) for t in range(17, 21)])
+    np.testing.assert_allclose(x[:, :, 2], want_mean, rtol=1e-5, atol=1e-6)
+    np.testing.assert_allclose(x[:, :, 3], want_std, rtol=1e-4, atol=1e-5)
+    # Step 17 is 4 + 17 = 21 steps after Sunday 00:00: Tuesday, 5/8 of the day.
+    assert x[0, 0, 4] == 5 / 8 and x[0, 0, 5] == 1
+
+    xb, _ = next(iter(dm.train_dataloader()))
+    torch.testing.assert_close(xb[1], ds[1][0])
+
+
+def test_validity_index_filters_and_masks_outages(tmp_path: Path) -> None:
+    series = np.random.default_rng(3).uniform(1, 2, size=(60, 10)).astype("f4")
+    series[20:35, :8] = 0.0  # outage on 8 of 10 sensors
+    series[50, 3] = np.nan
+    path = tmp_path / "series.npy"
+    np.save(path, series)
+
+    def make(mode: str) -> WindowDataModule:
+        dm = WindowDataModule(
+            path,
+            WindowDatasetConfig(input_len=4, horizon=2),
+            DataModuleConfig(batch_size=4, val_frac=0.2, test_frac=0.0),
+            validity_cfg=ValidityConfig(max_missing=0.5, mode=mode, mask_targets=True),
+        )
+        dm.prepare_data()
+        dm.setup()
+        return dm
+
+    dm = make("filter")
+    validity = dm._dataset.validity
+    assert validity.valid(50, 51)[0].tolist() == [i != 3 for i in range(10)]
+    missing = validity.window_missing(4, 2)
+    valid = np.isfinite(series) & (series != 0)
+    want = [1 - valid[s : s + 6].mean() for s in range(len(missing))]
+    np.testing.assert_allclose(missing, want, rtol=1e-6)
+    assert set(dm._split.train_idx) == {i for i in range(44) if want[i] <= 0.5}
+
+    _, y = dm._dataset[45]  # targets cover step 50
+    assert torch.isnan(y[1, 3, 0]) and torch.isfinite(y).sum() == 19
+    assert masked_mae(torch.zeros_like(y), y) == y.nan_to_num().sum() / 19
+
+    drawn = set(iter(make("weight").train_dataloader().sampler))
+    assert drawn and all(want[i] <= 0.5 for i in drawn)
+
+
+def test_ring_prefetcher_joins_previous_filler_before_reuse() -> None:
+    class SlowGather:
+        def sample_spec(self):
+            return [((2,), torch.float32)]
+
+        def gather_into(self, indices, out):
+            time.sleep(0.05)
+            out[0][: len(indices)] = torch.from_numpy(indices[:, None]).float()
+
+    ring = RingPrefetcher(SlowGather(), range(40), batch_size=2, ring_size=3)
+    abandoned = iter(ring)
+    next(abandoned)  # broken-off epoch, still referenced: its filler keeps going
+    first = ring._active_thread
+    it = iter(ring)
+    assert first is not None and not first.is_alive()
+    assert [int(b[0][0, 0]) for b in it] == list(range(0, 40, 2))
+
+
+def test_norm_stats_skip_nan_and_cache_per_dataset(tmp_path: Path) -> None:
+    series = np.random.default_rng(4).normal(3.0, 1.0, size=(50, 3)).astype("f4")
+    series[10:20, 1] = np.nan
+    series[:, 2] = np.nan
+    path = tmp_path / "series.npy"
+    np.save(path, series)
+
+    stats = compute_norm_stats(series, 50, chunk_size=16)
+    np.testing.assert_allclose(stats.mean[:2], np.nanmean(series[:, :2], 0), rtol=1e-5)
+    np.testing.assert_allclose(stats.std[:2], np.nanstd(series[:, :2], 0), rtol=1e-4)
+    assert stats.mean[2] == 0 and stats.std[2] == 1
+
+    sd, ca = stats_cache_path(path, 50, "sd"), stats_cache_path(path, 50, "ca")
+    assert sd != ca and sd == stats_cache_path(path, 50, "sd")
+    np.save(path, series[:40])
+    assert stats_cache_path(path, 50, "sd") != sd
+
+
+def test_rolling_features_skip_nan_readings(tmp_path: Path) -> None:
+    series = np.random.default_rng(5).normal(size=(30, 2, 1)).astype("f4")
+    series[10, 0] = np.nan
+    series[20:24, 1] = np.nan
+    path = tmp_path / "series.npy"
+    np.save(path, series)
+
+    cfg = FeatureConfig(rolling_windows=(3,), time_of_day=False, day_of_week=False)
+    feats = load_or_build_features(path, series, cfg, key="sd")
+    mean, std = feats.node[..., 0], feats.node[..., 1]
+    for t in (10, 11, 12, 21, 24):
+        win = series[t - 2 : t + 1, :, 0]
+        np.testing.assert_allclose(mean[t], np.nanmean(win, 0), rtol=1e-5, atol=1e-6)
+        np.testing.assert_allclose(std[t], np.nanstd(win, 0), rtol=1e-4, atol=1e-5)
+    # Steps 22 and 23 see only missing readings on node 1.
+    assert np.isnan(mean[22:24, 1]).all() and np.isfinite(mean[22:24, 0]).all()
+    assert features_cache_dir(path, 30, cfg, "sd") != features_cache_dir(
+        path, 30, cfg, "ca"
+    )
+
+
+def test_validity_cache_is_keyed_by_dataset(tmp_path: Path) -> None:
+    path = tmp_path / "series.h5"
+    path.write_bytes(b"\0" * 64)
+    sd, ca = validity_cache_dir(path, 0.0, "sd"), validity_cache_dir(path, 0.0, "ca")
+    assert sd != ca and sd == validity_cache_dir(path, 0.0, "sd")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Peak host memory (RSS) per training configuration.
+
+Runs a short training job per configuration, each in its own process (peak RSS
+is a per-process high-water mark), and tabulates the result. Use it to pick
+the cheapest combination of batch size, gradient accumulation and activation
+checkpointing that fits on a host instead of shrinking the graph.
+
+Each `--config` is a string of Hydra overrides for `spatiotemporal_lab.cli.train`:
+
+    python tools/memory_report.py --steps 20 \\
+        --config "data.batch_size=32" \\
+        --config "data.batch_size=32 model.activation_checkpointing.enabled=true" \\
+        --config "data.batch_size=8 trainer.accumulate_grad_batches=4" \\
+        --output outputs/memory_report.json
+
+Exit codes
+- 0: all configurations ran
+- 1: at least one configuration failed (reported with its return code)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import shlex
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def run_config(overrides: str, steps: int, workdir: Path, idx: int) -> Dict[str, Any]:
+    report_path = workdir / f"config_{idx}.json"
+    cmd = [
+        sys.executable,
+        "-m",
+        "spatiotemporal_lab.cli.train",
+        "trainer/callbacks=performance",
+        *shlex.split(overrides),
+        f"++trainer.max_steps={steps}",
+        "++trainer.limit_val_batches=0",
+        "trainer.enable_checkpointing=false",
+        "trainer.enable_progress_bar=false",
+        "~trainer.callbacks.model_checkpoint",
+        f"++trainer.callbacks.peak_memory.report_path={report_path}",
+        "mlflow.enabled=false",
+        f"hydra.run.dir={workdir / f'run_{idx}'}",
+    ]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    row: Dict[str, Any] = {"config": overrides, "returncode": proc.returncode}
+    if proc.returncode == 0 and report_path.exists():
+        row.update(json.loads(report_path.read_text(encoding="utf-8")))
+    else:
+        row["error"] = proc.stderr.strip().splitlines()[-1:] or ["no output"]
+    return row
+
+
+def format_table(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'peak RSS (MiB)':>15}  {'batch':>6}  {'accum':>6}  config"]
+    for r in rows:
+        if r["returncode"] != 0:
+            lines.append(f"{'FAILED':>15}  {'-':>6}  {'-':>6}  {r['config']}")
+            continue
+        lines.append(
+            f"{r['peak_rss_mb']:>15.1f}  {str(r.get('batch_size')):>6}  "
+            f"{str(r.get('accumulate_grad_batches')):>6}  {r['config']}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument(
+        "--config",
+        action="append",
+        default=[],
+        help="Hydra overrides for one configuration (repeatable).",
+    )
+    ap.add_argument("--steps", type=int, default=20, help="Training steps per run.")
+    ap.add_argument("--output", type=Path, default=None, help="Write rows as JSON.")
+    args = ap.parse_args()
+
+    configs = args.config or [""]
+    with tempfile.TemporaryDirectory(prefix="memory_report_") as tmp:
+        rows = [run_config(c, args.steps, Path(tmp), i) for i, c in enumerate(configs)]
+
+    print(format_table(rows))
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+
+    return 1 if any(r["returncode"] != 0 for r in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())